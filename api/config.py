@@ -62,6 +62,15 @@ class RedisSettings(BaseSettings):
     cache_ttl_debates: int = Field(300, env="CACHE_TTL_DEBATES")
     cache_ttl_streaming: int = Field(3600, env="CACHE_TTL_STREAMING")
     cache_ttl_metadata: int = Field(86400, env="CACHE_TTL_METADATA")
+    
+    # Compteurs tamponnés (vues, écoutes, téléchargements) : intervalle de report en base
+    view_count_flush_interval: int = Field(30, env="VIEW_COUNT_FLUSH_INTERVAL")
+    audio_count_flush_interval: int = Field(5, env="AUDIO_COUNT_FLUSH_INTERVAL")
+    
+    # Cache L1 par processus devant Redis (0 pour le désactiver) ; les invalidations
+    # sont diffusées aux autres workers par pub/sub, le TTL borne le reste
+    l1_cache_size: int = Field(2048, env="L1_CACHE_SIZE")
+    l1_cache_ttl: int = Field(30, env="L1_CACHE_TTL")
 
     @validator(
         "cache_ttl_default",
@@ -96,6 +105,22 @@ class RedisSettings(BaseSettings):
             f"{values.get('redis_db')}"
         )
 
+
+class PaginationSettings(BaseSettings):
+    """Configuration de la pagination des listes"""
+
+    model_config = {"extra": "ignore"}
+
+    # Pagination par page/offset (conservée pour la compatibilité, ex. legacy_list_debates)
+    offset_pagination_enabled: bool = Field(True, env="OFFSET_PAGINATION_ENABLED")
+    
+    # Profondeur maximale (page * per_page) autorisée en pagination par offset
+    max_offset: int = Field(10_000, env="PAGINATION_MAX_OFFSET")
+    
+    # Durée de cache du total (COUNT) partagé entre les pages d'un même filtre
+    count_cache_ttl: int = Field(60, env="PAGINATION_COUNT_CACHE_TTL")
+
+
 class SecuritySettings(BaseSettings):
     """Configuration sécurité"""
 
@@ -220,6 +245,7 @@ class AudioSettings(BaseSettings):
     
     # Processing limits
     max_concurrent_extractions: int = Field(3, env="MAX_CONCURRENT_EXTRACTIONS")
+    max_extractions_per_provider: int = Field(2, env="MAX_EXTRACTIONS_PER_PROVIDER")
     extraction_timeout: int = Field(1800, env="EXTRACTION_TIMEOUT")  # 30 minutes
     max_file_size_mb: int = Field(500, env="MAX_FILE_SIZE_MB")
     
@@ -251,6 +277,17 @@ class AudioSettings(BaseSettings):
                         break
 
 
+class StreamingSettings(BaseSettings):
+    """Configuration du streaming des fichiers audio"""
+
+    model_config = {"extra": "ignore"}
+
+    # Taille des blocs lus/envoyés quand pathsend est indisponible (TLS, Range)
+    # 256 KiB : ~600 blocs pour 150 MB au lieu de ~2400 à 64 KiB ; coût mémoire
+    # d'environ un bloc par flux simultané (1 MiB x 1000 flux = ~1 GB en vol)
+    chunk_size: int = Field(256 * 1024, env="STREAMING_CHUNK_SIZE")
+
+
 class MonitoringSettings(BaseSettings):
     """Configuration monitoring et logging"""
 
@@ -324,9 +361,11 @@ class Settings(BaseSettings):
     app: AppSettings = Field(default_factory=AppSettings)
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
     redis: RedisSettings = Field(default_factory=RedisSettings)
+    pagination: PaginationSettings = Field(default_factory=PaginationSettings)
     security: SecuritySettings = Field(default_factory=SecuritySettings)
     paths: PathSettings = Field(default_factory=PathSettings)
     audio: AudioSettings = Field(default_factory=AudioSettings)
+    streaming: StreamingSettings = Field(default_factory=StreamingSettings)
     monitoring: MonitoringSettings = Field(default_factory=MonitoringSettings)
 
 
@@ -9,7 +9,7 @@ from typing import Dict, Any
 from datetime import datetime
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import structlog
 
 from .config import settings, get_platform_info
@@ -17,6 +17,7 @@ from .middleware import setup_middleware, global_exception_handler
 from .models import init_database, close_database, DatabaseHealthCheck
 from .services.cache_service import cache_service
 from .services.websocket_service import websocket_manager, WebSocketMessage, MessageType
+from .services.extraction_service import extraction_service
 
 # Import des routers
 from .routers import (
@@ -25,6 +26,13 @@ from .routers import (
     collections_router,
     health_router
 )
+from .routers.debates import view_count_flusher, flush_view_counts
+from .routers.streaming import (
+    audio_counter_flusher,
+    flush_audio_counters,
+    fail_stale_extractions,
+    start_extraction_workers
+)
 
 # Configuration du logger
 logger = structlog.get_logger(__name__)
@@ -34,6 +42,9 @@ logger = structlog.get_logger(__name__)
 async def lifespan(app: FastAPI):
     """Gestionnaire du cycle de vie de l'application"""
     logger.info("🚀 Démarrage RobianAPI", version=settings.app.app_version)
+    view_flush_task = None
+    audio_flush_task = None
+    extraction_workers = []
     
     try:
         # 1. Initialisation de la base de données
@@ -44,6 +55,21 @@ async def lifespan(app: FastAPI):
         logger.info("🔴 Connexion Redis...")
         await cache_service.connect()
         
+        # Report périodique des compteurs de vues
+        view_flush_task = asyncio.create_task(
+            view_count_flusher(settings.redis.view_count_flush_interval)
+        )
+        
+        # Report périodique des compteurs d'écoutes et de téléchargements
+        audio_flush_task = asyncio.create_task(
+            audio_counter_flusher(settings.redis.audio_count_flush_interval)
+        )
+        
+        # Workers d'extraction audio (file bornée), après nettoyage des extractions
+        # orphelines d'un arrêt précédent
+        await fail_stale_extractions()
+        extraction_workers = start_extraction_workers()
+        
         # 3. Vérifications système
         platform_info = get_platform_info()
         logger.info("💻 Plateforme détectée", 
@@ -69,6 +95,15 @@ async def lifespan(app: FastAPI):
         logger.info("🛑 Arrêt de RobianAPI...")
         
         try:
+            if view_flush_task:
+                view_flush_task.cancel()
+                await flush_view_counts()
+            if audio_flush_task:
+                audio_flush_task.cancel()
+                await flush_audio_counters()
+            for worker in extraction_workers:
+                worker.cancel()
+            extraction_service.shutdown()
             await cache_service.disconnect()
             await close_database()
             logger.info("✅ Nettoyage terminé")
@@ -84,6 +119,7 @@ app = FastAPI(
     docs_url=settings.app.docs_url if settings.app.environment != "production" else None,
     redoc_url=settings.app.redoc_url if settings.app.environment != "production" else None,
     openapi_url=settings.app.openapi_url if settings.app.environment != "production" else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -140,9 +176,13 @@ async def root():
 # =============================================================================
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, client_id: str = None):
-    """Endpoint WebSocket pour les notifications temps réel"""
-    client_id = await websocket_manager.connect(websocket, client_id)
+async def websocket_endpoint(websocket: WebSocket, client_id: str = None, encoding: str = None):
+    """
+    Endpoint WebSocket pour les notifications temps réel
+    ?encoding=msgpack : messages serveur en trames binaires msgpack (JSON texte par défaut) ;
+    les messages du client restent en JSON
+    """
+    client_id = await websocket_manager.connect(websocket, client_id, encoding)
     
     try:
         while True:
@@ -290,11 +330,20 @@ async def legacy_extraction_status(extraction_id: str):
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info("🚀 Démarrage direct de RobianAPI")
+    # Boucle uvloop (libuv) si disponible - absente sous Windows
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        event_loop = "uvloop"
+    except ImportError:
+        event_loop = "asyncio"
+    
+    logger.info("🚀 Démarrage direct de RobianAPI", loop=event_loop)
     uvicorn.run(
         "api.main:app",
         host=settings.app.host,
         port=settings.app.port,
         reload=settings.app.reload,
+        loop=event_loop,
         log_level=settings.monitoring.log_level.lower()
     )
@@ -6,19 +6,19 @@ CORS, Rate Limiting, Logging, Sécurité
 import time
 import logging
 import json
-from typing import Callable, Dict, Any
+from typing import Dict, Any
 from datetime import datetime, timedelta
 import asyncio
 from collections import defaultdict, deque
 
-from fastapi import Request, Response, HTTPException
-from fastapi.middleware.base import BaseHTTPMiddleware
+from fastapi import Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware as StarletteBaseMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
-from ..config import settings
+from .config import settings
 
 # Configuration du logging structuré
 structlog.configure(
@@ -43,10 +43,19 @@ structlog.configure(
 logger = structlog.get_logger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Middleware de logging des requêtes"""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        
         # Début de la requête
         start_time = time.time()
         request_id = f"req_{int(time.time() * 1000000)}"
@@ -70,33 +79,37 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # Ajouter l'ID de requête au contexte
         request.state.request_id = request_id
         
+        async def send_with_logging(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculer la durée
+                process_time = time.time() - start_time
+                headers = MutableHeaders(scope=message)
+                status_code = message["status"]
+                
+                # Logger de fin
+                log_data.update({
+                    "status_code": status_code,
+                    "process_time": round(process_time, 4),
+                    "response_size": headers.get("content-length", "unknown"),
+                })
+                
+                # Niveau de log selon le status code
+                if status_code >= 500:
+                    logger.error("Request completed with server error", **log_data)
+                elif status_code >= 400:
+                    logger.warning("Request completed with client error", **log_data)
+                else:
+                    logger.info("Request completed successfully", **log_data)
+                
+                # Ajouter headers de debug
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = str(process_time)
+            
+            await send(message)
+        
         try:
             # Traitement de la requête
-            response = await call_next(request)
-            
-            # Calculer la durée
-            process_time = time.time() - start_time
-            
-            # Logger de fin
-            log_data.update({
-                "status_code": response.status_code,
-                "process_time": round(process_time, 4),
-                "response_size": response.headers.get("content-length", "unknown"),
-            })
-            
-            # Niveau de log selon le status code
-            if response.status_code >= 500:
-                logger.error("Request completed with server error", **log_data)
-            elif response.status_code >= 400:
-                logger.warning("Request completed with client error", **log_data)
-            else:
-                logger.info("Request completed successfully", **log_data)
-            
-            # Ajouter headers de debug
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = str(process_time)
-            
-            return response
+            await self.app(scope, receive, send_with_logging)
             
         except Exception as e:
             # Calculer la durée même en cas d'erreur
@@ -131,11 +144,11 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         return request.client.host if request.client else "unknown"
 
 
-class RateLimitingMiddleware(BaseHTTPMiddleware):
+class RateLimitingMiddleware:
     """Middleware de rate limiting"""
     
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         # Stockage en mémoire pour le rate limiting
         # En production, utiliser Redis pour partage entre instances
         self.requests: Dict[str, deque] = defaultdict(deque)
@@ -149,7 +162,13 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
         # Task de nettoyage
         self.cleanup_task = asyncio.create_task(self._cleanup_old_requests())
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        
         # Obtenir l'IP du client
         client_ip = self._get_client_ip(request)
         
@@ -157,7 +176,7 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
         if self._is_ip_blocked(client_ip):
             logger.warning("Request blocked - IP temporarily banned", 
                          client_ip=client_ip, url=str(request.url))
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "error": "Too many requests",
@@ -166,6 +185,8 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
                 },
                 headers={"Retry-After": "600"}
             )
+            await response(scope, receive, send)
+            return
         
         # Vérifier le rate limit
         if not self._check_rate_limit(client_ip, request):
@@ -179,7 +200,7 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
                 logger.warning("IP blocked for excessive rate limit violations", 
                              client_ip=client_ip)
             
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "error": "Rate limit exceeded",
@@ -188,20 +209,24 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
                 },
                 headers={"Retry-After": "60"}
             )
+            await response(scope, receive, send)
+            return
         
         # Enregistrer la requête
         self._record_request(client_ip)
         
-        # Continuer le traitement
-        response = await call_next(request)
-        
-        # Ajouter headers de rate limiting
-        remaining = self._get_remaining_requests(client_ip)
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(time.time()) + 60)
+        async def send_with_rate_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Ajouter headers de rate limiting
+                remaining = self._get_remaining_requests(client_ip)
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+                headers["X-RateLimit-Reset"] = str(int(time.time()) + 60)
+            await send(message)
         
-        return response
+        # Continuer le traitement
+        await self.app(scope, receive, send_with_rate_headers)
     
     def _get_client_ip(self, request: Request) -> str:
         """Même logique que RequestLoggingMiddleware"""
@@ -306,11 +331,18 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
                 logger.error("Error in rate limiting cleanup", error=str(e))
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """Middleware pour ajouter des headers de sécurité"""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
         
         # Headers de sécurité
         security_headers = {
@@ -343,21 +375,28 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "Server": "RobianAPI/1.0",
         }
         
-        # Ajouter les headers (sauf None)
-        for header, value in security_headers.items():
-            if value is not None:
-                response.headers[header] = value
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Ajouter les headers (sauf None)
+                headers = MutableHeaders(scope=message)
+                for header, value in security_headers.items():
+                    if value is not None:
+                        headers[header] = value
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
-class HealthCheckMiddleware(BaseHTTPMiddleware):
+class HealthCheckMiddleware:
     """Middleware pour bypass rapide des health checks"""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Bypass rapide pour les health checks
-        if request.url.path in ["/health", "/health/"]:
-            return JSONResponse(
+        if scope["type"] == "http" and scope["path"] in ["/health", "/health/"]:
+            response = JSONResponse(
                 content={
                     "status": "healthy",
                     "timestamp": datetime.now().isoformat(),
@@ -365,8 +404,10 @@ class HealthCheckMiddleware(BaseHTTPMiddleware):
                 },
                 headers={"Cache-Control": "no-cache"}
             )
+            await response(scope, receive, send)
+            return
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 def setup_cors_middleware(app):
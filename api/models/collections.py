@@ -8,8 +8,8 @@ from datetime import datetime
 from enum import Enum
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Boolean, Integer, Text, JSON, ForeignKey, Index, Table
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import String, DateTime, Boolean, Integer, Text, JSON, ForeignKey, Index, Table, text, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 
 from .database import Base
 
@@ -114,9 +114,22 @@ class Favorite(Base):
     
     # Identifiant unique
     id: Mapped[str] = mapped_column(
-        String(36), 
-        primary_key=True, 
-        default=lambda: str(uuid.uuid4())
+        UUID(as_uuid=False),  # uuid natif (16 octets), généré par PostgreSQL
+        primary_key=True,
+        server_default=text("gen_random_uuid()")
+    )
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
     )
     
     # Relations
@@ -145,7 +158,11 @@ class Favorite(Base):
     __table_args__ = (
         Index("idx_favorites_user", "user_id"),
         Index("idx_favorites_debate", "debate_id"),
-        Index("idx_favorites_user_debate", "user_id", "debate_id", unique=True),  # Un favori par user/debate
+        Index(
+            "idx_favorites_user_debate", "user_id", "debate_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True  # Un favori par user/debate, y compris sans user_id (ON CONFLICT)
+        ),
     )
     
     def __repr__(self):
@@ -157,24 +174,36 @@ class Favorite(Base):
         if not self.last_position_seconds or not self.debate:
             return None
         
-        # Utiliser la durée du débat en secondes
-        total_seconds = None
-        if self.debate.duration_minutes:
-            total_seconds = self.debate.duration_minutes * 60
-        elif self.debate.audio_files:
-            # Prendre la durée du premier fichier audio disponible
-            for audio_file in self.debate.audio_files:
-                if audio_file.duration_seconds:
-                    total_seconds = audio_file.duration_seconds
-                    break
+        # Durée du premier fichier audio, lue seulement sans durée annoncée
+        audio_duration_seconds = None
+        if not self.debate.duration_minutes and self.debate.audio_files:
+            audio_duration_seconds = next(
+                (af.duration_seconds for af in self.debate.audio_files if af.duration_seconds), None
+            )
         
-        if total_seconds:
-            return min(100.0, (self.last_position_seconds / total_seconds) * 100)
+        return self.compute_progress(
+            self.last_position_seconds,
+            self.debate.total_seconds(self.debate.duration_minutes, audio_duration_seconds)
+        )
+    
+    @staticmethod
+    def compute_progress(last_position_seconds: Optional[int], total_seconds: Optional[int]) -> Optional[float]:
+        """Pourcentage de progression pour une position et une durée totale"""
+        if not last_position_seconds or not total_seconds:
+            return None
+        return min(100.0, (last_position_seconds / total_seconds) * 100)
+    
+    def to_dict(self, total_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Conversion en dictionnaire pour API
+        `total_seconds` (durée du débat, 0 si inconnue) permet de convertir
+        un favori lu sans ses relations
+        """
+        if total_seconds is None:
+            progress_percentage = self.progress_percentage
+        else:
+            progress_percentage = self.compute_progress(self.last_position_seconds, total_seconds)
         
-        return None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Conversion en dictionnaire pour API"""
         return {
             "id": self.id,
             "user_id": self.user_id,
@@ -182,7 +211,7 @@ class Favorite(Base):
             "note": self.note,
             "tags": self.tags,
             "last_position_seconds": self.last_position_seconds,
-            "progress_percentage": self.progress_percentage,
+            "progress_percentage": progress_percentage,
             "watch_count": self.watch_count,
             "metadata": self.metadata,
             "created_at": self.created_at.isoformat(),
@@ -196,9 +225,9 @@ class UserActivity(Base):
     
     # Identifiant unique
     id: Mapped[str] = mapped_column(
-        String(36), 
-        primary_key=True, 
-        default=lambda: str(uuid.uuid4())
+        UUID(as_uuid=False),  # uuid natif (16 octets), généré par PostgreSQL
+        primary_key=True,
+        server_default=text("gen_random_uuid()")
     )
     
     # Utilisateur
@@ -8,8 +8,8 @@ from datetime import datetime, date
 from enum import Enum
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Boolean, Integer, Text, JSON, ForeignKey, Index, func
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import String, DateTime, Boolean, Integer, Text, JSON, ForeignKey, Index, Computed, func, text
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
 
 from .database import Base
 
@@ -95,6 +95,19 @@ class Debate(Base):
     view_count: Mapped[int] = mapped_column(Integer, default=0)
     download_count: Mapped[int] = mapped_column(Integer, default=0)
     
+    # Recherche plein texte (colonne générée par PostgreSQL, index GIN)
+    # immutable_array_to_string est créée par scripts/postgres-init.sql
+    search_vector: Mapped[Optional[Any]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('french'::regconfig, "
+            "coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || "
+            "immutable_array_to_string(coalesce(speakers, '{}') || coalesce(tags, '{}'), ' '))",
+            persisted=True
+        ),
+        deferred=True  # Jamais chargée avec le débat
+    )
+    
     # Relations
     audio_files: Mapped[List["AudioFile"]] = relationship(
         "AudioFile", 
@@ -110,6 +123,7 @@ class Debate(Base):
         Index("idx_debates_commission", "commission"),
         Index("idx_debates_search", "title", "description"),  # Index texte
         Index("idx_debates_speakers", "speakers"),  # Index array
+        Index("idx_debates_search_vector", "search_vector", postgresql_using="gin"),  # Plein texte
     )
     
     def __repr__(self):
@@ -128,18 +142,33 @@ class Debate(Base):
     @property
     def display_duration(self) -> str:
         """Durée formatée pour affichage"""
-        if not self.duration_minutes:
+        return self.format_duration(self.duration_minutes)
+    
+    @staticmethod
+    def format_duration(duration_minutes: Optional[int]) -> str:
+        """Formatage d'une durée en minutes (utilisable sans instance, ex. lignes Core)"""
+        if not duration_minutes:
             return "Durée inconnue"
         
-        hours = self.duration_minutes // 60
-        minutes = self.duration_minutes % 60
+        hours = duration_minutes // 60
+        minutes = duration_minutes % 60
         
         if hours > 0:
             return f"{hours}h {minutes}min"
         return f"{minutes}min"
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Conversion en dictionnaire pour API"""
+    @staticmethod
+    def total_seconds(duration_minutes: Optional[int], audio_duration_seconds: Optional[int]) -> Optional[int]:
+        """Durée totale en secondes : durée annoncée, sinon celle d'un fichier audio"""
+        if duration_minutes:
+            return duration_minutes * 60
+        return audio_duration_seconds or None
+    
+    def to_dict(self, has_audio: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Conversion en dictionnaire pour API
+        `has_audio` précalculé permet de convertir un débat lu sans ses fichiers audio
+        """
         return {
             "id": self.id,
             "title": self.title,
@@ -161,7 +190,7 @@ class Debate(Base):
             "tags": self.tags,
             "keywords": self.keywords,
             "is_live": self.is_live,
-            "has_audio": self.has_audio,
+            "has_audio": self.has_audio if has_audio is None else has_audio,
             "view_count": self.view_count,
             "download_count": self.download_count,
             "metadata": self.metadata,
@@ -233,7 +262,9 @@ class AudioFile(Base):
     
     # Index
     __table_args__ = (
-        Index("idx_audio_debate_id", "debate_id"),
+        # Dernier fichier d'un débat (/status) et dernier fichier terminé (/stream, /download)
+        Index("idx_audio_debate_created", "debate_id", text("created_at DESC")),
+        Index("idx_audio_debate_status_created", "debate_id", "extraction_status", text("created_at DESC")),
         Index("idx_audio_status", "extraction_status"),
         Index("idx_audio_format", "format"),
     )
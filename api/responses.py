@@ -0,0 +1,143 @@
+"""
+Réponses HTTP spécialisées pour RobianAPI
+Envoi des fichiers audio sans copie via l'extension ASGI http.response.pathsend
+et support des requêtes Range (206 Partial Content) pour le seek des lecteurs
+"""
+
+import os
+import re
+import stat
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+from .config import settings
+
+
+PATHSEND_EXTENSION = "http.response.pathsend"
+
+# Une seule plage "bytes=debut-fin" (les plages multiples sont ignorées : réponse complète)
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """Plage demandée hors du fichier"""
+
+
+class AudioFileResponse(FileResponse):
+    """
+    FileResponse pour les fichiers audio (streaming et téléchargement)
+
+    - Range : 206 avec seek + lectures bornées, seule la fenêtre demandée est lue
+    - pathsend : si le serveur annonce l'extension (Hypercorn, Granian, ...), le
+      fichier entier part en un seul sendfile() côté noyau
+    - sinon lecture par blocs de chunk_size (STREAMING_CHUNK_SIZE)
+    """
+
+    chunk_size = settings.streaming.chunk_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stat_result = self.stat_result
+        if stat_result is None:
+            stat_result = await self._stat_file()
+            self.set_stat_headers(stat_result)
+
+        file_size = stat_result.st_size
+        send_header_only = scope["method"].upper() == "HEAD"
+
+        try:
+            byte_range = self._requested_range(Headers(scope=scope), file_size)
+        except RangeNotSatisfiable:
+            response = PlainTextResponse(status_code=416, headers={"Content-Range": f"bytes */{file_size}"})
+            await response(scope, receive, send)
+            return
+
+        status_code = self.status_code
+        start, end = 0, file_size
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+            self.headers["content-length"] = str(end - start)
+
+        await send({"type": "http.response.start", "status": status_code, "headers": self.raw_headers})
+
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif byte_range is None and PATHSEND_EXTENSION in scope.get("extensions", {}):
+            await send({"type": PATHSEND_EXTENSION, "path": str(self.path)})
+        else:
+            await self._send_file(send, start, end)
+
+        if self.background is not None:
+            await self.background()
+
+    async def _stat_file(self) -> os.stat_result:
+        """stat() du fichier hors de la boucle d'événements"""
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            raise RuntimeError(f"File at path {self.path} does not exist.")
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise RuntimeError(f"File at path {self.path} is not a file.")
+        return stat_result
+
+    def _requested_range(self, headers: Headers, file_size: int) -> Optional[Tuple[int, int]]:
+        """Plage [debut, fin) demandée, ou None pour envoyer le fichier entier"""
+        http_range = headers.get("range")
+        if http_range is None:
+            return None
+
+        # If-Range périmé : le client doit recevoir la nouvelle version complète
+        if_range = headers.get("if-range")
+        if if_range is not None and if_range not in (self.headers.get("etag"), self.headers.get("last-modified")):
+            return None
+
+        match = _BYTE_RANGE.match(http_range.strip())
+        if match is None:
+            return None
+
+        first, last = match.groups()
+        if not first:
+            # Suffixe "bytes=-N" : les N derniers octets
+            if not last:
+                return None
+            suffix_length = int(last)
+            if suffix_length == 0:
+                raise RangeNotSatisfiable()
+            return max(0, file_size - suffix_length), file_size
+
+        start = int(first)
+        if start >= file_size:
+            raise RangeNotSatisfiable()
+        if last and int(last) < start:
+            return None
+
+        end = min(int(last) + 1, file_size) if last else file_size
+        return start, end
+
+    async def _send_file(self, send: Send, start: int, end: int) -> None:
+        """
+        Envoyer les octets [start, end) par blocs bornés
+
+        Pas de pool de bytearray réutilisés : un message ASGI doit porter des bytes,
+        et le transport (uvloop notamment) peut garder une référence au tampon après
+        send() ; un tampon recyclé serait réécrit avant d'être parti. Un read() par
+        bloc est donc la seule allocation, et pathsend évite ce chemin quand il existe.
+        """
+        remaining = end - start
+        more_body = remaining > 0
+
+        if more_body:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(start)
+                while more_body:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    remaining -= len(chunk)
+                    more_body = bool(chunk) and remaining > 0
+                    await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        else:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
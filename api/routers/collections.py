@@ -7,11 +7,25 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, delete
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, and_, delete, bindparam, exists
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+import orjson
 
-from ..models import get_db_session, Collection, Favorite, Debate, UserActivity, ActivityType, collection_debates
+from ..models import (
+    get_db_session,
+    get_session,
+    Collection,
+    Favorite,
+    Debate,
+    AudioFile,
+    UserActivity,
+    ActivityType,
+    collection_debates
+)
 from ..services import cache_service
 import structlog
 
@@ -19,21 +33,122 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/collections", tags=["collections"])
 
+# Nombre de lignes lues par lot depuis le curseur serveur
+STREAM_YIELD_PER = 500
+
+# Taille maximale d'un corps streamé mis en cache : au-delà, il n'est pas conservé
+# (mémoire bornée par requête)
+STREAM_CACHE_MAX_BYTES = 1024 * 1024
+
+# Requêtes construites une seule fois à l'import, paramétrées par bindparam
+# (évite de reconstruire les objets Select à chaque requête ; la compilation SQL
+# est ensuite servie par le cache de requêtes compilées du moteur)
+_COLLECTION_BY_ID = select(Collection).where(Collection.id == bindparam("cid"))
+_DEBATE_BY_ID = select(Debate).where(Debate.id == bindparam("did"))
+_COLLECTION_DEBATE_LINK = select(collection_debates).where(
+    collection_debates.c.collection_id == bindparam("cid"),
+    collection_debates.c.debate_id == bindparam("did")
+)
+_DELETE_COLLECTION_DEBATE_LINK = delete(collection_debates).where(
+    collection_debates.c.collection_id == bindparam("cid"),
+    collection_debates.c.debate_id == bindparam("did")
+)
+_COLLECTION_DEBATES = (
+    select(Debate)
+    .options(selectinload(Debate.audio_files))
+    .join(collection_debates)
+    .where(collection_debates.c.collection_id == bindparam("cid"))
+    .order_by(Debate.date.desc())
+)
+
+
+def _favorites_query(user_id: Optional[str]):
+    """
+    Favoris d'un utilisateur avec leur débat, sans charger les fichiers audio :
+    seuls les faits nécessaires à to_dict() sont lus en SQL (audio prêt, durée audio)
+    """
+    has_audio = exists().where(
+        AudioFile.debate_id == Debate.id,
+        AudioFile.extraction_status == "completed"
+    )
+    audio_duration_seconds = (
+        select(AudioFile.duration_seconds)
+        .where(AudioFile.debate_id == Debate.id, AudioFile.duration_seconds > 0)
+        .limit(1)
+        .scalar_subquery()
+    )
+    
+    return (
+        select(
+            Favorite,
+            Debate,
+            has_audio.label("has_audio"),
+            audio_duration_seconds.label("audio_duration_seconds")
+        )
+        .join(Debate, Favorite.debate_id == Debate.id)
+        .where(Favorite.user_id == user_id)
+        .order_by(Favorite.created_at.desc())
+    )
+
+
+async def _stream_json_array(query, prefix: bytes, suffix, cache_key: str, ttl: int, params: Optional[dict] = None):
+    """
+    Émettre un tableau JSON ligne par ligne depuis un curseur serveur
+    Utilise sa propre session : celle de la dépendance est fermée avant l'envoi du corps
+    `suffix` reçoit le nombre de lignes émises et retourne les octets de fermeture
+    """
+    # Marqueur posé avant la lecture : une invalidation du namespace pendant le stream
+    # l'efface, et le corps (lu avant elle) n'est alors pas mis en cache
+    filling_key = f"{cache_key}:filling"
+    await cache_service.set("metadata", filling_key, True, ttl=ttl)
+    
+    chunks = [prefix]
+    size = len(prefix)
+    yield prefix
+    count = 0
+    try:
+        async with get_session() as db:
+            result = await db.stream(query.execution_options(yield_per=STREAM_YIELD_PER), params)
+            async for row in result.scalars():
+                chunk = orjson.dumps(row.to_dict())
+                if count:
+                    chunk = b"," + chunk
+                count += 1
+                if chunks is not None:
+                    size += len(chunk)
+                    if size > STREAM_CACHE_MAX_BYTES:
+                        chunks = None
+                    else:
+                        chunks.append(chunk)
+                yield chunk
+    except Exception as e:
+        # Statut 200 déjà envoyé : l'exception interrompt la connexion (corps incomplet
+        # pour le client, jamais mis en cache)
+        logger.error("❌ Erreur pendant le stream JSON", cache_key=cache_key, rows=count, error=str(e))
+        raise
+    end = suffix(count)
+    yield end
+    
+    # Mise en cache du JSON déjà encodé (pas d'objets ORM ni de dicts intermédiaires)
+    if chunks is not None and await cache_service.delete("metadata", filling_key):
+        chunks.append(end)
+        await cache_service.set_raw("metadata", cache_key, b"".join(chunks), ttl=ttl)
+
 
 @router.get("/", response_model=List[dict])
 async def list_collections(
     user_id: Optional[str] = None,
-    include_public: bool = True,
-    db: AsyncSession = Depends(get_db_session)
+    include_public: bool = True
 ):
     """
     Lister les collections d'un utilisateur
+    Résultat streamé depuis un curseur serveur, sans liste intermédiaire
     """
     
     cache_key = f"collections_{user_id}_{include_public}"
-    cached_collections = await cache_service.get("metadata", cache_key)
+    cached_collections = await cache_service.get_raw("metadata", cache_key)
     if cached_collections:
-        return cached_collections
+        return Response(content=cached_collections, media_type="application/json")
     
     try:
         # Construction de la requête
@@ -57,19 +172,13 @@ async def list_collections(
         # Tri par ordre puis par nom
         query = query.order_by(Collection.sort_order, Collection.name)
         
-        result = await db.execute(query)
-        collections = result.scalars().all()
-        
-        # Convertir en dictionnaire
-        collections_data = [collection.to_dict() for collection in collections]
-        
-        # Cache pour 30 minutes
-        await cache_service.set("metadata", cache_key, collections_data, ttl=1800)
-        
-        logger.info("📂 Collections récupérées", 
-                   count=len(collections), user_id=user_id)
+        logger.info("📂 Collections streamées", user_id=user_id)
         
-        return collections_data
+        # Cache pour 30 minutes (alimenté en fin de stream)
+        return StreamingResponse(
+            _stream_json_array(query, b"[", lambda count: b"]", cache_key, ttl=1800),
+            media_type="application/json"
+        )
         
     except Exception as e:
         logger.error("❌ Erreur récupération collections", error=str(e))
@@ -124,7 +233,6 @@ async def create_collection(
         # Enregistrer l'activité
         if user_id:
             activity = UserActivity(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 action_type=ActivityType.CREATE_COLLECTION,
                 collection_id=collection.id,
@@ -155,41 +263,37 @@ async def get_collection(
 ):
     """
     Récupérer une collection spécifique avec ses débats
+    Les débats sont streamés depuis un curseur serveur
     """
     
     cache_key = f"collection_detail_{collection_id}"
-    cached_collection = await cache_service.get("metadata", cache_key)
+    cached_collection = await cache_service.get_raw("metadata", cache_key)
     if cached_collection:
-        return cached_collection
+        return Response(content=cached_collection, media_type="application/json")
     
     try:
         # Récupérer la collection
-        collection_query = select(Collection).where(Collection.id == collection_id)
-        collection_result = await db.execute(collection_query)
+        collection_result = await db.execute(_COLLECTION_BY_ID, {"cid": collection_id})
         collection = collection_result.scalars().first()
         
         if not collection:
             raise HTTPException(status_code=404, detail="Collection non trouvée")
         
-        # Récupérer les débats de la collection
-        debates_query = (
-            select(Debate)
-            .join(collection_debates)
-            .where(collection_debates.c.collection_id == collection_id)
-            .order_by(Debate.date.desc())
+        # En-tête de la réponse : la collection, puis le tableau des débats ouvert
+        prefix = orjson.dumps(collection.to_dict())[:-1] + b',"debates":['
+        
+        # Cache pour 1 heure (alimenté en fin de stream)
+        return StreamingResponse(
+            _stream_json_array(
+                _COLLECTION_DEBATES,
+                prefix,
+                lambda count: b'],"actual_debate_count":%d}' % count,
+                cache_key,
+                ttl=3600,
+                params={"cid": collection_id}
+            ),
+            media_type="application/json"
         )
-        debates_result = await db.execute(debates_query)
-        debates = debates_result.scalars().all()
-        
-        # Construire la réponse
-        collection_data = collection.to_dict()
-        collection_data["debates"] = [debate.to_dict() for debate in debates]
-        collection_data["actual_debate_count"] = len(debates)
-        
-        # Cache pour 1 heure
-        await cache_service.set("metadata", cache_key, collection_data, ttl=3600)
-        
-        return collection_data
         
     except HTTPException:
         raise
@@ -215,8 +319,7 @@ async def update_collection(
     
     try:
         # Récupérer la collection
-        query = select(Collection).where(Collection.id == collection_id)
-        result = await db.execute(query)
+        result = await db.execute(_COLLECTION_BY_ID, {"cid": collection_id})
         collection = result.scalars().first()
         
         if not collection:
@@ -266,8 +369,7 @@ async def delete_collection(
     
     try:
         # Récupérer la collection
-        query = select(Collection).where(Collection.id == collection_id)
-        result = await db.execute(query)
+        result = await db.execute(_COLLECTION_BY_ID, {"cid": collection_id})
         collection = result.scalars().first()
         
         if not collection:
@@ -306,27 +408,23 @@ async def add_debate_to_collection(
     
     try:
         # Vérifier que la collection existe
-        collection_query = select(Collection).where(Collection.id == collection_id)
-        collection_result = await db.execute(collection_query)
+        collection_result = await db.execute(_COLLECTION_BY_ID, {"cid": collection_id})
         collection = collection_result.scalars().first()
         
         if not collection:
             raise HTTPException(status_code=404, detail="Collection non trouvée")
         
         # Vérifier que le débat existe
-        debate_query = select(Debate).where(Debate.id == debate_id)
-        debate_result = await db.execute(debate_query)
+        debate_result = await db.execute(_DEBATE_BY_ID, {"did": debate_id})
         debate = debate_result.scalars().first()
         
         if not debate:
             raise HTTPException(status_code=404, detail="Débat non trouvé")
         
         # Vérifier si l'association existe déjà
-        existing_query = select(collection_debates).where(
-            collection_debates.c.collection_id == collection_id,
-            collection_debates.c.debate_id == debate_id
+        existing_result = await db.execute(
+            _COLLECTION_DEBATE_LINK, {"cid": collection_id, "did": debate_id}
         )
-        existing_result = await db.execute(existing_query)
         existing = existing_result.first()
         
         if existing:
@@ -351,7 +449,6 @@ async def add_debate_to_collection(
         # Enregistrer l'activité
         if user_id:
             activity = UserActivity(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 action_type=ActivityType.ADD_TO_COLLECTION,
                 debate_id=debate_id,
@@ -393,26 +490,21 @@ async def remove_debate_from_collection(
     
     try:
         # Vérifier que l'association existe
-        existing_query = select(collection_debates).where(
-            collection_debates.c.collection_id == collection_id,
-            collection_debates.c.debate_id == debate_id
+        existing_result = await db.execute(
+            _COLLECTION_DEBATE_LINK, {"cid": collection_id, "did": debate_id}
         )
-        existing_result = await db.execute(existing_query)
         existing = existing_result.first()
         
         if not existing:
             raise HTTPException(status_code=404, detail="Ce débat n'est pas dans la collection")
         
         # Supprimer l'association
-        delete_stmt = delete(collection_debates).where(
-            collection_debates.c.collection_id == collection_id,
-            collection_debates.c.debate_id == debate_id
+        await db.execute(
+            _DELETE_COLLECTION_DEBATE_LINK, {"cid": collection_id, "did": debate_id}
         )
-        await db.execute(delete_stmt)
         
         # Mettre à jour le compteur de débats
-        collection_query = select(Collection).where(Collection.id == collection_id)
-        collection_result = await db.execute(collection_query)
+        collection_result = await db.execute(_COLLECTION_BY_ID, {"cid": collection_id})
         collection = collection_result.scalars().first()
         
         if collection and collection.debate_count > 0:
@@ -458,41 +550,33 @@ async def list_favorites(
     """
     
     cache_key = f"favorites_{user_id}"
-    cached_favorites = await cache_service.get("metadata", cache_key)
-    if cached_favorites:
-        return cached_favorites
     
-    try:
-        # Récupérer les favoris avec les débats associés
-        query = (
-            select(Favorite)
-            .options(joinedload(Favorite.debate))
-            .where(Favorite.user_id == user_id)
-            .order_by(Favorite.created_at.desc())
-        )
-        
-        result = await db.execute(query)
-        favorites = result.scalars().unique().all()
-        
-        # Convertir en dictionnaire avec les détails du débat
-        favorites_data = []
-        for favorite in favorites:
-            favorite_dict = favorite.to_dict()
-            if favorite.debate:
-                favorite_dict["debate"] = favorite.debate.to_dict()
-            favorites_data.append(favorite_dict)
-        
-        # Cache pour 10 minutes
-        await cache_service.set("metadata", cache_key, favorites_data, ttl=600)
-        
-        logger.info("⭐ Favoris récupérés", 
-                   count=len(favorites), user_id=user_id)
-        
-        return favorites_data
-        
-    except Exception as e:
-        logger.error("❌ Erreur récupération favoris", error=str(e))
-        raise HTTPException(status_code=500, detail="Erreur lors de la récupération des favoris")
+    async def load_favorites() -> bytes:
+        """Lecture des favoris (miss du cache), JSON prêt à envoyer"""
+        try:
+            result = await db.execute(_favorites_query(user_id))
+            rows = result.all()
+            
+            # Champs dérivés calculés par les modèles (même forme que les autres endpoints)
+            favorites_data = []
+            for favorite, debate, has_audio, audio_duration_seconds in rows:
+                total_seconds = debate.total_seconds(debate.duration_minutes, audio_duration_seconds)
+                favorite_dict = favorite.to_dict(total_seconds=total_seconds or 0)
+                favorite_dict["debate"] = debate.to_dict(has_audio=has_audio)
+                favorites_data.append(favorite_dict)
+            
+            logger.info("⭐ Favoris récupérés", 
+                       count=len(rows), user_id=user_id)
+            
+            return orjson.dumps(favorites_data)
+            
+        except Exception as e:
+            logger.error("❌ Erreur récupération favoris", error=str(e))
+            raise HTTPException(status_code=500, detail="Erreur lors de la récupération des favoris")
+    
+    # Cache pour 10 minutes ; un seul calcul pour les requêtes identiques simultanées
+    payload = await cache_service.get_or_compute("metadata", cache_key, load_favorites, ttl=600, raw=True)
+    return Response(content=payload, media_type="application/json")
 
 
 @favorites_router.post("/{debate_id}")
@@ -507,57 +591,59 @@ async def add_favorite(
     """
     
     try:
-        # Vérifier que le débat existe
-        debate_query = select(Debate).where(Debate.id == debate_id)
-        debate_result = await db.execute(debate_query)
-        debate = debate_result.scalars().first()
-        
-        if not debate:
-            raise HTTPException(status_code=404, detail="Débat non trouvé")
-        
-        # Vérifier si déjà en favori
-        existing_query = select(Favorite).where(
-            Favorite.debate_id == debate_id,
-            Favorite.user_id == user_id
+        # Insertion unique : INSERT ... ON CONFLICT DO NOTHING dans une CTE,
+        # le titre du débat est relu dans la même requête (pas de SELECT préalable)
+        inserted = (
+            pg_insert(Favorite)
+            .values({
+                "user_id": user_id,
+                "debate_id": debate_id,
+                "note": note,
+                # Défauts Python explicites (non appliqués dans une CTE)
+                "tags": [],
+                "watch_count": 0,
+                "metadata": {}
+            })
+            .on_conflict_do_nothing(index_elements=["user_id", "debate_id"])
+            .returning(Favorite.debate_id)
+            .cte("inserted")
         )
-        existing_result = await db.execute(existing_query)
-        existing_favorite = existing_result.scalars().first()
         
-        if existing_favorite:
+        try:
+            result = await db.execute(
+                select(Debate.title).join(inserted, inserted.c.debate_id == Debate.id)
+            )
+        except IntegrityError as e:
+            # Violation de clé étrangère : le débat n'existe pas
+            await db.rollback()
+            if getattr(e.orig, "sqlstate", None) == "23503":
+                raise HTTPException(status_code=404, detail="Débat non trouvé")
+            raise
+        
+        debate_title = result.scalar()
+        if debate_title is None:
             raise HTTPException(status_code=409, detail="Ce débat est déjà dans vos favoris")
         
-        # Créer le favori
-        favorite = Favorite(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            debate_id=debate_id,
-            note=note
-        )
-        
-        db.add(favorite)
-        await db.commit()
-        await db.refresh(favorite)
-        
-        # Invalider le cache
-        await cache_service.delete("metadata", f"favorites_{user_id}")
-        
-        # Enregistrer l'activité
+        # Enregistrer l'activité dans la même transaction
         if user_id:
             activity = UserActivity(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 action_type=ActivityType.ADD_FAVORITE,
                 debate_id=debate_id,
-                action_data={"debate_title": debate.title}
+                action_data={"debate_title": debate_title}
             )
             db.add(activity)
-            await db.commit()
+        
+        await db.commit()
+        
+        # Invalider le cache
+        await cache_service.delete("metadata", f"favorites_{user_id}")
         
         logger.info("⭐ Favori ajouté", 
                    debate_id=debate_id, 
                    user_id=user_id)
         
-        return {"message": f"Débat '{debate.title}' ajouté aux favoris"}
+        return {"message": f"Débat '{debate_title}' ajouté aux favoris"}
         
     except HTTPException:
         raise
@@ -593,22 +679,21 @@ async def remove_favorite(
         
         # Supprimer le favori
         await db.delete(favorite)
-        await db.commit()
         
-        # Invalider le cache
-        await cache_service.delete("metadata", f"favorites_{user_id}")
-        
-        # Enregistrer l'activité
+        # Enregistrer l'activité dans la même transaction
         if user_id:
             activity = UserActivity(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 action_type=ActivityType.REMOVE_FAVORITE,
                 debate_id=debate_id,
                 action_data={"action": "removed"}
             )
             db.add(activity)
-            await db.commit()
+        
+        await db.commit()
+        
+        # Invalider le cache
+        await cache_service.delete("metadata", f"favorites_{user_id}")
         
         logger.info("⭐ Favori supprimé", 
                    debate_id=debate_id, 
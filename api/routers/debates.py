@@ -3,15 +3,26 @@ Router pour les débats de l'Assemblée nationale
 """
 
 import asyncio
-from typing import List, Optional
+import base64
+from typing import List, Optional, Tuple, Any
 from datetime import datetime, date
 
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, update, case, func, or_, and_, tuple_
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from ..models import get_db_session, get_session, Debate, AudioFile, DebateType, DebateStatus
+from ..models import (
+    get_db_session,
+    get_session,
+    Debate,
+    AudioFile,
+    DebateType,
+    DebateStatus
+)
 from ..schemas import (
     DebateResponse, 
     DebateListResponse, 
@@ -25,12 +36,99 @@ from ..services import (
     WebSocketMessage, 
     MessageType
 )
+from ..config import settings
+import orjson
+import xxhash
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/debates", tags=["debates"])
 
+# Expressions de tri autorisées (cf. DebateSearchFilters). Jamais NULL : en pagination
+# keyset, un NULL ne se compare à rien et casserait le curseur ; une colonne facultative
+# est ramenée à une valeur hors de son domaine (durée >= 0 : -1 pour "sans durée")
+SORT_COLUMNS = {
+    "date": Debate.date,
+    "title": Debate.title,
+    "created_at": Debate.created_at,
+    "updated_at": Debate.updated_at,
+    "view_count": Debate.view_count,
+    "duration_minutes": func.coalesce(Debate.duration_minutes, -1),
+}
+
+
+# Colonnes lues par la liste (la colonne de recherche plein texte est exclue)
+LIST_COLUMNS = [column for column in Debate.__table__.c if column.key != "search_vector"]
+
+
+def _debate_row_json(row, audio_files: List[AudioFile]) -> bytes:
+    """
+    DebateResponse encodé en JSON à partir d'une ligne Core et de ses fichiers audio
+    La ligne reste validée : les fichiers audio sont des entités ORM lues via from_attributes
+    """
+    return DebateResponse.model_validate({
+        **row,
+        "display_duration": Debate.format_duration(row["duration_minutes"]),
+        "is_live": row["status"] == DebateStatus.EN_COURS,
+        "has_audio": any(audio_file.is_ready for audio_file in audio_files),
+        "audio_files": audio_files,
+    }).model_dump_json().encode()
+
+
+def _encode_cursor(sort_value: Any, debate_id: str) -> str:
+    """Encoder la position (valeur de tri, id) du dernier débat d'une page"""
+    return base64.urlsafe_b64encode(orjson.dumps([sort_value, debate_id])).decode()
+
+
+def _decode_cursor(cursor: str, sort_column) -> Tuple[Any, str]:
+    """Décoder un curseur de pagination et retyper la valeur de tri"""
+    try:
+        sort_value, debate_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        python_type = sort_column.type.python_type
+        if python_type in (date, datetime):
+            sort_value = python_type.fromisoformat(sort_value)
+        return sort_value, debate_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+
+def _check_offset_depth(page: int, per_page: int):
+    """Refuser la pagination par offset trop profonde (parcours complet de l'index)"""
+    max_offset = settings.pagination.max_offset
+    if page * per_page > max_offset:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Pagination par page limitée à {max_offset} éléments "
+                f"(page {max_offset // per_page} max pour per_page={per_page}). "
+                "Au-delà, utilisez le paramètre cursor avec le next_cursor de la réponse précédente."
+            )
+        )
+
+
+def _list_cache_tags(type, status) -> List[str]:
+    """
+    Tags d'invalidation d'une liste : un par dimension filtrée (type, statut),
+    "debates:all" si aucune ne restreint la liste
+    """
+    tags = []
+    if type:
+        tags.append(f"debates:type:{getattr(type, 'value', type)}")
+    if status:
+        tags.append(f"debates:status:{getattr(status, 'value', status)}")
+    return tags or ["debates:all"]
+
+
+def _debate_cache_tags(debate: Debate) -> List[str]:
+    """Tags de toutes les entrées concernées par ce débat : listes, détail et streaming"""
+    return [
+        f"debate:{debate.id}",
+        "debates:all",
+        f"debates:type:{getattr(debate.type, 'value', debate.type)}",
+        f"debates:status:{getattr(debate.status, 'value', debate.status)}",
+    ]
+
 
 @router.get("/", response_model=DebateListResponse)
 async def list_debates(
@@ -41,7 +139,8 @@ async def list_debates(
     date_start: Optional[date] = Query(None, description="Date de début"),
     date_end: Optional[date] = Query(None, description="Date de fin"),
     has_audio: Optional[bool] = Query(None, description="Avec audio disponible"),
-    page: int = Query(1, ge=1, description="Numéro de page"),
+    cursor: Optional[str] = Query(None, description="Curseur de pagination (next_cursor de la page précédente)"),
+    page: int = Query(1, ge=1, description="Numéro de page (pagination par offset, legacy)"),
     per_page: int = Query(20, ge=1, le=100, description="Éléments par page"),
     sort_by: str = Query("date", description="Champ de tri"),
     sort_order: str = Query("desc", regex="^(asc|desc)$", description="Ordre de tri"),
@@ -49,120 +148,191 @@ async def list_debates(
 ):
     """
     Liste des débats avec recherche et filtres avancés
+    Pagination keyset via `cursor` (coût constant quelle que soit la profondeur),
+    `page` reste disponible pour la compatibilité
     Utilise le cache Redis pour les performances
     """
     
-    # Clé de cache basée sur tous les paramètres
-    cache_key = f"list_{q}_{type}_{status}_{commission}_{date_start}_{date_end}_{has_audio}_{page}_{per_page}_{sort_by}_{sort_order}"
+    if cursor is None and page > 1 and not settings.pagination.offset_pagination_enabled:
+        raise HTTPException(status_code=400, detail="Pagination par page désactivée, utilisez le paramètre cursor")
+    if cursor is None:
+        _check_offset_depth(page, per_page)
     
-    # Tentative de récupération depuis le cache
-    cached_result = await cache_service.get("debates", cache_key)
-    if cached_result:
-        logger.debug("📦 Débats depuis cache Redis", page=page, per_page=per_page)
-        return cached_result
+    # Clés de cache : hash court et de taille fixe des paramètres normalisés
+    filters_key = xxhash.xxh3_64_hexdigest(repr((q, type, status, commission, date_start, date_end, has_audio)))
+    cache_key = f"list_{xxhash.xxh3_64_hexdigest(repr((filters_key, cursor, page, per_page, sort_by, sort_order)))}"
+    # Tags d'invalidation (cf. _debate_cache_tags lors des écritures)
+    cache_tags = _list_cache_tags(type, status)
     
-    try:
-        # Construction de la requête de base
-        query = select(Debate).options(joinedload(Debate.audio_files))
-        count_query = select(func.count(Debate.id))
-        
-        # Filtres
-        filters = []
-        
-        if q:
-            # Recherche textuelle dans titre et description
-            # Pour les tableaux PostgreSQL, utiliser contains() avec un tableau
-            search_filter = or_(
-                Debate.title.ilike(f"%{q}%"),
-                Debate.description.ilike(f"%{q}%"),
-                Debate.speakers.contains([q]),  # Recherche dans le tableau speakers
-                Debate.tags.contains([q])       # Recherche dans le tableau tags
-            )
-            filters.append(search_filter)
-        
-        if type:
-            filters.append(Debate.type == type)
-        
-        if status:
-            filters.append(Debate.status == status)
-        
-        if commission:
-            filters.append(Debate.commission.ilike(f"%{commission}%"))
-        
-        if date_start:
-            filters.append(Debate.date >= date_start)
-        
-        if date_end:
-            filters.append(Debate.date <= date_end)
-        
-        if has_audio is not None:
-            if has_audio:
-                # Débats avec au moins un fichier audio prêt
-                filters.append(
-                    Debate.audio_files.any(AudioFile.extraction_status == "completed")
-                )
+    async def build_page() -> bytes:
+        """Requête de la page (miss du cache), JSON encodé une seule fois"""
+        try:
+            # Construction de la requête de base : en pagination par offset, le total
+            # est calculé dans la même requête (fenêtre évaluée avant LIMIT/OFFSET).
+            # En keyset, la fenêtre ne compterait que les lignes après le curseur.
+            # Lecture seule : lignes Core, sans identity map ni instrumentation ORM
+            if cursor:
+                query = select(*LIST_COLUMNS)
             else:
-                # Débats sans fichier audio ou en cours d'extraction
-                filters.append(
-                    or_(
-                        ~Debate.audio_files.any(),
-                        ~Debate.audio_files.any(AudioFile.extraction_status == "completed")
+                query = select(*LIST_COLUMNS, func.count().over().label("total_count"))
+            count_query = select(func.count(Debate.id))
+            
+            # Filtres
+            filters = []
+            
+            if q and len(q) >= 3:
+                # Recherche plein texte (titre, description, intervenants, tags) via l'index GIN
+                filters.append(Debate.search_vector.op("@@")(func.plainto_tsquery("french", q)))
+            elif q:
+                # Requête trop courte pour le plein texte : recherche par sous-chaîne
+                # Pour les tableaux PostgreSQL, utiliser contains() avec un tableau
+                search_filter = or_(
+                    Debate.title.ilike(f"%{q}%"),
+                    Debate.description.ilike(f"%{q}%"),
+                    Debate.speakers.contains([q]),  # Recherche dans le tableau speakers
+                    Debate.tags.contains([q])       # Recherche dans le tableau tags
+                )
+                filters.append(search_filter)
+            
+            if type:
+                filters.append(Debate.type == type)
+            
+            if status:
+                filters.append(Debate.status == status)
+            
+            if commission:
+                filters.append(Debate.commission.ilike(f"%{commission}%"))
+            
+            if date_start:
+                filters.append(Debate.date >= date_start)
+            
+            if date_end:
+                filters.append(Debate.date <= date_end)
+            
+            if has_audio is not None:
+                if has_audio:
+                    # Débats avec au moins un fichier audio prêt
+                    filters.append(
+                        Debate.audio_files.any(AudioFile.extraction_status == "completed")
                     )
+                else:
+                    # Débats sans fichier audio ou en cours d'extraction
+                    filters.append(
+                        or_(
+                            ~Debate.audio_files.any(),
+                            ~Debate.audio_files.any(AudioFile.extraction_status == "completed")
+                        )
+                    )
+            
+            # Appliquer tous les filtres (le COUNT ne voit pas le curseur)
+            if filters:
+                count_query = count_query.where(and_(*filters))
+            
+            # Tri stable : l'id départage les valeurs égales
+            sort_column = SORT_COLUMNS.get(sort_by, Debate.date)
+            descending = sort_order == "desc"
+            
+            # Pagination keyset : on reprend strictement après le dernier élément vu
+            if cursor:
+                last_value, last_id = _decode_cursor(cursor, sort_column)
+                position = tuple_(sort_column, Debate.id)
+                boundary = tuple_(last_value, last_id)
+                filters.append(position < boundary if descending else position > boundary)
+            
+            if filters:
+                query = query.where(and_(*filters))
+            
+            if descending:
+                query = query.order_by(sort_column.desc(), Debate.id.desc())
+            else:
+                query = query.order_by(sort_column.asc(), Debate.id.asc())
+            
+            # Valeur de tri lue telle que comparée par le curseur (après coalesce)
+            query = query.add_columns(sort_column.label("sort_value"))
+            
+            # Pagination (une ligne de plus pour savoir s'il existe une page suivante)
+            if not cursor:
+                query = query.offset((page - 1) * per_page)
+            query = query.limit(per_page + 1)
+            
+            # Exécution de la requête
+            result = await db.execute(query)
+            rows = result.mappings().all()
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            
+            # Fichiers audio de la page en une seule requête (entités ORM pour
+            # leurs propriétés calculées : is_ready, file_size_mb...)
+            audio_by_debate = {}
+            if rows:
+                audio_result = await db.execute(
+                    select(AudioFile).where(AudioFile.debate_id.in_([row["id"] for row in rows]))
                 )
-        
-        # Appliquer tous les filtres
-        if filters:
-            query = query.where(and_(*filters))
-            count_query = count_query.where(and_(*filters))
-        
-        # Tri
-        sort_column = getattr(Debate, sort_by, Debate.date)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        # Pagination
-        offset = (page - 1) * per_page
-        query = query.offset(offset).limit(per_page)
-        
-        # Exécution des requêtes
-        result = await db.execute(query)
-        debates = result.scalars().unique().all()
-        
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
-        
-        # Conversion en schémas de réponse
-        debate_responses = [DebateResponse.model_validate(debate) for debate in debates]
-        
-        # Calcul de la pagination
-        has_next = (page * per_page) < total
-        has_prev = page > 1
-        
-        response = DebateListResponse(
-            debates=debate_responses,
-            total=total,
-            page=page,
-            per_page=per_page,
-            has_next=has_next,
-            has_prev=has_prev
-        )
-        
-        # Mise en cache pour 5 minutes
-        await cache_service.set("debates", cache_key, response.model_dump(), ttl=300)
-        
-        logger.info("📺 Débats récupérés depuis base de données", 
-                   count=len(debates), page=page, total=total)
-        
-        return response
-        
-    except Exception as e:
-        logger.error("❌ Erreur récupération débats", error=str(e))
-        raise HTTPException(status_code=500, detail="Erreur lors de la récupération des débats")
+                for audio_file in audio_result.scalars():
+                    audio_by_debate.setdefault(audio_file.debate_id, []).append(audio_file)
+            
+            # Total partagé entre les pages d'un même filtre
+            count_key = f"count_{filters_key}"
+            if not cursor and rows:
+                total = rows[0]["total_count"]
+            elif not cursor and page == 1:
+                total = 0
+            else:
+                # Page keyset (ou au-delà de la dernière page) : total mis en cache
+                # par la première page, COUNT séparé seulement s'il a expiré
+                total = await cache_service.get("debates", count_key)
+                if total is None:
+                    count_result = await db.execute(count_query)
+                    total = count_result.scalar()
+            
+            if not cursor:
+                await cache_service.set(
+                    "debates", count_key, total, ttl=settings.pagination.count_cache_ttl, tags=cache_tags
+                )
+            
+            # Curseur de la page suivante : toujours présent quand has_next est vrai
+            next_cursor = None
+            if has_next and rows:
+                next_cursor = _encode_cursor(rows[-1]["sort_value"], rows[-1]["id"])
+            
+            # Sérialisation ligne par ligne directement en JSON (sérialiseur Rust de
+            # pydantic-core) : un seul modèle Pydantic vivant à la fois, ni dict
+            # intermédiaire ni DebateListResponse revalidée
+            debates_json = b",".join(
+                _debate_row_json(row, audio_by_debate.get(row["id"], []))
+                for row in rows
+            )
+            page_meta = orjson.dumps({
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "has_next": has_next,
+                "has_prev": bool(cursor) or page > 1,
+                "next_cursor": next_cursor
+            })
+            count = len(rows)
+            del rows
+            
+            # Encodage unique, mis en cache (5 minutes) et tagué par get_or_compute
+            logger.info("📺 Débats récupérés depuis base de données", 
+                       count=count, page=page, total=total)
+            
+            return b'{"debates":[' + debates_json + b"]," + page_meta[1:]
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("❌ Erreur récupération débats", error=str(e))
+            raise HTTPException(status_code=500, detail="Erreur lors de la récupération des débats")
+    
+    # Cache (JSON déjà encodé) ; un seul calcul pour les requêtes identiques simultanées
+    payload = await cache_service.get_or_compute(
+        "debates", cache_key, build_page, ttl=300, raw=True, tags=cache_tags
+    )
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/{debate_id}", response_model=DebateResponse)
+@router.get("/{debate_id}", responses={200: {"model": DebateResponse}})
 async def get_debate(
     debate_id: str,
     background_tasks: BackgroundTasks,
@@ -173,50 +343,51 @@ async def get_debate(
     Incrémente le compteur de vues de manière asynchrone
     """
     
-    # Cache check
     cache_key = f"detail_{debate_id}"
-    cached_debate = await cache_service.get("debates", cache_key)
-    if cached_debate:
-        # Incrémenter le compteur de vues en arrière-plan
-        background_tasks.add_task(increment_view_count, debate_id)
-        return DebateResponse(**cached_debate)
     
-    try:
-        # Requête avec jointure pour récupérer les fichiers audio
-        query = select(Debate).options(joinedload(Debate.audio_files)).where(Debate.id == debate_id)
-        result = await db.execute(query)
-        debate = result.scalars().first()
-        
-        if not debate:
-            raise HTTPException(status_code=404, detail=f"Débat {debate_id} non trouvé")
-        
-        # Conversion en schéma de réponse
-        debate_response = DebateResponse.model_validate(debate)
-        
-        # Cache pour 1 heure
-        await cache_service.set("debates", cache_key, debate_response.model_dump(), ttl=3600)
-
-        # Incrémenter le compteur de vues en arrière-plan
-        background_tasks.add_task(increment_view_count, debate_id)
-        
-        # Notifier via WebSocket
-        await websocket_manager.broadcast_to_channel(
-            f"debate:{debate_id}",
+    async def load_debate() -> bytes:
+        """Lecture du débat (miss du cache)"""
+        try:
+            # Fichiers audio chargés par une seule requête WHERE debate_id IN ...
+            debate = await db.get(Debate, debate_id, options=[selectinload(Debate.audio_files)])
+            
+            if not debate:
+                raise HTTPException(status_code=404, detail=f"Débat {debate_id} non trouvé")
+            
+            logger.info("📺 Détail débat récupéré", debate_id=debate_id)
+            return DebateResponse.model_validate(debate).model_dump_json().encode()
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("❌ Erreur récupération débat", debate_id=debate_id, error=str(e))
+            raise HTTPException(status_code=500, detail="Erreur lors de la récupération du débat")
+    
+    # Cache pour 1 heure (JSON déjà encodé, renvoyé tel quel) ; un seul calcul
+    # pour les requêtes identiques simultanées
+    # Tag du débat (invalidé avec ses infos de streaming en un seul appel),
+    # posé uniquement si l'entrée est effectivement écrite
+    payload = await cache_service.get_or_compute(
+        "debates", cache_key, load_debate, ttl=3600, raw=True, tags=[f"debate:{debate_id}"]
+    )
+    
+    # Incrémenter le compteur de vues en arrière-plan
+    background_tasks.add_task(increment_view_count, debate_id)
+    
+    # Notifier via WebSocket, uniquement si le canal a des abonnés, hors du chemin de réponse
+    channel = f"debate:{debate_id}"
+    if websocket_manager.has_subscribers(channel):
+        background_tasks.add_task(
+            websocket_manager.broadcast_to_channel,
+            channel,
             WebSocketMessage(
                 type=MessageType.SYSTEM_STATUS,
-                channel=f"debate:{debate_id}",
+                channel=channel,
                 data={"action": "viewed", "debate_id": debate_id}
             )
         )
-        
-        logger.info("📺 Détail débat récupéré", debate_id=debate_id)
-        return debate_response
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("❌ Erreur récupération débat", debate_id=debate_id, error=str(e))
-        raise HTTPException(status_code=500, detail="Erreur lors de la récupération du débat")
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/", response_model=DebateResponse)
@@ -230,22 +401,27 @@ async def create_debate(
     """
     
     try:
-        # Vérifier si un débat avec la même URL source existe déjà
-        existing_query = select(Debate).where(Debate.source_url == debate_data.source_url)
-        existing_result = await db.execute(existing_query)
-        existing_debate = existing_result.scalars().first()
+        # Insertion unique : URL source déjà présente -> aucune ligne retournée,
+        # colonnes générées par le serveur relues via RETURNING (pas de refresh)
+        stmt = (
+            pg_insert(Debate)
+            .values(**debate_data.model_dump())
+            .on_conflict_do_nothing(index_elements=["source_url"])
+            .returning(Debate)
+        )
+        result = await db.execute(select(Debate).from_statement(stmt))
+        debate = result.scalars().first()
         
-        if existing_debate:
+        if debate is None:
             raise HTTPException(status_code=409, detail="Un débat avec cette URL source existe déjà")
         
-        # Créer le nouveau débat
-        debate = Debate(**debate_data.model_dump())
-        db.add(debate)
         await db.commit()
-        await db.refresh(debate)
         
-        # Invalider le cache des listes
-        await cache_service.clear_namespace("debates")
+        # Débat neuf : aucun fichier audio, inutile de charger la relation
+        set_committed_value(debate, "audio_files", [])
+        
+        # Invalider uniquement les listes pouvant contenir ce débat
+        await cache_service.invalidate_tags(_debate_cache_tags(debate))
         
         # Notifier via WebSocket
         await websocket_manager.broadcast_to_channel(
@@ -280,14 +456,15 @@ async def update_debate(
     """
     
     try:
-        # Récupérer le débat existant
-        query = select(Debate).where(Debate.id == debate_id)
-        result = await db.execute(query)
-        debate = result.scalars().first()
+        # Récupérer le débat existant (fichiers audio inclus : ils font partie de la réponse)
+        debate = await db.get(Debate, debate_id, options=[selectinload(Debate.audio_files)])
         
         if not debate:
             raise HTTPException(status_code=404, detail=f"Débat {debate_id} non trouvé")
         
+        # Listes concernées avant modification (le type/statut peut changer)
+        cache_tags = _debate_cache_tags(debate)
+        
         # Mettre à jour les champs fournis
         update_data = debate_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
@@ -296,9 +473,8 @@ async def update_debate(
         await db.commit()
         await db.refresh(debate)
         
-        # Invalider le cache
-        await cache_service.delete("debates", f"detail_{debate_id}")
-        await cache_service.clear_namespace("debates")
+        # Invalider le cache (détail, listes d'avant et d'après modification)
+        await cache_service.invalidate_tags(list(dict.fromkeys(cache_tags + _debate_cache_tags(debate))))
         
         logger.info("📝 Débat mis à jour", debate_id=debate_id)
         
@@ -323,21 +499,20 @@ async def delete_debate(
     """
     
     try:
-        # Récupérer le débat
-        query = select(Debate).where(Debate.id == debate_id)
-        result = await db.execute(query)
-        debate = result.scalars().first()
+        # Récupérer le débat (lecture par clé primaire, servie par l'identity map si déjà chargé)
+        debate = await db.get(Debate, debate_id)
         
         if not debate:
             raise HTTPException(status_code=404, detail=f"Débat {debate_id} non trouvé")
         
+        cache_tags = _debate_cache_tags(debate)
+        
         # Supprimer (cascade supprimera aussi les audio_files)
         await db.delete(debate)
         await db.commit()
         
-        # Invalider le cache
-        await cache_service.delete("debates", f"detail_{debate_id}")
-        await cache_service.clear_namespace("debates")
+        # Invalider le cache (détail et listes)
+        await cache_service.invalidate_tags(cache_tags)
         
         logger.info("🗑️ Débat supprimé", debate_id=debate_id)
         
@@ -353,27 +528,50 @@ async def delete_debate(
 
 async def increment_view_count(debate_id: str):
     """
-    Incrémenter le compteur de vues de manière asynchrone
-    Crée sa propre session DB pour éviter les conflits avec la requête principale
+    Comptabiliser une vue dans le tampon Redis (INCR)
+    Le report en base se fait par lots via flush_view_counts
     """
-    try:
-        # Créer une nouvelle session pour le background task
-        async with get_session() as db:
-            query = select(Debate).where(Debate.id == debate_id)
-            result = await db.execute(query)
-            debate = result.scalars().first()
+    await cache_service.incr_counter("views_pending", debate_id)
 
-            if debate:
-                debate.view_count += 1
-                await db.commit()
 
-                # Invalider le cache pour forcer la mise à jour
-                await cache_service.delete("debates", f"detail_{debate_id}")
+async def flush_view_counts() -> int:
+    """
+    Reporter en base les vues accumulées : un seul UPDATE pour tous les débats
+    Crée sa propre session DB (appelé hors requête)
+    """
+    pending = await cache_service.drain_counters("views_pending")
+    if not pending:
+        return 0
+    
+    try:
+        async with get_session() as db:
+            await db.execute(
+                update(Debate)
+                .where(Debate.id.in_(list(pending)))
+                .values(view_count=func.coalesce(Debate.view_count, 0) + case(pending, value=Debate.id, else_=0))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+    except Exception as e:
+        # Réinjecter les vues pour le prochain passage
+        for debate_id, count in pending.items():
+            await cache_service.incr_counter("views_pending", debate_id, count)
+        logger.error("❌ Erreur report des vues", debates=len(pending), error=str(e))
+        return 0
+    
+    # Invalider le détail des débats concernés (un seul appel par lot, plus à chaque vue)
+    await cache_service.invalidate_tags([f"debate:{debate_id}" for debate_id in pending])
+    
+    total_views = sum(pending.values())
+    logger.debug("👀 Vues reportées en base", debates=len(pending), views=total_views)
+    return total_views
 
-                logger.debug("👀 Vue incrémentée", debate_id=debate_id, new_count=debate.view_count)
 
-    except Exception as e:
-        logger.error("❌ Erreur incrémentation vue", debate_id=debate_id, error=str(e))
+async def view_count_flusher(interval: int):
+    """Tâche de fond : report périodique des vues en base"""
+    while True:
+        await asyncio.sleep(interval)
+        await flush_view_counts()
 
 
 # Routes de compatibilité avec l'ancienne API
@@ -383,7 +581,7 @@ async def legacy_list_debates(
     date_fin: Optional[str] = None,
     type_debat: Optional[str] = None,
     commission: Optional[str] = None,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, description="Nombre de débats (100 au plus, au-delà ramené à 100)"),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
@@ -408,9 +606,16 @@ async def legacy_list_debates(
         except ValueError:
             pass
     
-    # Appeler la nouvelle API
+    # Appeler la nouvelle API (paramètres explicites : les défauts Query() ne
+    # sont résolus que par FastAPI, pas lors d'un appel direct)
+    params = dict(
+        q=None, type=None, status=None, commission=None,
+        date_start=None, date_end=None, has_audio=None,
+        cursor=None, page=1, sort_by="date", sort_order="desc"
+    )
+    params.update(filters)
     return await list_debates(
         per_page=min(limit, 100),
         db=db,
-        **filters
+        **params
     )
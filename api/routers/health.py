@@ -2,7 +2,9 @@
 Router pour les health checks et monitoring
 """
 
-from typing import Dict, Any
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, Depends
@@ -18,6 +20,51 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Mémo en processus du dernier check DB sain (absorbe les rafales de sondes
+# Kubernetes ; volontairement hors Redis pour fonctionner sans lui)
+DB_HEALTH_TTL = 2.0
+_db_health_memo: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+async def _check_database() -> Dict[str, Any]:
+    """Check de connexion DB mémoïsé DB_HEALTH_TTL secondes (succès uniquement)"""
+    global _db_health_memo
+    
+    now = time.monotonic()
+    if _db_health_memo and now - _db_health_memo[0] < DB_HEALTH_TTL:
+        return _db_health_memo[1]
+    
+    db_health = await DatabaseHealthCheck.check_connection()
+    
+    # Un échec n'est pas mémorisé : le prochain appel réessaie immédiatement
+    _db_health_memo = (now, db_health) if db_health.get("status") == "healthy" else None
+    return db_health
+
+
+def _probe_failed(error: BaseException, **defaults) -> Dict[str, Any]:
+    """Résultat d'une sonde en échec (exception renvoyée par asyncio.gather)"""
+    logger.warning("⚠️ Sonde de santé en échec", error=str(error))
+    return {"status": "unhealthy", "error": str(error), **defaults}
+
+
+async def _probe_services() -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Sondes base de données, cache et WebSockets exécutées en parallèle"""
+    db_health, cache_stats, ws_stats = await asyncio.gather(
+        _check_database(),
+        cache_service.get_stats(),
+        websocket_manager.get_stats(),
+        return_exceptions=True
+    )
+    
+    if isinstance(db_health, BaseException):
+        db_health = _probe_failed(db_health)
+    if isinstance(cache_stats, BaseException):
+        cache_stats = _probe_failed(cache_stats, redis_connected=False, memory_cache_size=0)
+    if isinstance(ws_stats, BaseException):
+        ws_stats = _probe_failed(ws_stats, total_connections=0, total_channels=0)
+    
+    return db_health, cache_stats, ws_stats
+
 
 @router.get("/")
 async def health_check_simple():
@@ -34,10 +81,8 @@ async def health_check_simple():
 async def health_check_detailed(db: AsyncSession = Depends(get_db_session)):
     """Health check détaillé avec vérification des services"""
     try:
-        # Vérifications des services
-        db_health = await DatabaseHealthCheck.check_connection()
-        cache_stats = await cache_service.get_stats()
-        ws_stats = await websocket_manager.get_stats()
+        # Vérifications des services (en parallèle)
+        db_health, cache_stats, ws_stats = await _probe_services()
         
         # Calcul du statut global
         overall_status = "healthy"
@@ -159,10 +204,8 @@ async def get_metrics():
         )
     
     try:
-        # Statistiques de base
-        db_health = await DatabaseHealthCheck.check_connection()
-        cache_stats = await cache_service.get_stats()
-        ws_stats = await websocket_manager.get_stats()
+        # Statistiques de base (en parallèle)
+        db_health, cache_stats, ws_stats = await _probe_services()
         
         metrics = {
             "robian_api_info": {
@@ -201,7 +244,7 @@ async def readiness_check():
     """
     try:
         # Vérifications critiques pour la readiness
-        db_health = await DatabaseHealthCheck.check_connection()
+        db_health = await _check_database()
         
         if db_health["status"] != "healthy":
             return JSONResponse(
@@ -4,37 +4,139 @@ Router pour le streaming et l'extraction audio
 
 import asyncio
 import uuid
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Dict, Set, List, Mapping
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, update, case, func, and_, event
+from sqlalchemy.orm import Session, object_session
 
-from ..models import get_db_session, Debate, AudioFile
+from ..models import get_db_session, get_session, Debate, AudioFile
 from ..schemas import ExtractionRequest, ExtractionResponse, StreamingInfoResponse
 from ..services import (
     cache_service, 
     websocket_manager, 
+    extraction_service,
     notify_extraction_started,
+    notify_extraction_progress,
     notify_extraction_completed,
     notify_extraction_failed
 )
 from ..config import settings
+from ..responses import AudioFileResponse
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/streaming", tags=["streaming"])
 
-# Stockage temporaire des tâches d'extraction
-extraction_tasks: Dict[str, Dict[str, Any]] = {}
+# URLs et en-têtes des fichiers audio, préparés une fois au chargement du module
+_STREAM_URL = "/api/streaming/{}/stream".format
+_DOWNLOAD_URL = "/api/streaming/{}/download".format
+_INLINE_DISPOSITION = 'inline; filename="{}"'.format
+_ATTACHMENT_DISPOSITION = 'attachment; filename="{}"'.format
+_STREAM_HEADERS: Mapping[str, str] = MappingProxyType({"Accept-Ranges": "bytes"})
 
 
-@router.get("/{debate_id}/info", response_model=StreamingInfoResponse)
+@dataclass
+class ExtractionJob:
+    """Extraction en file d'attente"""
+    extraction_id: str
+    debate_id: str
+    source_url: str
+    audio_file: AudioFile
+    extraction_request: ExtractionRequest
+
+
+# File d'extraction bornée, consommée par un nombre fixe de workers (créée avec les workers)
+extraction_queue: Optional["asyncio.Queue[ExtractionJob]"] = None
+
+# Extractions en cours, par extraction_id (pour l'annulation)
+running_extractions: Dict[str, asyncio.Task] = {}
+
+# Extractions tenues par ce processus (en file ou en cours) : leur heartbeat
+# ("extraction_alive:{id}", à TTL) est renouvelé tant qu'elles y restent. Une extraction
+# "pending"/"extracting" sans heartbeat n'est plus tenue par aucun worker (file en
+# mémoire perdue au redémarrage) : elle peut être marquée en erreur
+_owned_extractions: Set[str] = set()
+_HEARTBEAT_INTERVAL = 30
+_HEARTBEAT_TTL = 3 * _HEARTBEAT_INTERVAL
+_INTERRUPTED_ERROR = "Extraction interrompue (redémarrage du service), relancez-la"
+
+
+class ExtractionCancelled(Exception):
+    """Extraction annulée depuis un autre worker (constatée à la progression suivante)"""
+
+
+async def _claim_extraction(extraction_id: str):
+    """Prendre en charge une extraction dans ce processus (heartbeat posé immédiatement)"""
+    _owned_extractions.add(extraction_id)
+    await cache_service.set("extraction_alive", extraction_id, True, ttl=_HEARTBEAT_TTL)
+
+
+async def _live_extractions(extraction_ids: List[str]) -> Optional[Set[str]]:
+    """
+    Extractions dont le heartbeat est vivant ; None si Redis est indisponible (les
+    heartbeats des autres workers sont alors invisibles : rien n'est déclaré orphelin)
+    """
+    if not cache_service.connected:
+        return None
+    alive = await cache_service.mget("extraction_alive", extraction_ids)
+    if not cache_service.connected:
+        return None
+    return set(alive) | _owned_extractions
+
+
+# Tâches d'invalidation en vol (référence forte jusqu'à leur fin)
+_invalidation_tasks: Set[asyncio.Task] = set()
+
+
+@event.listens_for(AudioFile, "after_insert")
+@event.listens_for(AudioFile, "after_update")
+@event.listens_for(AudioFile, "after_delete")
+def _mark_streaming_info_stale(mapper, connection, target):
+    """Noter le débat dont l'info de streaming change (invalidée au commit)"""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("stale_streaming_info", set()).add(target.debate_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_streaming_info(session):
+    """Invalider le cache (/info et détail) des débats dont un AudioFile a été écrit"""
+    debate_ids = session.info.pop("stale_streaming_info", None)
+    if not debate_ids:
+        return
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    
+    task = loop.create_task(_invalidate_debates(debate_ids))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_streaming_info(session):
+    """Rien à invalider si la transaction est annulée"""
+    session.info.pop("stale_streaming_info", None)
+
+
+async def _invalidate_debates(debate_ids: Set[str]):
+    # Tag du débat : info de streaming et détail (qui liste les fichiers audio) en un appel
+    await cache_service.invalidate_tags([f"debate:{debate_id}" for debate_id in debate_ids])
+
+
+# Routes GET fréquentes (polling) : pas de response_model, le schéma reste documenté
+# via responses= et la réponse part déjà sérialisée
+@router.get("/{debate_id}/info", responses={200: {"model": StreamingInfoResponse}})
 async def get_streaming_info(
     debate_id: str,
     db: AsyncSession = Depends(get_db_session)
@@ -45,67 +147,75 @@ async def get_streaming_info(
     
     cache_key = f"streaming_info_{debate_id}"
     
-    # Cache check (TTL plus long pour les infos de streaming)
-    cached_info = await cache_service.get("streaming", cache_key)
-    if cached_info:
-        return StreamingInfoResponse(**cached_info)
-    
-    try:
-        # Récupérer le débat et ses fichiers audio
-        query = select(Debate).options(joinedload(Debate.audio_files)).where(Debate.id == debate_id)
+    async def load_info() -> bytes:
+        # Un seul SELECT de colonnes : le débat et son meilleur fichier audio (terminé d'abord)
+        query = (
+            select(
+                Debate.id,
+                AudioFile.extraction_status,
+                AudioFile.file_size,
+                AudioFile.duration_seconds,
+                AudioFile.format,
+                AudioFile.quality
+            )
+            .outerjoin(AudioFile, and_(
+                AudioFile.debate_id == Debate.id,
+                AudioFile.extraction_status.in_(("completed", "pending", "extracting"))
+            ))
+            .where(Debate.id == debate_id)
+            .order_by(
+                case((AudioFile.extraction_status == "completed", 0), else_=1),
+                AudioFile.created_at.desc()
+            )
+            .limit(1)
+        )
         result = await db.execute(query)
-        debate = result.scalars().first()
+        row = result.one_or_none()
         
-        if not debate:
+        if not row:
             raise HTTPException(status_code=404, detail=f"Débat {debate_id} non trouvé")
         
-        # Chercher le fichier audio principal (completed)
-        audio_file = None
-        for af in debate.audio_files:
-            if af.extraction_status == "completed":
-                audio_file = af
-                break
-        
-        if audio_file:
+        if row.extraction_status == "completed":
             # Audio disponible
             streaming_info = StreamingInfoResponse(
                 debate_id=debate_id,
                 audio_available=True,
-                stream_url=f"/api/streaming/{debate_id}/stream",
-                download_url=f"/api/streaming/{debate_id}/download",
-                file_size=audio_file.file_size,
-                duration_seconds=audio_file.duration_seconds,
-                format=audio_file.format,
-                quality=audio_file.quality,
-                extraction_status=audio_file.extraction_status,
+                stream_url=_STREAM_URL(debate_id),
+                download_url=_DOWNLOAD_URL(debate_id),
+                file_size=row.file_size,
+                duration_seconds=row.duration_seconds,
+                format=row.format,
+                quality=row.quality,
+                extraction_status=row.extraction_status,
                 message="Audio disponible pour streaming et téléchargement"
             )
+        elif row.extraction_status:
+            # Extraction en cours
+            streaming_info = StreamingInfoResponse(
+                debate_id=debate_id,
+                audio_available=False,
+                extraction_status=row.extraction_status,
+                message=f"Extraction audio en cours ({row.extraction_status})"
+            )
         else:
-            # Vérifier s'il y a une extraction en cours
-            extracting_file = None
-            for af in debate.audio_files:
-                if af.extraction_status in ["pending", "extracting"]:
-                    extracting_file = af
-                    break
-            
-            if extracting_file:
-                streaming_info = StreamingInfoResponse(
-                    debate_id=debate_id,
-                    audio_available=False,
-                    extraction_status=extracting_file.extraction_status,
-                    message=f"Extraction audio en cours ({extracting_file.extraction_status})"
-                )
-            else:
-                streaming_info = StreamingInfoResponse(
-                    debate_id=debate_id,
-                    audio_available=False,
-                    message="Aucun fichier audio disponible. Vous pouvez demander une extraction."
-                )
-        
-        # Cache pour 1 heure (les infos de streaming changent peu)
-        await cache_service.set("streaming", cache_key, streaming_info.model_dump(), ttl=3600)
+            streaming_info = StreamingInfoResponse(
+                debate_id=debate_id,
+                audio_available=False,
+                message="Aucun fichier audio disponible. Vous pouvez demander une extraction."
+            )
         
-        return streaming_info
+        # JSON encodé une seule fois, servi tel quel depuis le cache
+        return streaming_info.model_dump_json().encode()
+    
+    try:
+        # Un seul remplissage par clé froide : les requêtes simultanées attendent le premier
+        # (invalidé à chaque écriture d'un AudioFile : le TTL ne sert que de borne mémoire ;
+        # le tag du débat est posé avec l'écriture de l'entrée, jamais avant)
+        payload = await cache_service.get_or_compute(
+            "streaming", cache_key, load_info, ttl=settings.redis.cache_ttl_metadata, raw=True,
+            tags=[f"debate:{debate_id}"]
+        )
+        return Response(payload, media_type="application/json")
         
     except HTTPException:
         raise
@@ -118,7 +228,6 @@ async def get_streaming_info(
 async def request_extraction(
     debate_id: str,
     extraction_request: ExtractionRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db_session)
 ):
     """
@@ -126,35 +235,60 @@ async def request_extraction(
     """
     
     try:
-        # Vérifier que le débat existe
-        query = select(Debate).options(joinedload(Debate.audio_files)).where(Debate.id == debate_id)
+        # Le débat et son fichier audio le plus avancé (terminé > en cours > en attente), en une requête
+        query = (
+            select(Debate.source_url, AudioFile)
+            .outerjoin(AudioFile, and_(
+                AudioFile.debate_id == Debate.id,
+                AudioFile.extraction_status.in_(("completed", "pending", "extracting"))
+            ))
+            .where(Debate.id == debate_id)
+            .order_by(
+                case(
+                    (AudioFile.extraction_status == "completed", 0),
+                    (AudioFile.extraction_status == "extracting", 1),
+                    else_=2
+                ),
+                AudioFile.created_at.desc()
+            )
+            .limit(1)
+        )
         result = await db.execute(query)
-        debate = result.scalars().first()
+        row = result.one_or_none()
         
-        if not debate:
+        if not row:
             raise HTTPException(status_code=404, detail=f"Débat {debate_id} non trouvé")
         
+        existing_file = row.AudioFile
+        
         # Vérifier s'il y a déjà un fichier audio prêt
-        for audio_file in debate.audio_files:
-            if audio_file.extraction_status == "completed":
-                return ExtractionResponse(
-                    extraction_id=audio_file.id,
-                    debate_id=debate_id,
-                    status="completed",
-                    message="Audio déjà disponible",
-                    audio_file=audio_file.to_dict()
-                )
+        if existing_file is not None and existing_file.extraction_status == "completed":
+            return ExtractionResponse(
+                extraction_id=existing_file.id,
+                debate_id=debate_id,
+                status="completed",
+                message="Audio déjà disponible",
+                audio_file=existing_file.to_dict()
+            )
+        
+        # Extraction orpheline (aucun heartbeat : plus aucun worker ne la traite) :
+        # marquée en erreur et remplacée
+        if existing_file is not None:
+            live = await _live_extractions([existing_file.id])
+            if live is not None and existing_file.id not in live:
+                existing_file.extraction_status = "error"
+                existing_file.extraction_error = _INTERRUPTED_ERROR
+                existing_file = None
         
         # Vérifier s'il y a déjà une extraction en cours
-        for audio_file in debate.audio_files:
-            if audio_file.extraction_status in ["pending", "extracting"]:
-                return ExtractionResponse(
-                    extraction_id=audio_file.id,
-                    debate_id=debate_id,
-                    status=audio_file.extraction_status,
-                    message=f"Extraction déjà en cours ({audio_file.extraction_status})",
-                    estimated_duration="5-10 minutes"
-                )
+        if existing_file is not None:
+            return ExtractionResponse(
+                extraction_id=existing_file.id,
+                debate_id=debate_id,
+                status=existing_file.extraction_status,
+                message=f"Extraction déjà en cours ({existing_file.extraction_status})",
+                estimated_duration="5-10 minutes"
+            )
         
         # Créer un nouveau fichier audio pour l'extraction
         extraction_id = str(uuid.uuid4())
@@ -173,21 +307,30 @@ async def request_extraction(
             extraction_started_at=datetime.now()
         )
         
-        db.add(audio_file)
-        await db.commit()
-        await db.refresh(audio_file)
-        
-        # Démarrer l'extraction en arrière-plan
-        background_tasks.add_task(
-            perform_audio_extraction,
-            extraction_id=extraction_id,
-            debate=debate,
-            audio_file=audio_file,
-            extraction_request=extraction_request
-        )
-        
-        # Invalider le cache
-        await cache_service.delete("streaming", f"streaming_info_{debate_id}")
+        # Heartbeat posé avant le commit : la ligne n'est jamais visible sans lui
+        await _claim_extraction(extraction_id)
+        try:
+            db.add(audio_file)
+            await db.commit()
+            await db.refresh(audio_file)
+            
+            # Mettre l'extraction en file (traitée par les workers d'extraction) ; file pleine :
+            # la demande est retirée plutôt que laissée "pending" sans worker pour la traiter
+            try:
+                _get_extraction_queue().put_nowait(ExtractionJob(
+                    extraction_id=extraction_id,
+                    debate_id=debate_id,
+                    source_url=row.source_url,
+                    audio_file=audio_file,
+                    extraction_request=extraction_request
+                ))
+            except asyncio.QueueFull:
+                await db.delete(audio_file)
+                await db.commit()
+                raise HTTPException(status_code=503, detail="Trop d'extractions en attente, réessayez plus tard")
+        except BaseException:
+            _owned_extractions.discard(extraction_id)
+            raise
         
         # Notifier via WebSocket
         await notify_extraction_started(debate_id, extraction_id)
@@ -213,6 +356,75 @@ async def request_extraction(
         raise HTTPException(status_code=500, detail="Erreur lors de la demande d'extraction")
 
 
+@router.delete("/extract/{extraction_id}", response_model=ExtractionResponse)
+async def cancel_extraction(
+    extraction_id: str,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Annuler une extraction en attente ou en cours
+    """
+    
+    try:
+        result = await db.execute(select(AudioFile).where(AudioFile.id == extraction_id))
+        audio_file = result.scalars().first()
+        
+        if not audio_file:
+            raise HTTPException(status_code=404, detail=f"Extraction {extraction_id} non trouvée")
+        
+        if audio_file.extraction_status not in ("pending", "extracting"):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Extraction non annulable ({audio_file.extraction_status})"
+            )
+        
+        # En cours ici : annuler la tâche (extract() arrête le processus) et attendre l'arrêt ;
+        # encore en file : écartée par le worker (statut plus "pending") ; tenue par un
+        # autre worker : arrêtée à sa prochaine progression
+        task = running_extractions.get(extraction_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.wait([task], timeout=10)
+        else:
+            await cache_service.set(
+                "extraction_cancelled", extraction_id, True, ttl=settings.audio.extraction_timeout
+            )
+        
+        audio_file.extraction_status = "cancelled"
+        audio_file.extraction_error = "Extraction annulée"
+        await db.commit()
+        
+        await notify_extraction_failed(audio_file.debate_id, extraction_id, "Extraction annulée")
+        
+        logger.info("🛑 Extraction annulée", debate_id=audio_file.debate_id, extraction_id=extraction_id)
+        
+        return ExtractionResponse(
+            extraction_id=extraction_id,
+            debate_id=audio_file.debate_id,
+            status="cancelled",
+            message=_get_status_message("cancelled")
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("❌ Erreur annulation extraction", extraction_id=extraction_id, error=str(e))
+        raise HTTPException(status_code=500, detail="Erreur lors de l'annulation de l'extraction")
+
+
+async def _latest_completed_audio(db: AsyncSession, debate_id: str) -> Optional[AudioFile]:
+    """Dernier fichier audio terminé du débat (une requête, une ligne)"""
+    result = await db.execute(
+        select(AudioFile)
+        .where(AudioFile.debate_id == debate_id)
+        .where(AudioFile.extraction_status == "completed")
+        .order_by(AudioFile.created_at.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 @router.get("/{debate_id}/stream")
 async def stream_audio(
     debate_id: str,
@@ -220,18 +432,12 @@ async def stream_audio(
 ):
     """
     Streamer le fichier audio d'un débat
+    Les requêtes Range (seek des lecteurs) reçoivent un 206 avec la seule plage demandée
     """
     
     try:
         # Récupérer le fichier audio prêt
-        query = (
-            select(AudioFile)
-            .where(AudioFile.debate_id == debate_id)
-            .where(AudioFile.extraction_status == "completed")
-            .order_by(AudioFile.created_at.desc())
-        )
-        result = await db.execute(query)
-        audio_file = result.scalars().first()
+        audio_file = await _latest_completed_audio(db, debate_id)
         
         if not audio_file:
             raise HTTPException(status_code=404, detail="Aucun fichier audio disponible pour ce débat")
@@ -243,23 +449,17 @@ async def stream_audio(
                         file_path=str(file_path))
             raise HTTPException(status_code=404, detail="Fichier audio introuvable sur le serveur")
         
-        # Incrémenter le compteur de stream
-        audio_file.stream_count += 1
-        await db.commit()
+        # Comptabiliser l'écoute (report en base par lots)
+        await cache_service.incr_counter("streams_pending", audio_file.id)
         
-        # Headers pour le streaming
-        headers = {
-            "Accept-Ranges": "bytes",
-            "Content-Length": str(audio_file.file_size),
-            "Content-Type": f"audio/{audio_file.format}",
-            "Content-Disposition": f'inline; filename="{audio_file.filename}"'
-        }
+        # Headers pour le streaming (Content-Type via media_type, Content-Length issu du stat du fichier)
+        headers = {**_STREAM_HEADERS, "Content-Disposition": _INLINE_DISPOSITION(audio_file.filename)}
         
         logger.info("🎵 Streaming audio", 
                    debate_id=debate_id, 
                    file_size=audio_file.file_size_mb)
         
-        return FileResponse(
+        return AudioFileResponse(
             path=file_path,
             headers=headers,
             media_type=f"audio/{audio_file.format}"
@@ -283,14 +483,7 @@ async def download_audio(
     
     try:
         # Récupérer le fichier audio prêt
-        query = (
-            select(AudioFile)
-            .where(AudioFile.debate_id == debate_id)
-            .where(AudioFile.extraction_status == "completed")
-            .order_by(AudioFile.created_at.desc())
-        )
-        result = await db.execute(query)
-        audio_file = result.scalars().first()
+        audio_file = await _latest_completed_audio(db, debate_id)
         
         if not audio_file:
             raise HTTPException(status_code=404, detail="Aucun fichier audio disponible pour ce débat")
@@ -302,29 +495,18 @@ async def download_audio(
                         file_path=str(file_path))
             raise HTTPException(status_code=404, detail="Fichier audio introuvable sur le serveur")
         
-        # Incrémenter le compteur de téléchargement
-        audio_file.download_count += 1
-        
-        # Incrémenter aussi le compteur global du débat
-        debate_query = select(Debate).where(Debate.id == debate_id)
-        debate_result = await db.execute(debate_query)
-        debate = debate_result.scalars().first()
-        if debate:
-            debate.download_count += 1
-        
-        await db.commit()
+        # Comptabiliser le téléchargement, sur le fichier et sur le débat (report en base par lots)
+        await cache_service.incr_counter("downloads_pending", audio_file.id)
+        await cache_service.incr_counter("debate_downloads_pending", debate_id)
         
         # Headers pour le téléchargement
-        headers = {
-            "Content-Disposition": f'attachment; filename="{audio_file.filename}"',
-            "Content-Length": str(audio_file.file_size),
-        }
+        headers = {"Content-Disposition": _ATTACHMENT_DISPOSITION(audio_file.filename)}
         
         logger.info("📥 Téléchargement audio", 
                    debate_id=debate_id, 
                    file_size=audio_file.file_size_mb)
         
-        return FileResponse(
+        return AudioFileResponse(
             path=file_path,
             headers=headers,
             media_type="application/octet-stream"
@@ -337,7 +519,7 @@ async def download_audio(
         raise HTTPException(status_code=500, detail="Erreur lors du téléchargement audio")
 
 
-@router.get("/{debate_id}/status", response_model=ExtractionResponse)
+@router.get("/{debate_id}/status", responses={200: {"model": ExtractionResponse}})
 async def get_extraction_status(
     debate_id: str,
     db: AsyncSession = Depends(get_db_session)
@@ -359,14 +541,10 @@ async def get_extraction_status(
         if not audio_file:
             raise HTTPException(status_code=404, detail="Aucune extraction trouvée pour ce débat")
         
-        # Calculer la progression si en cours
+        # Progression réelle publiée par l'extraction (poussée aussi en WebSocket)
         progress = None
         if audio_file.extraction_status == "extracting":
-            # Estimation basée sur le temps écoulé
-            if audio_file.extraction_started_at:
-                elapsed = (datetime.now() - audio_file.extraction_started_at).total_seconds()
-                estimated_total = 600  # 10 minutes estimation
-                progress = min(90, int((elapsed / estimated_total) * 100))
+            progress = await cache_service.get("extraction_progress", audio_file.id)
         
         response = ExtractionResponse(
             extraction_id=audio_file.id,
@@ -378,7 +556,7 @@ async def get_extraction_status(
             audio_file=audio_file.to_dict() if audio_file.extraction_status == "completed" else None
         )
         
-        return response
+        return ORJSONResponse(response.model_dump(mode="json"))
         
     except HTTPException:
         raise
@@ -389,132 +567,288 @@ async def get_extraction_status(
 
 async def perform_audio_extraction(
     extraction_id: str,
-    debate: Debate,
+    debate_id: str,
+    source_url: str,
     audio_file: AudioFile,
     extraction_request: ExtractionRequest
 ):
     """
     Effectuer l'extraction audio en arrière-plan
-    Cette fonction simule l'extraction - en production, utiliser yt-dlp + FFmpeg
+    Le travail lourd part dans un processus d'extraction_service ; ici ne
+    restent que les transitions de statut, le cache et les notifications WebSocket
     """
     
-    try:
-        # Mettre à jour le statut à "extracting"
-        from ..models import AsyncSessionLocal
-        async with AsyncSessionLocal() as db:
-            # Récupérer le fichier audio
-            query = select(AudioFile).where(AudioFile.id == extraction_id)
-            result = await db.execute(query)
+    from ..models import AsyncSessionLocal
+    
+    # Une seule session pour toutes les transitions : le fichier est lu une fois,
+    # chaque changement de statut n'est plus qu'un UPDATE (la connexion est rendue
+    # au pool entre deux commits, pas pendant l'extraction)
+    async with AsyncSessionLocal() as db:
+        current_audio_file = None
+        try:
+            result = await db.execute(select(AudioFile).where(AudioFile.id == extraction_id))
             current_audio_file = result.scalars().first()
             
             if not current_audio_file:
                 logger.error("❌ AudioFile non trouvé", extraction_id=extraction_id)
                 return
             
+            # Annulée (ou marquée orpheline) pendant son attente dans la file
+            if current_audio_file.extraction_status != "pending":
+                logger.info("⏭️ Extraction écartée", extraction_id=extraction_id,
+                           status=current_audio_file.extraction_status)
+                return
+            
+            # Mettre à jour le statut à "extracting"
             current_audio_file.extraction_status = "extracting"
             await db.commit()
-        
-        # Invalider le cache
-        await cache_service.delete("streaming", f"streaming_info_{debate.id}")
-        
-        logger.info("🎵 Début extraction audio", 
-                   debate_id=debate.id, 
-                   extraction_id=extraction_id,
-                   source_url=debate.source_url)
-        
-        # SIMULATION - En production, remplacer par vraie extraction
-        if settings.app.environment == "development":
-            # Simulation d'extraction (3-8 secondes)
-            import random
-            await asyncio.sleep(random.uniform(3, 8))
             
-            # Simuler un fichier audio créé
-            file_path = Path(audio_file.file_path)
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            logger.info("🎵 Début extraction audio", 
+                       debate_id=debate_id, 
+                       extraction_id=extraction_id,
+                       source_url=source_url)
             
-            # Créer un fichier vide pour la démo
-            file_path.write_text("# Fichier audio simulé pour démo\n")
-            file_size = 150 * 1024 * 1024  # 150 MB simulés
-            duration_seconds = 7800  # 2h10 simulées
-        else:
-            # EN PRODUCTION: Ici utiliser yt-dlp + FFmpeg
-            # from scripts.extract_audio import extract_audio_from_url
-            # file_path, file_size, duration_seconds = await extract_audio_from_url(
-            #     debate.source_url,
-            #     audio_file.file_path,
-            #     format=extraction_request.format,
-            #     quality=extraction_request.quality
-            # )
-            raise NotImplementedError("Production extraction not implemented yet")
-        
-        # Mettre à jour le fichier audio avec les résultats
-        async with AsyncSessionLocal() as db:
-            query = select(AudioFile).where(AudioFile.id == extraction_id)
-            result = await db.execute(query)
-            final_audio_file = result.scalars().first()
+            async def report_progress(pct: int):
+                # Annulation reçue par un autre worker : extract() arrête le processus
+                if await cache_service.get("extraction_cancelled", extraction_id):
+                    raise ExtractionCancelled(extraction_id)
+                # Dernière valeur pour /status (repli), diffusion WS pour les abonnés
+                await cache_service.set("extraction_progress", extraction_id, pct)
+                await notify_extraction_progress(debate_id, extraction_id, pct)
+            
+            # Extraction dans un processus dédié (simulée en développement)
+            file_size, duration_seconds = await extraction_service.extract(
+                source_url,
+                audio_file.file_path,
+                extraction_request.format,
+                extraction_request.quality,
+                on_progress=report_progress
+            )
+            
+            # Annulée pendant l'extraction (par un autre worker, sans progression depuis) :
+            # le résultat n'écrase pas le statut
+            await db.refresh(current_audio_file, ["extraction_status"])
+            if current_audio_file.extraction_status != "extracting":
+                raise ExtractionCancelled(extraction_id)
+            
+            # Mettre à jour le fichier audio avec les résultats
+            current_audio_file.extraction_status = "completed"
+            current_audio_file.extraction_completed_at = datetime.now()
+            current_audio_file.file_size = file_size
+            current_audio_file.duration_seconds = duration_seconds
+            current_audio_file.stream_url = _STREAM_URL(debate_id)
+            current_audio_file.download_url = _DOWNLOAD_URL(debate_id)
+            await db.commit()  # invalide l'info de streaming et le détail (tag debate:{id})
             
-            if final_audio_file:
-                final_audio_file.extraction_status = "completed"
-                final_audio_file.extraction_completed_at = datetime.now()
-                final_audio_file.file_size = file_size
-                final_audio_file.duration_seconds = duration_seconds
-                final_audio_file.stream_url = f"/api/streaming/{debate.id}/stream"
-                final_audio_file.download_url = f"/api/streaming/{debate.id}/download"
+            # Notifier via WebSocket
+            await notify_extraction_completed(
+                debate_id, 
+                extraction_id, 
+                current_audio_file.stream_url,
+                file_size
+            )
+            
+            logger.info("✅ Extraction audio terminée", 
+                       debate_id=debate_id, 
+                       extraction_id=extraction_id,
+                       file_size_mb=round(file_size / (1024*1024), 2),
+                       duration_seconds=duration_seconds)
+            
+        except ExtractionCancelled:
+            # Statut "cancelled" déjà écrit par la route d'annulation ; le fichier produit
+            # (complet ou partiel) n'appartient plus à aucune extraction
+            await db.rollback()
+            Path(audio_file.file_path).unlink(missing_ok=True)
+            logger.info("🛑 Extraction arrêtée", debate_id=debate_id, extraction_id=extraction_id)
+            
+        except Exception as e:
+            # Marquer l'extraction comme échouée
+            try:
+                await db.rollback()
+                if current_audio_file is not None:
+                    current_audio_file.extraction_status = "error"
+                    current_audio_file.extraction_error = str(e)
+                    await db.commit()
                 
-                await db.commit()
-        
-        # Invalider le cache
-        await cache_service.delete("streaming", f"streaming_info_{debate.id}")
-        await cache_service.delete("debates", f"detail_{debate.id}")
-        
-        # Notifier via WebSocket
-        await notify_extraction_completed(
-            debate.id, 
-            extraction_id, 
-            f"/api/streaming/{debate.id}/stream",
-            file_size
-        )
-        
-        logger.info("✅ Extraction audio terminée", 
-                   debate_id=debate.id, 
-                   extraction_id=extraction_id,
-                   file_size_mb=round(file_size / (1024*1024), 2),
-                   duration_seconds=duration_seconds)
-        
-    except Exception as e:
-        # Marquer l'extraction comme échouée
-        try:
-            async with AsyncSessionLocal() as db:
-                query = select(AudioFile).where(AudioFile.id == extraction_id)
-                result = await db.execute(query)
-                failed_audio_file = result.scalars().first()
+                # Notifier l'échec
+                await notify_extraction_failed(debate_id, extraction_id, str(e))
                 
-                if failed_audio_file:
-                    failed_audio_file.extraction_status = "error"
-                    failed_audio_file.extraction_error = str(e)
-                    await db.commit()
+            except Exception as update_error:
+                logger.error("❌ Erreur mise à jour statut échec", error=str(update_error))
+            
+            logger.error("❌ Échec extraction audio", 
+                        debate_id=debate_id, 
+                        extraction_id=extraction_id, 
+                        error=str(e))
+
+
+def _get_extraction_queue() -> "asyncio.Queue[ExtractionJob]":
+    """File d'extraction (bornée à 4 jobs par worker)"""
+    global extraction_queue
+    if extraction_queue is None:
+        extraction_queue = asyncio.Queue(maxsize=settings.audio.max_concurrent_extractions * 4)
+    return extraction_queue
+
+
+async def extraction_worker():
+    """Worker : consomme la file et exécute les extractions une par une"""
+    queue = _get_extraction_queue()
+    while True:
+        job = await queue.get()
+        try:
+            task = asyncio.create_task(perform_audio_extraction(
+                extraction_id=job.extraction_id,
+                debate_id=job.debate_id,
+                source_url=job.source_url,
+                audio_file=job.audio_file,
+                extraction_request=job.extraction_request
+            ))
+            running_extractions[job.extraction_id] = task
+            try:
+                # wait() ne propage pas l'annulation de la tâche : le worker continue
+                await asyncio.wait([task])
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+        finally:
+            running_extractions.pop(job.extraction_id, None)
+            _owned_extractions.discard(job.extraction_id)
+            queue.task_done()
+
+
+async def fail_stale_extractions() -> int:
+    """
+    Marquer en erreur les extractions orphelines laissées par un arrêt précédent
+    (file en mémoire perdue) et supprimer leurs fichiers partiels ; celles dont le
+    heartbeat est vivant appartiennent à un autre worker et ne sont pas touchées
+    """
+    try:
+        async with get_session() as db:
+            result = await db.execute(
+                select(AudioFile).where(AudioFile.extraction_status.in_(("pending", "extracting")))
+            )
+            candidates = result.scalars().all()
+            if not candidates:
+                return 0
             
-            # Notifier l'échec
-            await notify_extraction_failed(debate.id, extraction_id, str(e))
+            live = await _live_extractions([audio_file.id for audio_file in candidates])
+            if live is None:
+                logger.warning("⚠️ Redis indisponible : extractions orphelines non vérifiées")
+                return 0
             
-        except Exception as update_error:
-            logger.error("❌ Erreur mise à jour statut échec", error=str(update_error))
-        
-        logger.error("❌ Échec extraction audio", 
-                    debate_id=debate.id, 
-                    extraction_id=extraction_id, 
-                    error=str(e))
+            stale_files = [audio_file for audio_file in candidates if audio_file.id not in live]
+            for audio_file in stale_files:
+                audio_file.extraction_status = "error"
+                audio_file.extraction_error = _INTERRUPTED_ERROR
+                Path(audio_file.file_path).unlink(missing_ok=True)
+            await db.commit()
+    except Exception as e:
+        logger.error("❌ Erreur nettoyage extractions orphelines", error=str(e))
+        return 0
+    
+    if stale_files:
+        logger.warning("⚠️ Extractions orphelines marquées en erreur", count=len(stale_files))
+    return len(stale_files)
+
+
+async def extraction_heartbeat(interval: int = _HEARTBEAT_INTERVAL):
+    """Tâche de fond : renouveler le heartbeat des extractions tenues par ce processus"""
+    while True:
+        await asyncio.sleep(interval)
+        for extraction_id in list(_owned_extractions):
+            await cache_service.set("extraction_alive", extraction_id, True, ttl=_HEARTBEAT_TTL)
+
+
+def start_extraction_workers() -> List[asyncio.Task]:
+    """Démarrer les workers d'extraction (un par extraction simultanée autorisée) et le heartbeat"""
+    _get_extraction_queue()
+    return [
+        asyncio.create_task(extraction_worker())
+        for _ in range(settings.audio.max_concurrent_extractions)
+    ] + [asyncio.create_task(extraction_heartbeat())]
+
+
+async def flush_audio_counters() -> int:
+    """
+    Reporter en base les écoutes et téléchargements accumulés
+    Un UPDATE pour les fichiers audio, un pour les débats ; crée sa propre session DB
+    """
+    streams = await cache_service.drain_counters("streams_pending")
+    downloads = await cache_service.drain_counters("downloads_pending")
+    debate_downloads = await cache_service.drain_counters("debate_downloads_pending")
+    if not (streams or downloads or debate_downloads):
+        return 0
+    
+    try:
+        async with get_session() as db:
+            audio_ids = set(streams) | set(downloads)
+            if audio_ids:
+                values = {}
+                if streams:
+                    values["stream_count"] = func.coalesce(AudioFile.stream_count, 0) + case(
+                        streams, value=AudioFile.id, else_=0
+                    )
+                if downloads:
+                    values["download_count"] = func.coalesce(AudioFile.download_count, 0) + case(
+                        downloads, value=AudioFile.id, else_=0
+                    )
+                await db.execute(
+                    update(AudioFile)
+                    .where(AudioFile.id.in_(list(audio_ids)))
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+            
+            if debate_downloads:
+                await db.execute(
+                    update(Debate)
+                    .where(Debate.id.in_(list(debate_downloads)))
+                    .values(download_count=func.coalesce(Debate.download_count, 0) + case(
+                        debate_downloads, value=Debate.id, else_=0
+                    ))
+                    .execution_options(synchronize_session=False)
+                )
+            
+            await db.commit()
+    except Exception as e:
+        # Réinjecter les compteurs pour le prochain passage
+        for namespace, pending in (
+            ("streams_pending", streams),
+            ("downloads_pending", downloads),
+            ("debate_downloads_pending", debate_downloads),
+        ):
+            for key, count in pending.items():
+                await cache_service.incr_counter(namespace, key, count)
+        logger.error("❌ Erreur report des compteurs audio", error=str(e))
+        return 0
+    
+    total = sum(streams.values()) + sum(downloads.values())
+    logger.debug("🎧 Compteurs audio reportés en base",
+                streams=sum(streams.values()),
+                downloads=sum(downloads.values()))
+    return total
+
+
+async def audio_counter_flusher(interval: int):
+    """Tâche de fond : report périodique des écoutes et téléchargements"""
+    while True:
+        await asyncio.sleep(interval)
+        await flush_audio_counters()
+
+
+# Messages user-friendly par statut d'extraction (construits une fois, en lecture seule)
+_STATUS_MESSAGES: Mapping[str, str] = MappingProxyType({
+    "pending": "Extraction en attente de démarrage",
+    "extracting": "Extraction audio en cours...",
+    "completed": "Extraction terminée avec succès",
+    "error": "Erreur lors de l'extraction",
+    "cancelled": "Extraction annulée"
+})
 
 
 def _get_status_message(status: str) -> str:
     """Obtenir un message user-friendly pour le statut"""
-    messages = {
-        "pending": "Extraction en attente de démarrage",
-        "extracting": "Extraction audio en cours...",
-        "completed": "Extraction terminée avec succès",
-        "error": "Erreur lors de l'extraction"
-    }
-    return messages.get(status, f"Statut inconnu: {status}")
+    return _STATUS_MESSAGES.get(status, f"Statut inconnu: {status}")
 
 
 # Routes de compatibilité avec l'ancienne API
@@ -5,6 +5,7 @@ Schémas Pydantic pour RobianAPI
 from .debates import (
     DebateTypeSchema,
     DebateStatusSchema,
+    DebateFields,
     DebateBase,
     DebateCreate,
     DebateUpdate,
@@ -16,6 +17,7 @@ from .debates import (
     ScheduledSessionResponse,
     ExtractionRequest,
     ExtractionResponse,
+    ExtractionProgressEvent,
     StreamingInfoResponse,
     DebateStatsResponse
 )
@@ -23,6 +25,7 @@ from .debates import (
 __all__ = [
     "DebateTypeSchema",
     "DebateStatusSchema", 
+    "DebateFields",
     "DebateBase",
     "DebateCreate",
     "DebateUpdate",
@@ -34,6 +37,7 @@ __all__ = [
     "ScheduledSessionResponse",
     "ExtractionRequest",
     "ExtractionResponse",
+    "ExtractionProgressEvent",
     "StreamingInfoResponse",
     "DebateStatsResponse"
 ]
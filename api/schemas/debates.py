@@ -3,12 +3,21 @@ Schémas Pydantic pour les débats
 Validation et sérialisation des données API
 """
 
-from typing import List, Optional, Dict, Any
+import re
+from typing import List, Optional, Dict, Any, Literal, Annotated
 from datetime import datetime, date
 from enum import Enum
 
-from pydantic import BaseModel, Field, validator, ConfigDict
-from pydantic.types import constr, conint
+from pydantic import BaseModel, Field, validator, ConfigDict, StringConstraints
+from pydantic.types import conint
+
+
+# Motifs compilés une seule fois à l'import
+_URL_RE = re.compile(r"^https?://", re.ASCII)
+_HHMM_RE = re.compile(r"^([01]?[0-9]|2[0-3]):[0-5][0-9]$")
+
+Title = Annotated[str, StringConstraints(min_length=1, max_length=500)]
+TimeHHMM = Annotated[str, StringConstraints(pattern=_HHMM_RE)]
 
 
 class DebateTypeSchema(str, Enum):
@@ -30,9 +39,16 @@ class DebateStatusSchema(str, Enum):
     ERREUR = "erreur"
 
 
-class DebateBase(BaseModel):
-    """Schéma de base pour un débat"""
-    title: constr(min_length=1, max_length=500) = Field(..., description="Titre du débat")
+# Valeurs fermées validées par pydantic-core (aucun validateur Python par requête)
+SortField = Literal["date", "title", "created_at", "updated_at", "view_count", "duration_minutes"]
+SortOrder = Literal["asc", "desc"]
+ExtractionPriority = Literal["low", "normal", "high", "urgent"]
+ExtractionFormat = Literal["mp3", "aac", "wav"]
+
+
+class DebateFields(BaseModel):
+    """Champs communs d'un débat (sans validateurs : partagés avec les réponses)"""
+    title: Title = Field(..., description="Titre du débat")
     description: Optional[str] = Field(None, description="Description détaillée")
     type: DebateTypeSchema = Field(..., description="Type de débat")
     date: date = Field(..., description="Date du débat")
@@ -51,18 +67,22 @@ class DebateBase(BaseModel):
     tags: List[str] = Field(default=[], description="Tags associés")
     keywords: List[str] = Field(default=[], description="Mots-clés")
     metadata: Dict[str, Any] = Field(default={}, description="Métadonnées supplémentaires")
+
+
+class DebateBase(DebateFields):
+    """Schéma de base pour un débat en entrée (validation des URLs et des listes)"""
     
     @validator('source_url', 'video_url', 'thumbnail_url')
     def validate_urls(cls, v):
-        if v and not (v.startswith('http://') or v.startswith('https://')):
+        if v and _URL_RE.match(v) is None:
             raise ValueError('URL must start with http:// or https://')
         return v
     
     @validator('speakers', 'ministers', 'tags', 'keywords')
     def validate_lists(cls, v):
-        # Nettoyer et dédupliquer les listes
+        # Nettoyer et dédupliquer les listes (ordre d'origine conservé, clés de cache stables)
         if v:
-            return list(set(item.strip() for item in v if item and item.strip()))
+            return list(dict.fromkeys(filter(None, map(str.strip, v))))
         return []
 
 
@@ -73,7 +93,7 @@ class DebateCreate(DebateBase):
 
 class DebateUpdate(BaseModel):
     """Schéma pour mettre à jour un débat"""
-    title: Optional[constr(min_length=1, max_length=500)] = None
+    title: Optional[Title] = None
     description: Optional[str] = None
     type: Optional[DebateTypeSchema] = None
     status: Optional[DebateStatusSchema] = None
@@ -121,8 +141,12 @@ class AudioFileSchema(BaseModel):
     updated_at: datetime
 
 
-class DebateResponse(DebateBase):
-    """Schéma de réponse pour un débat"""
+class DebateResponse(DebateFields):
+    """
+    Schéma de réponse pour un débat
+    Hérite des seuls champs : les données lues en base ne repassent pas par
+    les validateurs d'entrée de DebateBase
+    """
     model_config = ConfigDict(from_attributes=True)
     
     id: str
@@ -145,6 +169,7 @@ class DebateListResponse(BaseModel):
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = Field(None, description="Curseur de la page suivante (pagination keyset)")
 
 
 class DebateSearchFilters(BaseModel):
@@ -164,28 +189,15 @@ class DebateSearchFilters(BaseModel):
     per_page: conint(ge=1, le=100) = Field(20, description="Éléments par page")
     
     # Tri
-    sort_by: Optional[str] = Field("date", description="Champ de tri")
-    sort_order: Optional[str] = Field("desc", description="Ordre de tri (asc/desc)")
-    
-    @validator('sort_order')
-    def validate_sort_order(cls, v):
-        if v not in ['asc', 'desc']:
-            raise ValueError('sort_order must be "asc" or "desc"')
-        return v
-    
-    @validator('sort_by')
-    def validate_sort_by(cls, v):
-        allowed_fields = ['date', 'title', 'created_at', 'updated_at', 'view_count', 'duration_minutes']
-        if v not in allowed_fields:
-            raise ValueError(f'sort_by must be one of: {", ".join(allowed_fields)}')
-        return v
+    sort_by: SortField = Field("date", description="Champ de tri")
+    sort_order: SortOrder = Field("desc", description="Ordre de tri (asc/desc)")
 
 
 class ScheduledSessionCreate(BaseModel):
     """Schéma pour créer une session programmée"""
     date: date = Field(..., description="Date de la session")
-    start_time: constr(regex=r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$') = Field(..., description="Heure de début (HH:MM)")
-    title: constr(min_length=1, max_length=500) = Field(..., description="Titre de la session")
+    start_time: TimeHHMM = Field(..., description="Heure de début (HH:MM)")
+    title: Title = Field(..., description="Titre de la session")
     type: DebateTypeSchema = Field(..., description="Type de session")
     commission: Optional[str] = Field(None, description="Commission")
     salle: Optional[str] = Field(None, description="Salle")
@@ -207,21 +219,9 @@ class ScheduledSessionResponse(ScheduledSessionCreate):
 class ExtractionRequest(BaseModel):
     """Demande d'extraction audio"""
     debate_id: str = Field(..., description="ID du débat")
-    priority: str = Field("normal", description="Priorité de l'extraction")
-    format: str = Field("mp3", description="Format audio souhaité")
+    priority: ExtractionPriority = Field("normal", description="Priorité de l'extraction")
+    format: ExtractionFormat = Field("mp3", description="Format audio souhaité")
     quality: str = Field("192k", description="Qualité audio")
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        if v not in ['low', 'normal', 'high', 'urgent']:
-            raise ValueError('priority must be one of: low, normal, high, urgent')
-        return v
-    
-    @validator('format')
-    def validate_format(cls, v):
-        if v not in ['mp3', 'aac', 'wav']:
-            raise ValueError('format must be one of: mp3, aac, wav')
-        return v
 
 
 class ExtractionResponse(BaseModel):
@@ -236,6 +236,18 @@ class ExtractionResponse(BaseModel):
     audio_file: Optional[AudioFileSchema] = None
 
 
+class ExtractionProgressEvent(BaseModel):
+    """
+    Données d'un message WebSocket "extraction_progress"
+    Diffusé sur les canaux "extractions" et "debate:{debate_id}" à chaque étape
+    réelle de l'extraction ; /status reste disponible en repli pour les clients sans WS
+    """
+    debate_id: str
+    extraction_id: str
+    status: str = "extracting"
+    progress: int = Field(..., ge=0, le=100, description="Avancement en pourcentage")
+
+
 class StreamingInfoResponse(BaseModel):
     """Informations de streaming"""
     debate_id: str
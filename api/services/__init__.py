@@ -1,7 +1,12 @@
 """
 Services pour RobianAPI
+Le cache et l'extraction sont chargés immédiatement ; le service WebSocket est
+importé au premier accès (module __getattr__), pour que
+`from api.services import cache_service` n'entraîne pas tout le reste
 """
 
+import importlib
+
 from .cache_service import (
     cache_service,
     cache_debates,
@@ -13,31 +18,57 @@ from .cache_service import (
     cached
 )
 
-from .websocket_service import (
-    websocket_manager,
-    WebSocketMessage,
-    MessageType,
-    ChannelType,
-    notify_debate_started,
-    notify_debate_ended,
-    notify_extraction_started,
-    notify_extraction_completed,
-    notify_extraction_failed,
-    notify_system_status,
-    WebSocketMiddleware
+# Chargement immédiat : le nom extraction_service est aussi celui du sous-module,
+# qu'un import direct (api.services.extraction_service) lierait sur le package
+from .extraction_service import (
+    extraction_service,
+    ExtractionService
 )
 
+# Nom exporté -> sous-module qui le définit (import différé)
+_LAZY_EXPORTS = {
+    # WebSockets
+    "websocket_manager": ".websocket_service",
+    "WebSocketMessage": ".websocket_service",
+    "MessageType": ".websocket_service",
+    "ChannelType": ".websocket_service",
+    "notify_debate_started": ".websocket_service",
+    "notify_debate_ended": ".websocket_service",
+    "notify_extraction_started": ".websocket_service",
+    "notify_extraction_progress": ".websocket_service",
+    "notify_extraction_completed": ".websocket_service",
+    "notify_extraction_failed": ".websocket_service",
+    "notify_system_status": ".websocket_service",
+    "WebSocketMiddleware": ".websocket_service",
+}
+
+
+def __getattr__(name: str):
+    """Importer le sous-module d'un export différé au premier accès"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # accès suivants sans passer par __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
+
+
 __all__ = [
     # Cache
     "cache_service",
     "cache_debates",
-    "get_cached_debates", 
+    "get_cached_debates",
     "cache_streaming",
     "get_cached_streaming",
     "cache_metadata",
     "get_cached_metadata",
     "cached",
-    
+
     # WebSockets
     "websocket_manager",
     "WebSocketMessage",
@@ -46,8 +77,13 @@ __all__ = [
     "notify_debate_started",
     "notify_debate_ended",
     "notify_extraction_started",
+    "notify_extraction_progress",
     "notify_extraction_completed",
     "notify_extraction_failed",
     "notify_system_status",
-    "WebSocketMiddleware"
+    "WebSocketMiddleware",
+
+    # Extraction
+    "extraction_service",
+    "ExtractionService"
 ]
@@ -3,29 +3,134 @@ Service de cache Redis pour RobianAPI
 Support multi-niveaux avec fallback graceful
 """
 
-import json
 import asyncio
-from typing import Any, Optional, Union, Dict, List
-from datetime import datetime, timedelta
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional, Union, Dict, List, Tuple, Type, Callable, Awaitable
 import redis.asyncio as redis
 from redis.exceptions import ConnectionError, TimeoutError
-import pickle
-import hashlib
 import logging
+import msgpack
+import orjson
+import xxhash
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Hash non cryptographique des clés longues
+_SHORT_HASH = xxhash.xxh3_64_intdigest
+
+# Préfixe des valeurs msgpack : 0xC1 n'est jamais émis par msgpack ni par JSON
+_MSGPACK_MARKER = b"\xc1"
+
+# Types étendus msgpack
+_EXT_SET = 1
+_EXT_DECIMAL = 2
+_EXT_DATETIME = 3
+
+
+def _json_default(value: Any) -> Any:
+    """Types non natifs pour orjson (datetime, UUID et dataclasses le sont déjà)"""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Types non natifs pour msgpack (repli des valeurs non sérialisables en JSON)"""
+    if isinstance(value, (set, frozenset)):
+        return msgpack.ExtType(_EXT_SET, msgpack.packb(list(value), default=_msgpack_default, use_bin_type=True))
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type non sérialisable en cache: {type(value).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Décodage des types étendus msgpack"""
+    if code == _EXT_SET:
+        # Éléments en tuples : ils doivent rester hashables
+        return set(msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, use_list=False, raw=False))
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+# Invalidation atomique par tags : SMEMBERS de chaque set de tag puis UNLINK
+# des entrées associées (par lots pour respecter la limite d'arguments Lua) ;
+# retourne {nombre supprimé, clés concernées} pour l'éviction des caches L1
+_INVALIDATE_TAGS_SCRIPT = """
+local count = 0
+local removed = {}
+for _, tag_key in ipairs(KEYS) do
+    local members = redis.call('SMEMBERS', tag_key)
+    for i = 1, #members, 500 do
+        count = count + redis.call('UNLINK', unpack(members, i, math.min(i + 499, #members)))
+    end
+    for _, member in ipairs(members) do
+        removed[#removed + 1] = member
+    end
+    redis.call('UNLINK', tag_key)
+end
+return {count, removed}
+"""
+
+# Écriture et tags en une seule opération atomique : l'entrée n'est indexée
+# que si elle a réellement été écrite (SET NX), et aucune invalidation ne peut
+# s'intercaler entre l'écriture et l'indexation (KEYS[1] = entrée, KEYS[2..] = sets de tags ;
+# ARGV = valeur, TTL, NX, TTL des tags)
+_STORE_TAGGED_SCRIPT = """
+local stored
+if ARGV[3] == '1' then
+    stored = redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2], 'NX')
+else
+    stored = redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+end
+if not stored then
+    return 0
+end
+local tag_ttl = tonumber(ARGV[4])
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    -- Le set vit au moins aussi longtemps que l'entrée la plus durable
+    if redis.call('TTL', KEYS[i]) < tag_ttl then
+        redis.call('EXPIRE', KEYS[i], tag_ttl)
+    end
+end
+return 1
+"""
+
+# Canal pub/sub des évictions L1 (clés modifiées ou supprimées, diffusées à tous les workers)
+_L1_EVICT_CHANNEL = "cache:l1_evict"
+
 
 class CacheService:
     """Service de cache Redis avec fallback mémoire"""
     
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
-        self.memory_cache: Dict[str, Dict] = {}
+        self.memory_cache: "OrderedDict[str, Dict]" = OrderedDict()  # ordre LRU
+        self.pending_counters: Dict[str, int] = {}
+        self.memory_tags: Dict[str, set] = {}
+        self._compute_locks: Dict[str, List] = {}  # clé -> [verrou, nb d'appels en attente]
+        self._inflight: Dict[str, asyncio.Task] = {}  # GET Redis partagés en cours, par clé
+        self.l1_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()  # clé -> (expiration, octets)
+        self._l1_listener: Optional[asyncio.Task] = None
+        self._l1_subscribed = False  # L1 alimenté seulement pendant l'écoute des évictions
         self.connected = False
         self.max_memory_cache_size = 1000
+        self.l1_max_size = settings.redis.l1_cache_size
+        self.l1_ttl = settings.redis.l1_cache_ttl
         
     async def connect(self):
         """Connexion à Redis avec retry automatique"""
@@ -45,12 +150,20 @@ class CacheService:
             self.connected = True
             logger.info("✅ Connexion Redis établie")
             
+            if self.l1_ttl > 0 and self.l1_max_size > 0:
+                self._l1_listener = asyncio.create_task(self._listen_l1_evictions())
+            
         except Exception as e:
             logger.warning(f"⚠️ Échec connexion Redis: {e}. Utilisation cache mémoire.")
             self.connected = False
     
     async def disconnect(self):
         """Fermeture propre de la connexion"""
+        if self._l1_listener is not None:
+            self._l1_listener.cancel()
+            self._l1_listener = None
+        self.l1_cache.clear()
+        
         if self.redis_client:
             await self.redis_client.close()
             self.connected = False
@@ -59,73 +172,121 @@ class CacheService:
     def _generate_key(self, namespace: str, key: str, **kwargs) -> str:
         """Génération de clé unique avec namespace"""
         if kwargs:
-            # Inclure les paramètres dans la clé
-            params_str = json.dumps(kwargs, sort_keys=True)
-            key_data = f"{namespace}:{key}:{params_str}"
-        else:
-            key_data = f"{namespace}:{key}"
+            # Paramètres réduits à un hash xxh3 de taille fixe (ordre des noms normalisé)
+            params_hash = xxhash.xxh3_64()
+            for name in sorted(kwargs):
+                params_hash.update(name.encode())
+                params_hash.update(b"=")
+                params_hash.update(repr(kwargs[name]).encode())
+                params_hash.update(b"&")
+            return f"{namespace}:{key}:{params_hash.hexdigest()}"
+        
+        key_data = f"{namespace}:{key}"
         
-        # Hash pour éviter les clés trop longues
+        # Hash pour éviter les clés trop longues (xxh3 64 bits complet, sans troncature)
         if len(key_data) > 200:
-            hash_suffix = hashlib.md5(key_data.encode()).hexdigest()[:8]
+            hash_suffix = f"{_SHORT_HASH(key_data.encode()):016x}"
             key_data = f"{namespace}:{key[:50]}...{hash_suffix}"
         
         return key_data
     
     def _serialize_value(self, value: Any) -> bytes:
-        """Sérialisation robuste des valeurs"""
+        """
+        Sérialisation des valeurs : JSON orjson sans enveloppe (l'expiration est
+        portée par le TTL de la clé), msgpack pour les valeurs non sérialisables en JSON
+        """
         try:
-            # Tentative JSON d'abord (plus rapide)
-            if isinstance(value, (dict, list, str, int, float, bool)) or value is None:
-                return json.dumps({
-                    'type': 'json',
-                    'data': value,
-                    'timestamp': datetime.now().isoformat()
-                }).encode()
-            else:
-                # Fallback pickle pour objets complexes
-                return pickle.dumps({
-                    'type': 'pickle',
-                    'data': value,
-                    'timestamp': datetime.now().isoformat()
-                })
+            return orjson.dumps(value, default=_json_default)
+        except TypeError:
+            return _MSGPACK_MARKER + msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
         except Exception as e:
             logger.error(f"Erreur sérialisation: {e}")
             raise
     
     def _deserialize_value(self, data: bytes) -> Any:
-        """Désérialisation robuste des valeurs"""
+        """
+        Désérialisation des valeurs (préfixe msgpack, sinon JSON), directement
+        depuis les octets Redis : ni décodage en str ni copie du payload
+        """
         try:
-            # Tentative JSON d'abord
-            try:
-                json_data = json.loads(data.decode())
-                if isinstance(json_data, dict) and 'type' in json_data:
-                    return json_data['data']
-                return json_data
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                # Fallback pickle
-                pickle_data = pickle.loads(data)
-                if isinstance(pickle_data, dict) and 'type' in pickle_data:
-                    return pickle_data['data']
-                return pickle_data
+            if data[:1] == _MSGPACK_MARKER:
+                return msgpack.unpackb(
+                    memoryview(data)[1:], ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False
+                )
+            return orjson.loads(data)
         except Exception as e:
-            logger.error(f"Erreur désérialisation: {e}")
+            # Aperçu hexadécimal borné plutôt que le décodage de tout le payload
+            logger.error(f"Erreur désérialisation: {e} (début: {data[:64].hex()})")
             return None
     
-    async def _memory_cache_cleanup(self):
-        """Nettoyage du cache mémoire si trop plein"""
+    def _memory_set(self, cache_key: str, data: bytes, ttl: int):
+        """Écrire dans le cache mémoire, en évinçant l'entrée la moins récemment utilisée"""
+        self.memory_cache[cache_key] = {
+            'data': data,
+            'expires_at': time.monotonic() + ttl
+        }
+        self.memory_cache.move_to_end(cache_key)
         if len(self.memory_cache) > self.max_memory_cache_size:
-            # Supprimer les 20% plus anciens
-            sorted_items = sorted(
-                self.memory_cache.items(), 
-                key=lambda x: x[1].get('timestamp', 0)
-            )
-            
-            to_remove = int(len(sorted_items) * 0.2)
-            for i in range(to_remove):
-                del self.memory_cache[sorted_items[i][0]]
-            
-            logger.debug(f"🧹 Cache mémoire nettoyé: {to_remove} items supprimés")
+            self.memory_cache.popitem(last=False)
+    
+    def _memory_get(self, cache_key: str) -> Optional[bytes]:
+        """Lire dans le cache mémoire (None si absent ou expiré)"""
+        cache_entry = self.memory_cache.get(cache_key)
+        if cache_entry is None:
+            return None
+        
+        # Vérifier expiration
+        if time.monotonic() > cache_entry['expires_at']:
+            del self.memory_cache[cache_key]
+            logger.debug(f"⏰ Cache mémoire expiré: {cache_key}")
+            return None
+        
+        self.memory_cache.move_to_end(cache_key)
+        return cache_entry['data']
+    
+    async def _store(
+        self,
+        cache_key: str,
+        data: bytes,
+        ttl: int,
+        nx: bool,
+        tags: Optional[List[str]] = None,
+        tag_ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Écrire des octets sérialisés (Redis, sinon cache mémoire)
+        Retourne False si nx=True et que la clé existait déjà ; les tags ne sont
+        associés qu'à une entrée effectivement écrite
+        """
+        tag_keys = [f"cache_tags:{tag}" for tag in tags or ()]
+        
+        # Tentative Redis d'abord
+        if self.connected and self.redis_client:
+            try:
+                if tag_keys:
+                    stored = await self.redis_client.eval(
+                        _STORE_TAGGED_SCRIPT, 1 + len(tag_keys), cache_key, *tag_keys,
+                        data, ttl, "1" if nx else "0", tag_ttl or ttl
+                    )
+                else:
+                    # SET EX [NX] : avec NX, une entrée déjà présente n'est pas réécrite
+                    stored = await self.redis_client.set(cache_key, data, ex=ttl, nx=nx)
+                if stored:
+                    await self._publish_l1_eviction([cache_key])
+                    logger.debug(f"📦 Cache Redis: {cache_key} (TTL: {ttl}s)")
+                return bool(stored)
+            except (ConnectionError, TimeoutError) as e:
+                logger.warning(f"⚠️ Redis indisponible: {e}")
+                self.connected = False
+        
+        # Fallback cache mémoire
+        if nx and self._memory_get(cache_key) is not None:
+            return False
+        self._memory_set(cache_key, data, ttl)
+        for tag_key in tag_keys:
+            self.memory_tags.setdefault(tag_key, set()).add(cache_key)
+        logger.debug(f"🧠 Cache mémoire: {cache_key}")
+        return True
     
     async def set(
         self, 
@@ -133,39 +294,136 @@ class CacheService:
         key: str, 
         value: Any, 
         ttl: Optional[int] = None,
+        nx: bool = False,
+        tags: Optional[List[str]] = None,
+        tag_ttl: Optional[int] = None,
         **kwargs
     ) -> bool:
-        """Définir une valeur en cache"""
+        """
+        Définir une valeur en cache
+        nx=True : ne rien écrire si la clé existe déjà (ni valeur ni TTL réécrits)
+        tags : tags d'invalidation associés atomiquement à l'écriture
+        """
         cache_key = self._generate_key(namespace, key, **kwargs)
         ttl = ttl or settings.redis.cache_ttl_default
         
         try:
-            serialized_value = self._serialize_value(value)
-            
-            # Tentative Redis d'abord
-            if self.connected and self.redis_client:
-                try:
-                    await self.redis_client.setex(cache_key, ttl, serialized_value)
-                    logger.debug(f"📦 Cache Redis: {cache_key} (TTL: {ttl}s)")
-                    return True
-                except (ConnectionError, TimeoutError) as e:
-                    logger.warning(f"⚠️ Redis indisponible: {e}")
-                    self.connected = False
-            
-            # Fallback cache mémoire
-            await self._memory_cache_cleanup()
-            self.memory_cache[cache_key] = {
-                'data': serialized_value,
-                'timestamp': datetime.now().timestamp(),
-                'expires_at': datetime.now().timestamp() + ttl
-            }
-            logger.debug(f"🧠 Cache mémoire: {cache_key}")
-            return True
+            return await self._store(cache_key, self._serialize_value(value), ttl, nx, tags, tag_ttl)
             
         except Exception as e:
             logger.error(f"❌ Erreur cache set: {e}")
             return False
     
+    def _l1_get(self, cache_key: str) -> Optional[bytes]:
+        """Lire dans le cache L1 du processus (None si absent ou expiré)"""
+        entry = self.l1_cache.get(cache_key)
+        if entry is None:
+            return None
+        if time.monotonic() > entry[0]:
+            del self.l1_cache[cache_key]
+            return None
+        self.l1_cache.move_to_end(cache_key)
+        return entry[1]
+    
+    def _l1_set(self, cache_key: str, data: bytes):
+        """Garder une valeur lue dans Redis dans le cache L1 (LRU borné)"""
+        if self.l1_ttl <= 0 or self.l1_max_size <= 0 or not self._l1_subscribed:
+            return
+        self.l1_cache[cache_key] = (time.monotonic() + self.l1_ttl, data)
+        self.l1_cache.move_to_end(cache_key)
+        if len(self.l1_cache) > self.l1_max_size:
+            self.l1_cache.popitem(last=False)
+    
+    async def _publish_l1_eviction(self, keys: Optional[List[str]] = None, prefix: Optional[str] = None):
+        """Évincer des entrées L1 ici et dans les autres workers"""
+        if keys:
+            for cache_key in keys:
+                self.l1_cache.pop(cache_key, None)
+        if prefix:
+            for cache_key in [k for k in self.l1_cache if k.startswith(prefix)]:
+                del self.l1_cache[cache_key]
+        
+        if self.connected and self.redis_client:
+            try:
+                await self.redis_client.publish(
+                    _L1_EVICT_CHANNEL, orjson.dumps({"keys": keys or [], "prefix": prefix})
+                )
+            except (ConnectionError, TimeoutError) as e:
+                logger.warning(f"⚠️ Diffusion éviction L1 impossible: {e}")
+    
+    async def _listen_l1_evictions(self):
+        """
+        Appliquer les évictions L1 diffusées par les autres workers
+        Connexion dédiée sans socket_timeout (un canal calme n'est pas une erreur) ;
+        après une coupure, L1 est vidé et suspendu jusqu'au réabonnement
+        (les évictions diffusées entre-temps sont perdues)
+        """
+        client = redis.from_url(
+            settings.redis.redis_url,
+            decode_responses=False,
+            socket_timeout=None,
+            socket_connect_timeout=5,
+            health_check_interval=30
+        )
+        try:
+            while True:
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.subscribe(_L1_EVICT_CHANNEL)
+                    self._l1_subscribed = True
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        eviction = orjson.loads(message["data"])
+                        for cache_key in eviction["keys"]:
+                            self.l1_cache.pop(cache_key, None)
+                        if eviction["prefix"]:
+                            for cache_key in [k for k in self.l1_cache if k.startswith(eviction["prefix"])]:
+                                del self.l1_cache[cache_key]
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"⚠️ Écoute des évictions L1 interrompue: {e}, réabonnement")
+                    await asyncio.sleep(1)
+                finally:
+                    self._l1_subscribed = False
+                    self.l1_cache.clear()
+                    await pubsub.close()
+        finally:
+            await client.close()
+    
+    async def _redis_get(self, cache_key: str) -> Optional[bytes]:
+        """
+        GET Redis mutualisé : les lectures simultanées d'une même clé attendent
+        la réponse de la première au lieu de faire chacune un aller-retour ;
+        les clés chaudes sont servies par le cache L1 sans aller-retour
+        """
+        data = self._l1_get(cache_key)
+        if data is not None:
+            return data
+        
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            # GET dans une tâche indépendante : l'annulation d'un lecteur (client
+            # déconnecté) n'interrompt que son attente, pas la lecture des autres
+            inflight = self._inflight[cache_key] = asyncio.create_task(self._fetch(cache_key))
+            inflight.add_done_callback(functools.partial(self._forget_inflight, cache_key))
+        return await asyncio.shield(inflight)
+    
+    async def _fetch(self, cache_key: str) -> Optional[bytes]:
+        """GET Redis partagé par les lectures simultanées d'une clé (alimente le cache L1)"""
+        data = await self.redis_client.get(cache_key)
+        if data:
+            self._l1_set(cache_key, data)
+        return data
+    
+    def _forget_inflight(self, cache_key: str, task: asyncio.Task):
+        """Retirer une lecture terminée (son erreur est consommée même sans lecteur restant)"""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        if not task.cancelled():
+            task.exception()
+    
     async def get(self, namespace: str, key: str, **kwargs) -> Optional[Any]:
         """Récupérer une valeur du cache"""
         cache_key = self._generate_key(namespace, key, **kwargs)
@@ -174,7 +432,7 @@ class CacheService:
             # Tentative Redis d'abord
             if self.connected and self.redis_client:
                 try:
-                    data = await self.redis_client.get(cache_key)
+                    data = await self._redis_get(cache_key)
                     if data:
                         value = self._deserialize_value(data)
                         logger.debug(f"🎯 Cache Redis hit: {cache_key}")
@@ -184,16 +442,9 @@ class CacheService:
                     self.connected = False
             
             # Fallback cache mémoire
-            if cache_key in self.memory_cache:
-                cache_entry = self.memory_cache[cache_key]
-                
-                # Vérifier expiration
-                if datetime.now().timestamp() > cache_entry['expires_at']:
-                    del self.memory_cache[cache_key]
-                    logger.debug(f"⏰ Cache mémoire expiré: {cache_key}")
-                    return None
-                
-                value = self._deserialize_value(cache_entry['data'])
+            data = self._memory_get(cache_key)
+            if data is not None:
+                value = self._deserialize_value(data)
                 logger.debug(f"🧠 Cache mémoire hit: {cache_key}")
                 return value
             
@@ -204,6 +455,159 @@ class CacheService:
             logger.error(f"❌ Erreur cache get: {e}")
             return None
     
+    async def mget(self, namespace: str, keys: List[str], **kwargs) -> Dict[str, Any]:
+        """Récupérer plusieurs valeurs en un seul aller-retour Redis (clés absentes omises)"""
+        cache_keys = [self._generate_key(namespace, key, **kwargs) for key in keys]
+        values: Dict[str, Any] = {}
+        
+        try:
+            if self.connected and self.redis_client:
+                try:
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        for cache_key in cache_keys:
+                            pipe.get(cache_key)
+                        results = await pipe.execute()
+                    for key, data in zip(keys, results):
+                        if data:
+                            values[key] = self._deserialize_value(data)
+                    logger.debug(f"🎯 Cache Redis mget {namespace}: {len(values)}/{len(keys)}")
+                    return values
+                except (ConnectionError, TimeoutError) as e:
+                    logger.warning(f"⚠️ Redis indisponible: {e}")
+                    self.connected = False
+            
+            # Fallback cache mémoire
+            for key, cache_key in zip(keys, cache_keys):
+                data = self._memory_get(cache_key)
+                if data is not None:
+                    values[key] = self._deserialize_value(data)
+            return values
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur cache mget: {e}")
+            return values
+    
+    async def set_raw(
+        self,
+        namespace: str,
+        key: str,
+        payload: bytes,
+        ttl: Optional[int] = None,
+        nx: bool = False,
+        tags: Optional[List[str]] = None,
+        tag_ttl: Optional[int] = None,
+        **kwargs
+    ) -> bool:
+        """Définir des octets bruts en cache (réponse JSON déjà encodée, sans enveloppe)"""
+        cache_key = self._generate_key(namespace, key, **kwargs)
+        ttl = ttl or settings.redis.cache_ttl_default
+        
+        try:
+            return await self._store(cache_key, payload, ttl, nx, tags, tag_ttl)
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur cache set_raw: {e}")
+            return False
+    
+    async def get_raw(self, namespace: str, key: str, **kwargs) -> Optional[bytes]:
+        """Récupérer des octets bruts du cache (aucune désérialisation)"""
+        cache_key = self._generate_key(namespace, key, **kwargs)
+        
+        try:
+            if self.connected and self.redis_client:
+                try:
+                    data = await self._redis_get(cache_key)
+                    if data:
+                        logger.debug(f"🎯 Cache Redis hit (brut): {cache_key}")
+                        return data
+                except (ConnectionError, TimeoutError) as e:
+                    logger.warning(f"⚠️ Redis indisponible: {e}")
+                    self.connected = False
+            
+            # Fallback cache mémoire
+            data = self._memory_get(cache_key)
+            if data is not None:
+                logger.debug(f"🧠 Cache mémoire hit (brut): {cache_key}")
+                return data
+            
+            logger.debug(f"❌ Cache miss: {cache_key}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur cache get_raw: {e}")
+            return None
+    
+    async def get_cached_model(
+        self,
+        namespace: str,
+        key: str,
+        model: Union[Type[BaseModel], TypeAdapter],
+        **kwargs
+    ) -> Optional[Any]:
+        """
+        Lire du JSON brut et le valider directement en modèle Pydantic
+        (model_validate_json / TypeAdapter.validate_json : une seule passe, sans dict intermédiaire)
+        """
+        raw = await self.get_raw(namespace, key, **kwargs)
+        if raw is None:
+            return None
+        
+        try:
+            if isinstance(model, TypeAdapter):
+                return model.validate_json(raw)
+            return model.model_validate_json(raw)
+        except ValidationError as e:
+            logger.warning(f"⚠️ Entrée de cache invalide {namespace}:{key}: {e}")
+            return None
+    
+    async def get_or_compute(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        raw: bool = False,
+        tags: Optional[List[str]] = None,
+        tag_ttl: Optional[int] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Lire une valeur du cache ou la calculer une seule fois (single-flight) :
+        les appels simultanés sur la même clé attendent le premier calcul
+        au lieu d'interroger tous la base
+        tags : associés à l'entrée dans la même opération que son écriture (jamais
+        avant : une invalidation intercalée laisserait sinon une entrée sans tag)
+        """
+        getter = self.get_raw if raw else self.get
+        setter = self.set_raw if raw else self.set
+        
+        value = await getter(namespace, key, **kwargs)
+        if value is not None:
+            return value
+        
+        cache_key = self._generate_key(namespace, key, **kwargs)
+        entry = self._compute_locks.get(cache_key)
+        if entry is None:
+            entry = self._compute_locks[cache_key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        
+        try:
+            async with entry[0]:
+                # Un autre appel a pu remplir le cache pendant l'attente
+                value = await getter(namespace, key, **kwargs)
+                if value is None:
+                    value = await compute()
+                    if value is not None:
+                        # NX : un autre worker a pu remplir la clé entre-temps, sa valeur est gardée
+                        await setter(
+                            namespace, key, value, ttl=ttl, nx=True, tags=tags, tag_ttl=tag_ttl, **kwargs
+                        )
+                return value
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._compute_locks.pop(cache_key, None)
+    
     async def delete(self, namespace: str, key: str, **kwargs) -> bool:
         """Supprimer une valeur du cache"""
         cache_key = self._generate_key(namespace, key, **kwargs)
@@ -214,8 +618,9 @@ class CacheService:
             # Supprimer de Redis
             if self.connected and self.redis_client:
                 try:
-                    result = await self.redis_client.delete(cache_key)
+                    result = await self.redis_client.unlink(cache_key)
                     success = bool(result)
+                    await self._publish_l1_eviction([cache_key])
                 except (ConnectionError, TimeoutError):
                     self.connected = False
             
@@ -238,13 +643,19 @@ class CacheService:
         try:
             count = 0
             
-            # Redis
+            # Redis : SCAN incrémental (KEYS bloquerait le serveur) et UNLINK par lots
+            # (libération mémoire en arrière-plan côté Redis)
             if self.connected and self.redis_client:
                 try:
-                    pattern = f"{namespace}:*"
-                    keys = await self.redis_client.keys(pattern)
-                    if keys:
-                        count += await self.redis_client.delete(*keys)
+                    batch = []
+                    async for key in self.redis_client.scan_iter(match=f"{namespace}:*", count=500):
+                        batch.append(key)
+                        if len(batch) >= 500:
+                            count += await self.redis_client.unlink(*batch)
+                            batch.clear()
+                    if batch:
+                        count += await self.redis_client.unlink(*batch)
+                    await self._publish_l1_eviction(prefix=f"{namespace}:")
                 except (ConnectionError, TimeoutError):
                     self.connected = False
             
@@ -261,12 +672,134 @@ class CacheService:
             logger.error(f"❌ Erreur clear namespace: {e}")
             return 0
     
+    async def tag(
+        self,
+        namespace: str,
+        key: str,
+        tags: List[str],
+        ttl: Optional[int] = None,
+        **kwargs
+    ) -> bool:
+        """Associer une entrée de cache à des tags d'invalidation"""
+        cache_key = self._generate_key(namespace, key, **kwargs)
+        ttl = ttl or settings.redis.cache_ttl_default
+        
+        try:
+            if self.connected and self.redis_client:
+                try:
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        for tag in tags:
+                            tag_key = f"cache_tags:{tag}"
+                            pipe.sadd(tag_key, cache_key)
+                            # Le set vit au moins aussi longtemps que l'entrée la plus durable
+                            pipe.expire(tag_key, ttl, nx=True)
+                            pipe.expire(tag_key, ttl, gt=True)
+                        await pipe.execute()
+                    return True
+                except (ConnectionError, TimeoutError) as e:
+                    logger.warning(f"⚠️ Redis indisponible: {e}")
+                    self.connected = False
+            
+            # Fallback index mémoire
+            for tag in tags:
+                self.memory_tags.setdefault(f"cache_tags:{tag}", set()).add(cache_key)
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur cache tag: {e}")
+            return False
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Supprimer toutes les entrées de cache associées à l'un des tags"""
+        tag_keys = [f"cache_tags:{tag}" for tag in tags]
+        
+        try:
+            count = 0
+            
+            # Redis (lecture des tags + UNLINK en un seul script atomique)
+            if self.connected and self.redis_client:
+                try:
+                    removed_count, removed_keys = await self.redis_client.eval(
+                        _INVALIDATE_TAGS_SCRIPT, len(tag_keys), *tag_keys
+                    )
+                    count += removed_count
+                    await self._publish_l1_eviction([key.decode() for key in removed_keys])
+                except (ConnectionError, TimeoutError):
+                    self.connected = False
+            
+            # Cache mémoire
+            for tag_key in tag_keys:
+                for cache_key in self.memory_tags.pop(tag_key, ()):
+                    if self.memory_cache.pop(cache_key, None) is not None:
+                        count += 1
+            
+            logger.debug(f"🏷️ Tags invalidés {tags}: {count} items")
+            return count
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur invalidation tags: {e}")
+            return 0
+    
+    async def incr_counter(self, namespace: str, key: str, amount: int = 1) -> bool:
+        """Incrémenter un compteur tampon (reporté périodiquement en base)"""
+        counter_key = f"counter:{namespace}:{key}"
+        
+        try:
+            if self.connected and self.redis_client:
+                try:
+                    await self.redis_client.incrby(counter_key, amount)
+                    return True
+                except (ConnectionError, TimeoutError) as e:
+                    logger.warning(f"⚠️ Redis indisponible: {e}")
+                    self.connected = False
+            
+            # Fallback compteurs mémoire
+            self.pending_counters[counter_key] = self.pending_counters.get(counter_key, 0) + amount
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur compteur incr: {e}")
+            return False
+    
+    async def drain_counters(self, namespace: str) -> Dict[str, int]:
+        """Lire et remettre à zéro les compteurs tampons d'un namespace"""
+        prefix = f"counter:{namespace}:"
+        counts: Dict[str, int] = {}
+        
+        try:
+            # Redis : SCAN puis GETDEL dans une transaction (aucun incrément perdu)
+            if self.connected and self.redis_client:
+                try:
+                    keys = [k async for k in self.redis_client.scan_iter(match=f"{prefix}*", count=500)]
+                    if keys:
+                        async with self.redis_client.pipeline(transaction=True) as pipe:
+                            for k in keys:
+                                pipe.getdel(k)
+                            values = await pipe.execute()
+                        for k, v in zip(keys, values):
+                            if v:
+                                counts[k.decode()[len(prefix):]] = int(v)
+                except (ConnectionError, TimeoutError):
+                    self.connected = False
+            
+            # Compteurs mémoire
+            for counter_key in [k for k in self.pending_counters if k.startswith(prefix)]:
+                key = counter_key[len(prefix):]
+                counts[key] = counts.get(key, 0) + self.pending_counters.pop(counter_key)
+            
+            return counts
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur compteurs drain: {e}")
+            return counts
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Statistiques du cache"""
         stats = {
             'redis_connected': self.connected,
             'memory_cache_size': len(self.memory_cache),
             'memory_cache_max_size': self.max_memory_cache_size,
+            'l1_cache_size': len(self.l1_cache),
         }
         
         if self.connected and self.redis_client:
@@ -331,25 +864,91 @@ async def get_cached_metadata(key: str, **kwargs) -> Optional[Any]:
     return await cache_service.get("metadata", key, **kwargs)
 
 
+def _canonical_key(qualname: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """
+    Clé stable d'un appel : identique d'un processus et d'un redémarrage à l'autre
+    (hash() est randomisé par PYTHONHASHSEED), 1 et 1.0 restent distincts
+    """
+    encoded = orjson.dumps(
+        (qualname, args, kwargs),
+        default=repr,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return f"{qualname}_{xxhash.xxh3_64_hexdigest(encoded)}"
+
+
+# Types dont le repr() est stable et sans ambiguïté (clé lisible sans hash)
+_SIMPLE_KEY_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _compile_key_builder(func: Callable) -> Callable[..., str]:
+    """
+    Générer, à la décoration, un constructeur de clé propre à la signature de func :
+    arguments liés par position sans inspect.bind à l'appel, une f-string pour les
+    arguments simples, _canonical_key (xxh3) sinon
+    """
+    qualname = func.__qualname__
+    try:
+        parameters = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        parameters = None
+    
+    if parameters is None or any(
+        p.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD) for p in parameters
+    ):
+        return lambda *args, **kwargs: _canonical_key(qualname, args, kwargs)
+    
+    namespace = {"_qualname": qualname, "_simple": _SIMPLE_KEY_TYPES, "_canonical_key": _canonical_key}
+    signature_parts = []
+    for index, parameter in enumerate(parameters):
+        if parameter.kind is inspect.Parameter.KEYWORD_ONLY and "*" not in signature_parts:
+            signature_parts.append("*")
+        if parameter.default is inspect.Parameter.empty:
+            signature_parts.append(parameter.name)
+        else:
+            namespace[f"_default_{index}"] = parameter.default
+            signature_parts.append(f"{parameter.name}=_default_{index}")
+        if parameter.kind is inspect.Parameter.POSITIONAL_ONLY and (
+            index + 1 == len(parameters) or parameters[index + 1].kind is not inspect.Parameter.POSITIONAL_ONLY
+        ):
+            signature_parts.append("/")
+    
+    names = [parameter.name for parameter in parameters]
+    if names:
+        simple_check = " and ".join(f"type({name}) in _simple" for name in names)
+        key_fields = ":".join("{" + name + "!r}" for name in names)
+        body = (
+            f"    if {simple_check}:\n"
+            f"        return f\"{{_qualname}}:{key_fields}\"\n"
+            f"    return _canonical_key(_qualname, ({', '.join(names)},), {{}})\n"
+        )
+    else:
+        body = "    return _qualname\n"
+    
+    exec(f"def _key_builder({', '.join(signature_parts)}):\n{body}", namespace)
+    return namespace["_key_builder"]
+
+
 # Décorateur pour mise en cache automatique
 def cached(namespace: str, ttl: Optional[int] = None, key_func=None):
     """Décorateur pour mise en cache automatique des fonctions"""
     def decorator(func):
+        key_builder = key_func or _compile_key_builder(func)
+        
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             # Génération de la clé
-            if key_func:
-                cache_key = key_func(*args, **kwargs)
-            else:
-                cache_key = f"{func.__name__}_{hash((args, tuple(sorted(kwargs.items()))))}"
+            cache_key = key_builder(*args, **kwargs)
             
             # Tentative de récupération du cache
             cached_result = await cache_service.get(namespace, cache_key)
             if cached_result is not None:
                 return cached_result
             
-            # Exécution de la fonction et mise en cache
+            # Exécution de la fonction et mise en cache (None n'est pas mis en cache)
             result = await func(*args, **kwargs)
-            await cache_service.set(namespace, cache_key, result, ttl)
+            if result is not None:
+                await cache_service.set(namespace, cache_key, result, ttl)
             
             return result
         return wrapper
@@ -0,0 +1,211 @@
+"""
+Service d'extraction audio pour RobianAPI
+Chaque extraction (yt-dlp + FFmpeg) tourne dans son propre processus : la boucle
+de l'API ne garde que les transitions DB, cache et WebSocket, et une extraction
+expirée ou annulée est réellement arrêtée (terminate) au lieu de continuer en fond
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+import random
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Processus d'extraction : spawn, ne pas forker un processus qui porte déjà une boucle et des threads
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def run_extraction(
+    source_url: str,
+    file_path: str,
+    audio_format: str,
+    quality: str,
+    simulate: bool,
+    progress: Optional[Callable[[int], None]] = None
+) -> Tuple[int, int]:
+    """
+    Extraction bloquante, exécutée dans le processus d'extraction
+    Retourne (file_size, duration_seconds) ; la progression (0-100) est
+    transmise à `progress` s'il est fourni
+    """
+    if simulate:
+        # Simulation d'extraction (3-8 secondes, 10 étapes)
+        step = random.uniform(3, 8) / 10
+        for pct in range(10, 101, 10):
+            time.sleep(step)
+            if progress is not None:
+                progress(pct)
+
+        # Créer un fichier vide pour la démo
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# Fichier audio simulé pour démo\n")
+
+        return 150 * 1024 * 1024, 7800  # 150 MB et 2h10 simulés
+
+    # EN PRODUCTION: Ici utiliser yt-dlp + FFmpeg
+    # (progression : hook yt-dlp "downloaded_bytes / total_bytes", puis ffmpeg -progress pipe:1)
+    # from scripts.extract_audio import extract_audio_from_url
+    # return extract_audio_from_url(source_url, file_path, format=audio_format, quality=quality)
+    raise NotImplementedError("Production extraction not implemented yet")
+
+
+def _extraction_process(
+    source_url: str,
+    file_path: str,
+    audio_format: str,
+    quality: str,
+    simulate: bool,
+    channel: Any
+):
+    """
+    Point d'entrée du processus d'extraction
+    Publie dans `channel` des messages ("progress", pct), puis ("done", résultat)
+    ou ("error", message)
+    """
+    try:
+        result = run_extraction(
+            source_url, file_path, audio_format, quality, simulate,
+            progress=lambda pct: channel.put(("progress", pct))
+        )
+        channel.put(("done", result))
+    except BaseException as e:
+        channel.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class ExtractionService:
+    """Processus d'extraction avec limite de concurrence globale et par fournisseur"""
+
+    def __init__(self):
+        self.max_workers = settings.audio.max_concurrent_extractions
+        self.max_per_provider = settings.audio.max_extractions_per_provider
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._provider_slots: Dict[str, asyncio.Semaphore] = {}
+        self._processes: Set[Any] = set()
+
+    def _global_slot(self) -> asyncio.Semaphore:
+        """Sémaphore global (max_concurrent_extractions processus simultanés)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    def _provider_slot(self, source_url: str) -> asyncio.Semaphore:
+        """Sémaphore du fournisseur (domaine de la source)"""
+        provider = urlparse(source_url or "").netloc or "unknown"
+        slot = self._provider_slots.get(provider)
+        if slot is None:
+            slot = self._provider_slots[provider] = asyncio.Semaphore(self.max_per_provider)
+        return slot
+
+    @staticmethod
+    def _next_message(channel) -> Optional[Tuple[str, Any]]:
+        """Attendre un message du processus au plus 1 s (bloquant, exécuté dans un thread)"""
+        try:
+            return channel.get(timeout=1.0)
+        except queue.Empty:
+            return None
+
+    async def _collect(
+        self,
+        process,
+        channel,
+        on_progress: Optional[Callable[[int], Awaitable[None]]]
+    ) -> Tuple[int, int]:
+        """Relayer la progression vers la boucle d'événements jusqu'au résultat du processus"""
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self._next_message, channel)
+            if message is None:
+                # Rien reçu : le processus a pu mourir sans rien publier (OOM, signal...)
+                if not process.is_alive():
+                    raise RuntimeError(f"Processus d'extraction interrompu (code {process.exitcode})")
+                continue
+            
+            kind, value = message
+            if kind == "progress":
+                if on_progress is not None:
+                    await on_progress(value)
+            elif kind == "done":
+                return tuple(value)
+            else:
+                raise RuntimeError(value)
+
+    @staticmethod
+    def _stop(process):
+        """Arrêter le processus s'il tourne encore (bloquant, exécuté dans un thread)"""
+        if process.pid is None:
+            return  # jamais démarré
+        if process.is_alive():
+            process.terminate()
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    async def extract(
+        self,
+        source_url: str,
+        file_path: str,
+        audio_format: str,
+        quality: str,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> Tuple[int, int]:
+        """
+        Extraire l'audio dans un processus dédié, sans bloquer la boucle d'événements
+        on_progress(pct) est appelé dans la boucle à chaque étape réelle de l'extraction ;
+        en cas d'échec, d'expiration ou d'annulation, le processus est arrêté et le
+        fichier partiel supprimé
+        """
+        async with self._global_slot(), self._provider_slot(source_url):
+            loop = asyncio.get_running_loop()
+            channel = _MP_CONTEXT.Queue()
+            process = _MP_CONTEXT.Process(
+                target=_extraction_process,
+                args=(
+                    source_url,
+                    file_path,
+                    audio_format,
+                    quality,
+                    settings.app.environment == "development",
+                    channel
+                ),
+                daemon=True
+            )
+            completed = False
+            self._processes.add(process)
+            try:
+                await loop.run_in_executor(None, process.start)
+                result = await asyncio.wait_for(
+                    self._collect(process, channel, on_progress),
+                    timeout=settings.audio.extraction_timeout
+                )
+                completed = True
+                return result
+            finally:
+                # Le processus est arrêté avant de supprimer le fichier (il ne peut plus le réécrire)
+                try:
+                    await loop.run_in_executor(None, self._stop, process)
+                finally:
+                    self._processes.discard(process)
+                    if not completed:
+                        Path(file_path).unlink(missing_ok=True)
+
+    def shutdown(self):
+        """Arrêter les extractions en cours"""
+        for process in list(self._processes):
+            self._stop(process)
+        if self._processes:
+            logger.info(f"🏭 Extractions arrêtées ({len(self._processes)} processus)")
+        self._processes.clear()
+
+
+# Instance globale du service d'extraction
+extraction_service = ExtractionService()
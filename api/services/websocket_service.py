@@ -3,22 +3,70 @@ Service WebSockets pour RobianAPI
 Communication temps réel avec les clients
 """
 
-import json
 import asyncio
+import contextlib
+import itertools
 import logging
-from typing import Dict, List, Set, Any, Optional
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Set, Any, Optional, Tuple, Union
+from datetime import datetime
+from dataclasses import dataclass, field
 from enum import Enum
+from decimal import Decimal
 import uuid
 import weakref
 
+import msgpack
+import orjson
+
 from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.websockets import WebSocketState
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
 
+# Identifiants de message : compteur préfixé par un identifiant de processus,
+# uniques sans tirer un uuid4 (os.urandom) pour chaque notification
+_MESSAGE_ID_PREFIX = uuid.uuid4().hex[:8]
+_message_seq = itertools.count(1)
+
+# Encodages proposés au client (paramètre ?encoding= de /ws) :
+# JSON en trames texte (défaut, clients existants) ou msgpack en trames binaires
+WS_ENCODINGS = ("json", "msgpack")
+
+# En-tête msgpack de {"type": "batch", "messages": [...]} (map de 2 entrées)
+_MSGPACK_BATCH_HEAD = b"\x82" + msgpack.packb("type") + msgpack.packb("batch") + msgpack.packb("messages")
+_msgpack_packer = msgpack.Packer()
+
+
+def _batch_frame(payloads: List[Union[str, bytes]]) -> Union[str, bytes]:
+    """Regrouper des messages déjà sérialisés (tous du même encodage) dans une seule trame"""
+    if isinstance(payloads[0], bytes):
+        return _MSGPACK_BATCH_HEAD + _msgpack_packer.pack_array_header(len(payloads)) + b"".join(payloads)
+    return '{"type":"batch","messages":[' + ",".join(payloads) + "]}"
+
+
+def _json_default(value: Any) -> Any:
+    """Types non natifs pour orjson (datetime, UUID et enums le sont déjà)"""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Types non natifs pour msgpack, rendus comme en JSON (dates ISO 8601, UUID et Decimal en texte)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+
 class MessageType(str, Enum):
     """Types de messages WebSocket"""
     # Client vers serveur
@@ -33,16 +81,30 @@ class MessageType(str, Enum):
     UNSUBSCRIBED = "unsubscribed"
     PONG = "pong"
     ERROR = "error"
+    BATCH = "batch"  # {"type": "batch", "messages": [...]} : plusieurs messages dans une trame
     
     # Notifications
     DEBATE_STARTED = "debate_started"
     DEBATE_ENDED = "debate_ended"
     EXTRACTION_STARTED = "extraction_started"
+    EXTRACTION_PROGRESS = "extraction_progress"
     EXTRACTION_COMPLETED = "extraction_completed"
     EXTRACTION_FAILED = "extraction_failed"
     SYSTEM_STATUS = "system_status"
 
 
+# Réponse au ping, constante : encodée une fois pour toutes par encodage
+_PONG_FRAMES: Dict[str, Union[str, bytes]] = {
+    "json": orjson.dumps({"type": MessageType.PONG}).decode(),
+    "msgpack": msgpack.packb({"type": MessageType.PONG.value}),
+}
+
+
+# Notifications aussitôt remplacées par la suivante : écartées en premier quand la
+# file d'un client est pleine (les autres messages ne sont jamais perdus en silence)
+_DROPPABLE_TYPES = frozenset({MessageType.EXTRACTION_PROGRESS})
+
+
 class ChannelType(str, Enum):
     """Types de canaux de diffusion"""
     DEBATES = "debates"
@@ -51,7 +113,7 @@ class ChannelType(str, Enum):
     USER_SPECIFIC = "user"
 
 
-@dataclass
+@dataclass(slots=True)
 class WebSocketMessage:
     """Structure d'un message WebSocket"""
     type: MessageType
@@ -59,50 +121,131 @@ class WebSocketMessage:
     data: Optional[Dict[str, Any]] = None
     timestamp: Optional[datetime] = None
     message_id: Optional[str] = None
+    # Encodages déjà calculés (un message est diffusé sur plusieurs canaux et rejoué
+    # depuis l'historique ; il n'est plus modifié après sa création)
+    _payloads: Dict[str, Union[str, bytes]] = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
         if self.message_id is None:
-            self.message_id = str(uuid.uuid4())
+            self.message_id = f"{_MESSAGE_ID_PREFIX}-{next(_message_seq):x}"
     
     def to_dict(self) -> Dict[str, Any]:
-        """Conversion en dictionnaire pour sérialisation"""
-        result = asdict(self)
-        result['timestamp'] = self.timestamp.isoformat()
-        return result
+        """Conversion en dictionnaire pour sérialisation (datetime et enums laissés à orjson)"""
+        # Champs connus et plats : pas de asdict() (introspection + copie profonde à chaque appel)
+        return {
+            "type": self.type,
+            "channel": self.channel,
+            "data": self.data,
+            "timestamp": self.timestamp,
+            "message_id": self.message_id
+        }
     
     def to_json(self) -> str:
         """Conversion en JSON"""
-        return json.dumps(self.to_dict())
+        return orjson.dumps(self.to_dict(), default=_json_default).decode()
+    
+    def to_msgpack(self) -> bytes:
+        """Conversion en msgpack (trames binaires)"""
+        return msgpack.packb(self.to_dict(), use_bin_type=True, default=_msgpack_default)
+    
+    def encode(self, encoding: str) -> Union[str, bytes]:
+        """Sérialiser selon l'encodage négocié avec le client (une seule fois par encodage)"""
+        payload = self._payloads.get(encoding)
+        if payload is None:
+            payload = self._payloads[encoding] = self.to_msgpack() if encoding == "msgpack" else self.to_json()
+        return payload
 
 
 class WebSocketConnection:
     """Représente une connexion WebSocket client"""
     
-    def __init__(self, websocket: WebSocket, client_id: str):
+    # Pas de __dict__ par connexion (une instance par client connecté)
+    __slots__ = (
+        "websocket", "client_id", "encoding", "subscriptions", "connected_at",
+        "last_ping", "user_id", "metadata", "send_queue", "max_queued", "_pending", "_writer"
+    )
+    
+    def __init__(self, websocket: WebSocket, client_id: str, encoding: str = "json", max_queued: int = 256):
         self.websocket = websocket
         self.client_id = client_id
+        self.encoding = encoding
         self.subscriptions: Set[str] = set()
-        self.connected_at = datetime.now()
-        self.last_ping = datetime.now()
+        # Horloge monotone de la boucle (secondes) : suivi d'activité, jamais affiché
+        self.connected_at = asyncio.get_running_loop().time()
+        self.last_ping = self.connected_at
         self.user_id: Optional[str] = None
         self.metadata: Dict[str, Any] = {}
+        
+        # File d'envoi unique (réponses, historique et diffusions : l'ordre d'émission est
+        # celui de l'envoi), vidée par une tâche d'écriture dédiée ; bornée pour qu'un
+        # client qui ne lit plus ne fasse pas grossir la mémoire sans limite.
+        # Éléments : (trame sérialisée, écartable si la file est pleine)
+        self.send_queue: Deque[Tuple[Union[str, bytes], bool]] = deque()
+        self.max_queued = max_queued
+        self._pending = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
     
     async def send_message(self, message: WebSocketMessage):
-        """Envoyer un message au client"""
-        try:
-            await self.websocket.send_text(message.to_json())
-            logger.debug(f"📤 Message envoyé à {self.client_id}: {message.type}")
-        except Exception as e:
-            logger.error(f"❌ Erreur envoi message à {self.client_id}: {e}")
-            raise
+        """Mettre en file un message destiné à ce seul client (bienvenue, confirmation, erreur...)"""
+        self.enqueue(message.encode(self.encoding))
+        logger.debug("📤 Message en file pour %s: %s", self.client_id, message.type)
+    
+    async def send_frame(self, frame: Union[str, bytes]):
+        """Trame texte (JSON) ou binaire (msgpack)"""
+        if isinstance(frame, bytes):
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+    
+    def enqueue(self, payload: Union[str, bytes], droppable: bool = False):
+        """
+        Mettre en file une trame déjà sérialisée (diffusion : encodée une fois pour tous les abonnés)
+        File pleine : le plus ancien message écartable laisse sa place ; lève
+        asyncio.QueueFull s'il n'y en a aucun (le client a trop de retard)
+        """
+        if len(self.send_queue) >= self.max_queued:
+            for index, (_, queued_droppable) in enumerate(self.send_queue):
+                if queued_droppable:
+                    del self.send_queue[index]
+                    break
+            else:
+                raise asyncio.QueueFull
+        self.send_queue.append((payload, droppable))
+        self._pending.set()
+    
+    def start_writer(self, on_failure: Callable[[str], Awaitable[None]]):
+        """Démarrer la tâche d'écriture ; on_failure(client_id) est appelé si un envoi échoue"""
+        self._writer = asyncio.create_task(self._write_queued(on_failure))
+    
+    def stop_writer(self):
+        """Arrêter la tâche d'écriture (sauf depuis elle-même, qui se termine seule)"""
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._writer = None
+    
+    async def _write_queued(self, on_failure: Callable[[str], Awaitable[None]]):
+        """Envoyer les trames en attente : tout ce qui s'est accumulé part en une seule trame"""
+        while True:
+            await self._pending.wait()
+            self._pending.clear()
+            payloads = [payload for payload, _ in self.send_queue]
+            self.send_queue.clear()
+            
+            frame = payloads[0] if len(payloads) == 1 else _batch_frame(payloads)
+            try:
+                await self.send_frame(frame)
+            except Exception as e:
+                logger.error(f"❌ Erreur envoi à {self.client_id}: {e}")
+                await on_failure(self.client_id)
+                return
     
     async def ping(self):
         """Envoyer un ping au client"""
         ping_message = WebSocketMessage(type=MessageType.PING)
         await self.send_message(ping_message)
-        self.last_ping = datetime.now()
+        self.last_ping = asyncio.get_running_loop().time()
     
     def is_subscribed_to(self, channel: str) -> bool:
         """Vérifier si le client est abonné à un canal"""
@@ -111,12 +254,12 @@ class WebSocketConnection:
     def subscribe(self, channel: str):
         """S'abonner à un canal"""
         self.subscriptions.add(channel)
-        logger.debug(f"🔔 Client {self.client_id} abonné à {channel}")
+        logger.debug("🔔 Client %s abonné à %s", self.client_id, channel)
     
     def unsubscribe(self, channel: str):
         """Se désabonner d'un canal"""
         self.subscriptions.discard(channel)
-        logger.debug(f"🔕 Client {self.client_id} désabonné de {channel}")
+        logger.debug("🔕 Client %s désabonné de %s", self.client_id, channel)
 
 
 class WebSocketManager:
@@ -125,23 +268,46 @@ class WebSocketManager:
     def __init__(self):
         # Utilisation de WeakSet pour éviter les fuites mémoire
         self.connections: Dict[str, WebSocketConnection] = {}
-        self.channels: Dict[str, Set[str]] = {}  # channel -> set of client_ids
-        self.message_history: Dict[str, List[WebSocketMessage]] = {}
+        self.channels: Dict[str, Set[WebSocketConnection]] = {}  # channel -> connexions abonnées
+        # Historique déjà sérialisé en JSON : rejeu sans réencodage ni objets retenus
+        self.message_history: Dict[str, Deque[str]] = {}
         self.max_history_per_channel = 100
+        self.max_queued_messages = 256  # trames en attente par client avant déconnexion
         
         # Task de nettoyage des connexions inactives
         self.cleanup_task: Optional[asyncio.Task] = None
         self.cleanup_interval = 60  # secondes
+        self.inactive_timeout = 300.0  # secondes sans ping avant déconnexion
+        
+        # Dernières statistiques calculées (instant boucle, résultat), valables cleanup_interval / 2
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        
+        # Dispatch des messages client par la valeur brute de "type" (sans passer par l'enum)
+        self._handlers: Dict[str, Callable[[WebSocketConnection, Dict], Awaitable[None]]] = {
+            MessageType.PING.value: self._handle_ping,
+            MessageType.SUBSCRIBE.value: self._handle_subscribe,
+            MessageType.UNSUBSCRIBE.value: self._handle_unsubscribe,
+        }
     
-    async def connect(self, websocket: WebSocket, client_id: Optional[str] = None) -> str:
-        """Accepter une nouvelle connexion WebSocket"""
+    async def connect(
+        self,
+        websocket: WebSocket,
+        client_id: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> str:
+        """Accepter une nouvelle connexion WebSocket (encoding : "json" par défaut, ou "msgpack")"""
         await websocket.accept()
         
         if client_id is None:
             client_id = str(uuid.uuid4())
         
-        connection = WebSocketConnection(websocket, client_id)
+        # Encodage inconnu ou absent : JSON, compris par tous les clients
+        if encoding not in WS_ENCODINGS:
+            encoding = "json"
+        
+        connection = WebSocketConnection(websocket, client_id, encoding, self.max_queued_messages)
         self.connections[client_id] = connection
+        connection.start_writer(self.disconnect)
         
         # Message de bienvenue
         welcome_message = WebSocketMessage(
@@ -149,7 +315,9 @@ class WebSocketManager:
             data={
                 "client_id": client_id,
                 "server_time": datetime.now().isoformat(),
-                "available_channels": list(ChannelType)
+                "available_channels": list(ChannelType),
+                "encoding": encoding,
+                "available_encodings": list(WS_ENCODINGS)
             }
         )
         await connection.send_message(welcome_message)
@@ -166,10 +334,14 @@ class WebSocketManager:
         """Fermer une connexion WebSocket"""
         if client_id in self.connections:
             connection = self.connections[client_id]
+            connection.stop_writer()
+            
+            # Désabonner de tous les canaux (un seul passage, sans await)
+            self._remove_from_channels(connection)
+            connection.subscriptions.clear()
             
-            # Désabonner de tous les canaux
-            for channel in list(connection.subscriptions):
-                await self._unsubscribe_from_channel(client_id, channel)
+            # Lâcher le WebSocket (et ses tampons) même si un envoi garde encore la connexion
+            connection.websocket = None
             
             # Supprimer la connexion
             del self.connections[client_id]
@@ -184,24 +356,24 @@ class WebSocketManager:
     async def handle_message(self, client_id: str, message_data: str):
         """Traiter un message reçu d'un client"""
         try:
-            message_dict = json.loads(message_data)
-            message_type = MessageType(message_dict.get("type"))
+            message_dict = orjson.loads(message_data)
+            raw_type = message_dict.get("type")
+            handler = self._handlers.get(raw_type)
+            if handler is None:
+                # Cas rare : type inconnu (ValueError) ou non géré côté serveur
+                message_type = MessageType(raw_type)
             
             connection = self.connections.get(client_id)
             if not connection:
                 logger.warning(f"⚠️ Message de client déconnecté: {client_id}")
                 return
             
-            if message_type == MessageType.PING:
-                await self._handle_ping(connection)
-            elif message_type == MessageType.SUBSCRIBE:
-                await self._handle_subscribe(connection, message_dict)
-            elif message_type == MessageType.UNSUBSCRIBE:
-                await self._handle_unsubscribe(connection, message_dict)
+            if handler is not None:
+                await handler(connection, message_dict)
             else:
                 logger.warning(f"⚠️ Type de message non géré: {message_type}")
         
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:  # avant ValueError, dont elle hérite
             logger.error(f"❌ Message JSON invalide de {client_id}: {message_data}")
             await self._send_error(client_id, "Invalid JSON format")
         except ValueError as e:
@@ -211,11 +383,10 @@ class WebSocketManager:
             logger.error(f"❌ Erreur traitement message de {client_id}: {e}")
             await self._send_error(client_id, "Internal server error")
     
-    async def _handle_ping(self, connection: WebSocketConnection):
+    async def _handle_ping(self, connection: WebSocketConnection, message_dict: Dict):
         """Traiter un ping du client"""
-        connection.last_ping = datetime.now()
-        pong_message = WebSocketMessage(type=MessageType.PONG)
-        await connection.send_message(pong_message)
+        connection.last_ping = asyncio.get_running_loop().time()
+        connection.enqueue(_PONG_FRAMES[connection.encoding])
     
     async def _handle_subscribe(self, connection: WebSocketConnection, message_dict: Dict):
         """Traiter une demande d'abonnement"""
@@ -271,30 +442,46 @@ class WebSocketManager:
         # Ajouter au canal global
         if channel not in self.channels:
             self.channels[channel] = set()
-        self.channels[channel].add(client_id)
+        self.channels[channel].add(connection)
     
     async def _unsubscribe_from_channel(self, client_id: str, channel: str):
         """Désabonner un client d'un canal"""
         connection = self.connections.get(client_id)
-        if connection:
-            connection.unsubscribe(channel)
+        if not connection:
+            return
+        
+        connection.unsubscribe(channel)
         
         # Retirer du canal global
         if channel in self.channels:
-            self.channels[channel].discard(client_id)
+            self.channels[channel].discard(connection)
             if not self.channels[channel]:
                 del self.channels[channel]
     
+    def _remove_from_channels(self, connection: WebSocketConnection):
+        """Retirer une connexion des canaux globaux (subscriptions sert d'index client -> canaux)"""
+        for channel in connection.subscriptions:
+            clients = self.channels.get(channel)
+            if clients is not None:
+                clients.discard(connection)
+                if not clients:
+                    del self.channels[channel]
+    
     async def _send_channel_history(self, connection: WebSocketConnection, channel: str):
         """Envoyer l'historique récent d'un canal"""
-        if channel in self.message_history:
-            history = self.message_history[channel][-10:]  # 10 derniers messages
-            for message in history:
+        history = self.message_history.get(channel)
+        if history:
+            # 10 derniers messages
+            for payload in itertools.islice(history, max(0, len(history) - 10), None):
+                if connection.encoding == "msgpack":
+                    # Rejeu ponctuel (abonnement) : transcodage depuis le JSON stocké
+                    payload = msgpack.packb(orjson.loads(payload), use_bin_type=True)
                 try:
-                    await connection.send_message(message)
-                except Exception:
-                    # Ignorer les erreurs d'envoi d'historique
-                    pass
+                    # Rejeu : écartable, passe après la confirmation d'abonnement
+                    connection.enqueue(payload, droppable=True)
+                except asyncio.QueueFull:
+                    # Client déjà saturé : l'historique est ignoré
+                    break
     
     async def _send_error(self, client_id: str, error_message: str):
         """Envoyer un message d'erreur à un client"""
@@ -310,33 +497,56 @@ class WebSocketManager:
                 # Si on ne peut pas envoyer l'erreur, déconnecter
                 await self.disconnect(client_id)
     
+    def has_subscribers(self, channel: str) -> bool:
+        """Vérifier en O(1) si un canal a des abonnés (évite de construire un message inutile)"""
+        return bool(self.channels.get(channel))
+    
     async def broadcast_to_channel(self, channel: str, message: WebSocketMessage):
         """Diffuser un message à tous les clients d'un canal"""
-        if channel not in self.channels:
-            logger.debug(f"📢 Canal {channel} n'a aucun abonné")
-            return
-        
-        # Sauvegarder dans l'historique
-        self._save_to_history(channel, message)
-        
-        # Envoyer à tous les clients du canal
-        client_ids = list(self.channels[channel])  # Copie pour éviter modification pendant itération
-        disconnected_clients = []
+        await self.broadcast_to_channels([channel], message)
+    
+    async def broadcast_to_channels(self, channels: List[str], message: WebSocketMessage):
+        """
+        Diffuser un message sur plusieurs canaux en une seule passe
+        Un client abonné à plusieurs de ces canaux ne reçoit le message qu'une fois
+        """
+        subscribers: Dict[str, WebSocketConnection] = {}
+        for channel in channels:
+            clients = self.channels.get(channel)
+            if not clients:
+                logger.debug("📢 Canal %s n'a aucun abonné", channel)
+                continue
+            
+            # Sauvegarder dans l'historique
+            self._save_to_history(channel, message)
+            
+            # L'index ne contient que des connexions actives et abonnées : pas de relecture
+            for connection in clients:
+                subscribers[connection.client_id] = connection
         
-        for client_id in client_ids:
-            connection = self.connections.get(client_id)
-            if connection and connection.is_subscribed_to(channel):
-                try:
-                    await connection.send_message(message)
-                except Exception as e:
-                    logger.error(f"❌ Erreur envoi à {client_id}: {e}")
-                    disconnected_clients.append(client_id)
+        # Mise en file : chaque tâche d'écriture envoie à son rythme, un client lent
+        # ne retarde pas les autres et les rafales partent groupées (type "batch") ;
+        # le message n'est sérialisé qu'une fois par encodage, pour tous les canaux
+        droppable = message.type in _DROPPABLE_TYPES
+        slow_clients = []
+        for client_id, connection in subscribers.items():
+            try:
+                connection.enqueue(message.encode(connection.encoding), droppable)
+            except asyncio.QueueFull:
+                slow_clients.append(client_id)
         
-        # Nettoyer les connexions fermées
-        for client_id in disconnected_clients:
+        # Clients qui ne suivent plus (file pleine sans message écartable) : déconnectés
+        # plutôt que de bufferiser sans fin
+        for client_id in slow_clients:
+            logger.warning(f"🐢 File d'envoi pleine, déconnexion de {client_id}")
+            websocket = subscribers[client_id].websocket
             await self.disconnect(client_id)
+            # 1013 "Try Again Later" : le client peut se reconnecter et se réabonner
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(websocket.close(code=1013), timeout=1.0)
         
-        logger.debug(f"📢 Message diffusé sur {channel} à {len(client_ids)} clients")
+        if subscribers:
+            logger.debug("📢 Message diffusé sur %s à %d clients", channels, len(subscribers))
     
     async def send_to_user(self, user_id: str, message: WebSocketMessage):
         """Envoyer un message à un utilisateur spécifique"""
@@ -345,14 +555,11 @@ class WebSocketManager:
     
     def _save_to_history(self, channel: str, message: WebSocketMessage):
         """Sauvegarder un message dans l'historique du canal"""
-        if channel not in self.message_history:
-            self.message_history[channel] = []
-        
-        self.message_history[channel].append(message)
-        
-        # Limiter la taille de l'historique
-        if len(self.message_history[channel]) > self.max_history_per_channel:
-            self.message_history[channel] = self.message_history[channel][-self.max_history_per_channel:]
+        history = self.message_history.get(channel)
+        if history is None:
+            # Tampon circulaire : les plus anciens messages sortent au-delà de la limite
+            history = self.message_history[channel] = deque(maxlen=self.max_history_per_channel)
+        history.append(message.encode("json"))
     
     async def _cleanup_inactive_connections(self):
         """Task de nettoyage des connexions inactives"""
@@ -360,12 +567,17 @@ class WebSocketManager:
             try:
                 await asyncio.sleep(self.cleanup_interval)
                 
-                now = datetime.now()
-                inactive_threshold = timedelta(minutes=5)  # 5 minutes sans ping
+                now = asyncio.get_running_loop().time()
                 
+                # Inactifs, ou transport déjà fermé sans passage par disconnect()
+                # (client tombé sans trame de fermeture)
                 inactive_clients = []
                 for client_id, connection in self.connections.items():
-                    if now - connection.last_ping > inactive_threshold:
+                    if (
+                        now - connection.last_ping > self.inactive_timeout
+                        or connection.websocket.client_state == WebSocketState.DISCONNECTED
+                        or connection.websocket.application_state == WebSocketState.DISCONNECTED
+                    ):
                         inactive_clients.append(client_id)
                 
                 # Déconnecter les clients inactifs
@@ -383,8 +595,21 @@ class WebSocketManager:
                 logger.error(f"❌ Erreur nettoyage WebSocket: {e}")
     
     async def get_stats(self) -> Dict[str, Any]:
-        """Statistiques des connexions WebSocket"""
-        return {
+        """Statistiques des connexions WebSocket (mises en cache cleanup_interval / 2 secondes)"""
+        now = asyncio.get_running_loop().time()
+        if self._stats_cache is not None and now - self._stats_cache[0] < self.cleanup_interval / 2:
+            return self._stats_cache[1]
+        
+        # Répartition par ancienneté en un seul passage
+        under_1min = under_5min = 0
+        for connection in self.connections.values():
+            age = now - connection.connected_at
+            if age < 300:
+                under_5min += 1
+                if age < 60:
+                    under_1min += 1
+        
+        stats = {
             "total_connections": len(self.connections),
             "total_channels": len(self.channels),
             "channels_info": {
@@ -392,15 +617,14 @@ class WebSocketManager:
                 for channel, clients in self.channels.items()
             },
             "connections_by_age": {
-                "under_1min": sum(1 for c in self.connections.values() 
-                                if datetime.now() - c.connected_at < timedelta(minutes=1)),
-                "under_5min": sum(1 for c in self.connections.values() 
-                                if datetime.now() - c.connected_at < timedelta(minutes=5)),
-                "over_5min": sum(1 for c in self.connections.values() 
-                               if datetime.now() - c.connected_at >= timedelta(minutes=5)),
+                "under_1min": under_1min,
+                "under_5min": under_5min,
+                "over_5min": len(self.connections) - under_5min,
             },
             "message_history_size": sum(len(msgs) for msgs in self.message_history.values())
         }
+        self._stats_cache = (now, stats)
+        return stats
 
 
 # Instance globale du gestionnaire WebSocket
@@ -419,8 +643,7 @@ async def notify_debate_started(debate_id: str, debate_data: Dict[str, Any]):
             "action": "started"
         }
     )
-    await websocket_manager.broadcast_to_channel(ChannelType.DEBATES, message)
-    await websocket_manager.broadcast_to_channel(f"debate:{debate_id}", message)
+    await websocket_manager.broadcast_to_channels([ChannelType.DEBATES.value, f"debate:{debate_id}"], message)
 
 
 async def notify_debate_ended(debate_id: str, debate_data: Dict[str, Any]):
@@ -434,8 +657,7 @@ async def notify_debate_ended(debate_id: str, debate_data: Dict[str, Any]):
             "action": "ended"
         }
     )
-    await websocket_manager.broadcast_to_channel(ChannelType.DEBATES, message)
-    await websocket_manager.broadcast_to_channel(f"debate:{debate_id}", message)
+    await websocket_manager.broadcast_to_channels([ChannelType.DEBATES.value, f"debate:{debate_id}"], message)
 
 
 async def notify_extraction_started(debate_id: str, extraction_id: str):
@@ -450,8 +672,22 @@ async def notify_extraction_started(debate_id: str, extraction_id: str):
             "estimated_duration": "5-10 minutes"
         }
     )
-    await websocket_manager.broadcast_to_channel(ChannelType.EXTRACTIONS, message)
-    await websocket_manager.broadcast_to_channel(f"debate:{debate_id}", message)
+    await websocket_manager.broadcast_to_channels([ChannelType.EXTRACTIONS.value, f"debate:{debate_id}"], message)
+
+
+async def notify_extraction_progress(debate_id: str, extraction_id: str, progress: int):
+    """Notifier l'avancement d'une extraction audio (remplace le polling de /status)"""
+    message = WebSocketMessage(
+        type=MessageType.EXTRACTION_PROGRESS,
+        channel=ChannelType.EXTRACTIONS,
+        data={
+            "debate_id": debate_id,
+            "extraction_id": extraction_id,
+            "status": "extracting",
+            "progress": progress
+        }
+    )
+    await websocket_manager.broadcast_to_channels([ChannelType.EXTRACTIONS.value, f"debate:{debate_id}"], message)
 
 
 async def notify_extraction_completed(debate_id: str, extraction_id: str, audio_url: str, file_size: int):
@@ -468,8 +704,7 @@ async def notify_extraction_completed(debate_id: str, extraction_id: str, audio_
             "format": "mp3"
         }
     )
-    await websocket_manager.broadcast_to_channel(ChannelType.EXTRACTIONS, message)
-    await websocket_manager.broadcast_to_channel(f"debate:{debate_id}", message)
+    await websocket_manager.broadcast_to_channels([ChannelType.EXTRACTIONS.value, f"debate:{debate_id}"], message)
 
 
 async def notify_extraction_failed(debate_id: str, extraction_id: str, error: str):
@@ -484,8 +719,7 @@ async def notify_extraction_failed(debate_id: str, extraction_id: str, error: st
             "error": error
         }
     )
-    await websocket_manager.broadcast_to_channel(ChannelType.EXTRACTIONS, message)
-    await websocket_manager.broadcast_to_channel(f"debate:{debate_id}", message)
+    await websocket_manager.broadcast_to_channels([ChannelType.EXTRACTIONS.value, f"debate:{debate_id}"], message)
 
 
 async def notify_system_status(status: str, details: Dict[str, Any]):
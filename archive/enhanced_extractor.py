@@ -4,10 +4,16 @@ Extracteur amélioré pour AN-droid
 Utilise Selenium pour gérer le JavaScript et extraire automatiquement les URLs m3u8
 """
 
+import asyncio
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError
 import re
-import subprocess
 import json
+import shelve
 import time
 from pathlib import Path
 from datetime import datetime
@@ -27,11 +33,64 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     print("⚠️ Selenium non disponible - installation recommandée: pip install selenium")
 
+# aiohttp pour l'extraction basique par lot (pages téléchargées en parallèle)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Moteur RE2 si disponible (pip install google-re2) : temps linéaire sur les pages
+# de plusieurs Mo, sans retour arrière sur les classes [^"'\s]* non bornées
+try:
+    import re2 as _m3u8_re
+except ImportError:
+    _m3u8_re = re
+
+# Patterns d'URLs m3u8 fusionnés en une alternative : un seul passage sur la page
+# (compilée une seule fois ; (?i) en ligne : même syntaxe pour re et re2, dont les
+# options de compilation diffèrent). Chaîne entre guillemets sans espace : sinon
+# l'alternative pourrait couvrir '" texte https://... "' et masquer l'URL nue
+_M3U8_PATTERN = _m3u8_re.compile('(?i)' + '|'.join(f'(?:{pattern})' for pattern in (
+    r'https?://videos-an\.vodalys\.com/[^"\'\s]*\.m3u8[^"\'\s]*',
+    r'https?://assemblee-nationale\.akamaized\.net/[^"\'\s]*\.m3u8[^"\'\s]*',
+    r'https?://[^"\'\s]*assemblee[^"\'\s]*\.m3u8[^"\'\s]*',
+    r'["\']([^"\'\s]*\.m3u8[^"\'\s]*)["\']'
+)))
+
+
+# Contenu des scripts et sources vidéo de la page, récupérés en un seul aller-retour
+# WebDriver (au lieu d'un get_attribute() par élément)
+_PAGE_MEDIA_JS = """
+return {
+    scripts: Array.from(document.scripts, s => s.textContent),
+    srcs: Array.from(document.querySelectorAll('video[src], source[src]'), e => e.src)
+};
+"""
+
+
+def _find_m3u8_candidates(text):
+    """URLs m3u8 candidates d'un texte (contenu entre guillemets ou URL nue)"""
+    for match in _M3U8_PATTERN.finditer(text):
+        yield match.group(1) or match.group(0)
+
+# Nettoyage des titres et des noms de fichiers (petites chaînes : re standard)
+_TITLE_TAG = re.compile(r'<title>([^<]+)</title>', re.IGNORECASE)
+_TITLE_SUFFIX = re.compile(r'\s*-\s*Vidéos de l\'Assemblée nationale.*$')
+_FN_BAD = re.compile(r'[<>:"/\\|?*]')
+_FN_WS = re.compile(r'\s+')
+
 class EnhancedAudioExtractor:
-    def __init__(self, download_dir="downloads", headless=True):
+    def __init__(self, download_dir="downloads", headless=True, use_cache=True):
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
         
+        # Cache des titres et URLs m3u8 par page : mémoire + disque (shelve), 24h
+        self.use_cache = use_cache
+        self.cache_path = self.download_dir / "cache"
+        self.cache_ttl = 24 * 3600
+        self._memory_cache = {}
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'AN-droid/1.0 (Compatible crawler)',
@@ -39,19 +98,30 @@ class EnhancedAudioExtractor:
             'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8'
         })
         
+        # Pool de connexions keep-alive réutilisées entre les pages d'un même hôte
+        # (pas de nouvelle poignée de main TLS à chaque appel), reprises sur erreurs 5xx
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # yt-dlp en API Python : une instance réutilisée pour les métadonnées
+        # (pas de processus ni de réimport de yt-dlp à chaque appel)
+        self._ydl_probe = YoutubeDL({
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'socket_timeout': 30
+        })
+        
         # Configuration Selenium
         self.headless = headless
         self.driver = None
         self.setup_selenium()
         
-        # Patterns d'URLs m3u8
-        self.m3u8_patterns = [
-            r'https?://videos-an\.vodalys\.com/[^"\'\s]*\.m3u8[^"\'\s]*',
-            r'https?://assemblee-nationale\.akamaized\.net/[^"\'\s]*\.m3u8[^"\'\s]*',
-            r'https?://[^"\'\s]*assemblee[^"\'\s]*\.m3u8[^"\'\s]*',
-            r'["\']([^"\']*\.m3u8[^"\']*)["\']'
-        ]
-        
         # Sélecteurs pour les boutons de téléchargement
         self.download_selectors = [
             '#player_download_sound_icon',
@@ -93,6 +163,9 @@ class EnhancedAudioExtractor:
             }
             chrome_options.add_experimental_option("prefs", prefs)
             
+            # Journal "performance" : événements réseau CDP (Network.responseReceived)
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            
             self.driver = webdriver.Chrome(options=chrome_options)
             self.driver.set_page_load_timeout(30)
             
@@ -103,7 +176,45 @@ class EnhancedAudioExtractor:
             print("💡 Vérifiez que ChromeDriver est installé")
             self.driver = None
     
+    def _cached(self, kind, url, compute):
+        """
+        Résultat de compute(url) mis en cache par URL (clé sha1), valable cache_ttl secondes
+        Les échecs (résultat vide ou titre par défaut) ne sont pas mis en cache
+        """
+        if not self.use_cache:
+            return compute(url)
+        
+        key = f"{kind}:{hashlib.sha1(url.encode()).hexdigest()}"
+        entry = self._memory_cache.get(key)
+        if entry is None:
+            try:
+                with shelve.open(str(self.cache_path)) as db:
+                    entry = db.get(key)
+            except Exception as e:
+                print(f"⚠️ Cache illisible: {e}")
+        
+        if entry is not None and time.time() - entry['ts'] < self.cache_ttl:
+            self._memory_cache[key] = entry
+            print(f"💾 {kind} en cache pour: {url}")
+            return entry['value']
+        
+        value = compute(url)
+        if value and value != "Debat_AN":
+            entry = {'value': value, 'ts': time.time()}
+            self._memory_cache[key] = entry
+            try:
+                with shelve.open(str(self.cache_path)) as db:
+                    db[key] = entry
+            except Exception as e:
+                print(f"⚠️ Écriture cache impossible: {e}")
+        
+        return value
+    
     def extract_title_from_page(self, url):
+        """Titre de la page (mis en cache)"""
+        return self._cached("title", url, self._extract_title_from_page)
+    
+    def _extract_title_from_page(self, url):
         """Extraire le titre depuis la page HTML avec Selenium"""
         if not self.driver:
             return self.extract_title_basic(url)
@@ -130,7 +241,7 @@ class EnhancedAudioExtractor:
                     title = element.text.strip()
                     if title and len(title) > 5:
                         # Nettoyer le titre
-                        title = re.sub(r'\s*-\s*Vidéos de l\'Assemblée nationale.*$', '', title)
+                        title = _TITLE_SUFFIX.sub('', title)
                         print(f"✅ Titre trouvé: {title}")
                         return title
                 except NoSuchElementException:
@@ -139,7 +250,7 @@ class EnhancedAudioExtractor:
             # Fallback sur le titre de la page
             title = self.driver.title
             if title:
-                title = re.sub(r'\s*-\s*Vidéos de l\'Assemblée nationale.*$', '', title)
+                title = _TITLE_SUFFIX.sub('', title)
                 return title
                 
         except Exception as e:
@@ -154,10 +265,8 @@ class EnhancedAudioExtractor:
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
             
-            title_match = re.search(r'<title>([^<]+)</title>', response.text, re.IGNORECASE)
-            if title_match:
-                title = title_match.group(1).strip()
-                title = re.sub(r'\s*-\s*Vidéos de l\'Assemblée nationale.*$', '', title)
+            title = self.title_from_html(response.text)
+            if title:
                 return title
                 
         except Exception as e:
@@ -165,6 +274,24 @@ class EnhancedAudioExtractor:
         
         return "Debat_AN"
     
+    @staticmethod
+    def title_from_html(html):
+        """Titre nettoyé de la balise <title>, ou None"""
+        title_match = _TITLE_TAG.search(html)
+        if title_match:
+            title = title_match.group(1).strip()
+            return _TITLE_SUFFIX.sub('', title)
+        return None
+    
+    @staticmethod
+    def m3u8_urls_from_html(html):
+        """URLs m3u8 absolues trouvées dans le HTML brut"""
+        # dict = ensemble ordonné : dédoublonnage en O(1), ordre de découverte conservé
+        return list(dict.fromkeys(
+            url_found for url_found in _find_m3u8_candidates(html)
+            if url_found.startswith('http')
+        ))
+    
     def accept_cookies(self):
         """Accepter les cookies automatiquement"""
         try:
@@ -211,6 +338,9 @@ class EnhancedAudioExtractor:
         
         try:
             print(f"🔍 Extraction URLs m3u8 avec Selenium depuis: {url}")
+            
+            # Vider le journal réseau des pages précédentes
+            self._network_m3u8_urls()
             self.driver.get(url)
             
             # Accepter les cookies
@@ -221,70 +351,41 @@ class EnhancedAudioExtractor:
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # Laisser le temps au JavaScript de s'exécuter
-            time.sleep(3)
-            
-            # Récupérer le HTML après exécution du JavaScript
-            page_source = self.driver.page_source
-            
-            # Rechercher les URLs m3u8 dans le source
-            m3u8_urls = []
+            # Attendre que le lecteur charge sa playlist (3 s max, au lieu d'un délai fixe) :
+            # l'URL m3u8 est alors lue directement dans les réponses réseau
+            m3u8_urls = self._wait_network_m3u8_urls(timeout=3)
             
-            for pattern in self.m3u8_patterns:
-                matches = re.findall(pattern, page_source, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        url_found = match[0] if match[0] else match[-1]
-                    else:
-                        url_found = match
-                    
-                    # Nettoyer l'URL
-                    url_found = url_found.strip('"\'')
-                    
-                    if url_found and url_found not in m3u8_urls:
-                        m3u8_urls.append(url_found)
-            
-            # Chercher aussi dans les éléments video et source
-            try:
-                video_elements = self.driver.find_elements(By.TAG_NAME, "video")
-                source_elements = self.driver.find_elements(By.TAG_NAME, "source")
+            if m3u8_urls:
+                print(f"📡 URLs m3u8 capturées sur le réseau: {len(m3u8_urls)}")
+            else:
+                # Rien vu passer : rechercher dans le HTML après exécution du JavaScript
+                # (dict = ensemble ordonné : dédoublonnage en O(1), ordre de découverte conservé)
+                m3u8_urls = dict.fromkeys(_find_m3u8_candidates(self.driver.page_source))
                 
-                for element in video_elements + source_elements:
-                    src = element.get_attribute("src")
-                    if src and ".m3u8" in src:
-                        m3u8_urls.append(src)
+                # master.m3u8 déjà dans le HTML (cas courant) : c'est l'URL retenue par
+                # extract_audio_complete, inutile de parcourir sources vidéo et scripts
+                master_urls = [u for u in m3u8_urls if 'master.m3u8' in u and u.startswith('http')]
+                if master_urls:
+                    m3u8_urls = dict.fromkeys(master_urls)
+                else:
+                    # Chercher aussi dans les éléments video/source et dans les scripts
+                    # (un seul execute_script pour toute la page)
+                    try:
+                        page_media = self.driver.execute_script(_PAGE_MEDIA_JS)
                         
-            except Exception as e:
-                print(f"⚠️ Erreur recherche éléments video: {e}")
-            
-            # Rechercher dans les scripts
-            try:
-                script_elements = self.driver.find_elements(By.TAG_NAME, "script")
-                for script in script_elements:
-                    script_content = script.get_attribute("innerHTML")
-                    if script_content:
-                        for pattern in self.m3u8_patterns:
-                            matches = re.findall(pattern, script_content, re.IGNORECASE)
-                            for match in matches:
-                                if isinstance(match, tuple):
-                                    url_found = match[0] if match[0] else match[-1]
-                                else:
-                                    url_found = match
+                        for src in page_media['srcs']:
+                            if src and ".m3u8" in src:
+                                m3u8_urls[src] = None
+                        
+                        for script_content in page_media['scripts']:
+                            if script_content:
+                                m3u8_urls.update(dict.fromkeys(_find_m3u8_candidates(script_content)))
                                 
-                                url_found = url_found.strip('"\'')
-                                if url_found and url_found not in m3u8_urls:
-                                    m3u8_urls.append(url_found)
-                                    
-            except Exception as e:
-                print(f"⚠️ Erreur recherche dans scripts: {e}")
-            
-            # Nettoyer et déduplicater
-            cleaned_urls = []
-            for url in m3u8_urls:
-                if url.startswith('http') and 'm3u8' in url:
-                    cleaned_urls.append(url)
+                    except Exception as e:
+                        print(f"⚠️ Erreur recherche éléments video et scripts: {e}")
             
-            unique_urls = list(set(cleaned_urls))
+            # Nettoyer (déjà dédoublonnées)
+            unique_urls = [url for url in m3u8_urls if url.startswith('http') and 'm3u8' in url]
             
             if unique_urls:
                 print(f"✅ URLs m3u8 trouvées avec Selenium: {len(unique_urls)}")
@@ -299,61 +400,120 @@ class EnhancedAudioExtractor:
             print(f"❌ Erreur extraction Selenium: {e}")
             return []
     
+    def _network_m3u8_urls(self):
+        """URLs m3u8 des réponses réseau reçues par le navigateur (vide le journal performance)"""
+        urls = {}
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception:
+            # Journal indisponible (driver sans goog:loggingPrefs)
+            return urls
+        
+        for entry in entries:
+            # Filtre rapide avant de décoder l'événement
+            if '.m3u8' not in entry['message']:
+                continue
+            message = json.loads(entry['message'])['message']
+            if message.get('method') == 'Network.responseReceived':
+                response_url = message['params']['response']['url']
+                if '.m3u8' in response_url:
+                    urls[response_url] = None
+        
+        return urls
+    
+    def _wait_network_m3u8_urls(self, timeout):
+        """Attendre la première réponse m3u8 (au plus timeout secondes)"""
+        found = {}
+        
+        def m3u8_received(driver):
+            found.update(self._network_m3u8_urls())
+            return bool(found)
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(m3u8_received)
+        except TimeoutException:
+            pass
+        
+        return found
+    
     def extract_m3u8_urls_basic(self, url):
         """Extraction basique des URLs m3u8 avec requests"""
         try:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            m3u8_urls = []
-            
-            for pattern in self.m3u8_patterns:
-                matches = re.findall(pattern, response.text, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        url_found = match[0] if match[0] else match[-1]
-                    else:
-                        url_found = match
-                    
-                    url_found = url_found.strip('"\'')
-                    
-                    if url_found and url_found.startswith('http') and url_found not in m3u8_urls:
-                        m3u8_urls.append(url_found)
-            
-            return m3u8_urls
+            return self.m3u8_urls_from_html(response.text)
             
         except Exception as e:
             print(f"❌ Erreur extraction basique: {e}")
             return []
     
+    async def _extract_one_basic(self, http, url, limit):
+        """Titre et URLs m3u8 d'une page en une seule requête (sans navigateur)"""
+        async with limit:
+            try:
+                async with http.get(url) as response:
+                    response.raise_for_status()
+                    html = await response.text()
+            except Exception as e:
+                print(f"❌ Erreur extraction basique {url}: {e}")
+                return {'url': url, 'title': "Debat_AN", 'm3u8_urls': []}
+        
+        return {
+            'url': url,
+            'title': self.title_from_html(html) or "Debat_AN",
+            'm3u8_urls': self.m3u8_urls_from_html(html)
+        }
+    
+    async def batch_extract(self, urls, max_concurrency=5):
+        """
+        Extraction basique par lot : les pages sont téléchargées en parallèle
+        (au plus max_concurrency à la fois), résultats dans l'ordre des URLs
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp requis pour l'extraction par lot: pip install aiohttp")
+        
+        limit = asyncio.Semaphore(max_concurrency)
+        async with aiohttp.ClientSession(
+            headers=dict(self.session.headers),
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as http:
+            return await asyncio.gather(*(self._extract_one_basic(http, url, limit) for url in urls))
+    
     def extract_m3u8_urls(self, url):
-        """Méthode principale d'extraction des URLs m3u8"""
+        """Méthode principale d'extraction des URLs m3u8 (mise en cache)"""
+        return self._cached("m3u8", url, self._extract_m3u8_urls)
+    
+    def _extract_m3u8_urls(self, url):
+        """Extraction des URLs m3u8 : HTML brut, puis navigateur"""
         print(f"🔍 Extraction URLs m3u8 depuis: {url}")
         
-        # Essayer d'abord avec Selenium (plus efficace)
+        # HTML brut d'abord : une requête, sans rendu ni attente du JavaScript,
+        # suffit quand la page contient déjà l'URL m3u8
+        urls = self.extract_m3u8_urls_basic(url)
+        if urls:
+            return urls
+        
+        # Sinon navigateur (URL ajoutée par le JavaScript du lecteur)
         if self.driver:
-            urls = self.extract_m3u8_urls_selenium(url)
-            if urls:
-                return urls
+            print("🔄 Rien dans le HTML brut, extraction avec Selenium...")
+            return self.extract_m3u8_urls_selenium(url)
         
-        # Fallback avec requests basique
-        print("🔄 Fallback vers extraction basique...")
-        return self.extract_m3u8_urls_basic(url)
+        return []
     
     def get_video_metadata(self, m3u8_url):
         """Extraire les métadonnées d'une URL m3u8"""
         try:
-            cmd = ["yt-dlp", "--dump-json", "--no-download", m3u8_url]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            info = self._ydl_probe.extract_info(m3u8_url, download=False)
             
-            if result.returncode == 0:
-                info = json.loads(result.stdout)
+            if info:
                 return {
                     'title': info.get('title', 'Audio_AN'),
                     'duration': info.get('duration', 0),
                     'formats': len(info.get('formats', [])),
                     'audio_formats': len([f for f in info.get('formats', []) if f.get('acodec') != 'none'])
                 }
+            
         except Exception as e:
             print(f"⚠️ Erreur métadonnées: {e}")
         
@@ -379,61 +539,65 @@ class EnhancedAudioExtractor:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = self.download_dir / f"{safe_title}_{timestamp}.mp3"
         
-        cmd = [
-            "yt-dlp",
-            "--extract-audio",
-            "--audio-format", "mp3",
-            "--audio-quality", "128K",
-            "--output", str(output_file.with_suffix('.%(ext)s')),
-            "--no-warnings",
-            m3u8_url
-        ]
+        ydl_opts = {
+            'format': 'bestaudio/best',
+            'outtmpl': str(output_file.with_suffix('.%(ext)s')),
+            'postprocessors': [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': '128'
+            }],
+            'quiet': True,
+            'no_warnings': True,
+            'socket_timeout': 30
+        }
         
         if original_url:
-            cmd.extend(["--add-header", f"Referer:{original_url}"])
+            ydl_opts['http_headers'] = {'Referer': original_url}
         
         try:
             print("⬇️ Démarrage téléchargement...")
             start_time = time.time()
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            with YoutubeDL(ydl_opts) as ydl:
+                ydl.download([m3u8_url])
+            
             download_time = time.time() - start_time
             
-            if result.returncode == 0:
-                created_files = list(self.download_dir.glob(f"{safe_title}_{timestamp}*.mp3"))
-                if created_files:
-                    audio_file = created_files[0]
-                    file_size = audio_file.stat().st_size
-                    
-                    print(f"✅ Extraction réussie!")
-                    print(f"📁 Fichier: {audio_file}")
-                    print(f"📊 Taille: {file_size / 1024 / 1024:.1f} MB")
-                    print(f"⏱️ Temps: {download_time:.1f}s")
-                    
-                    return {
-                        'success': True,
-                        'method': 'm3u8_selenium',
-                        'file_path': str(audio_file),
-                        'title': metadata['title'],
-                        'duration': metadata['duration'],
-                        'file_size': file_size,
-                        'download_time': download_time
-                    }
-            
-            print(f"❌ Échec extraction: {result.stderr}")
-            return {'success': False, 'reason': 'ytdlp_failed', 'error': result.stderr}
-            
-        except subprocess.TimeoutExpired:
-            print("⏰ Timeout lors du téléchargement")
-            return {'success': False, 'reason': 'timeout'}
+            created_files = list(self.download_dir.glob(f"{safe_title}_{timestamp}*.mp3"))
+            if created_files:
+                audio_file = created_files[0]
+                file_size = audio_file.stat().st_size
+                
+                print(f"✅ Extraction réussie!")
+                print(f"📁 Fichier: {audio_file}")
+                print(f"📊 Taille: {file_size / 1024 / 1024:.1f} MB")
+                print(f"⏱️ Temps: {download_time:.1f}s")
+                
+                return {
+                    'success': True,
+                    'method': 'm3u8_selenium',
+                    'file_path': str(audio_file),
+                    'title': metadata['title'],
+                    'duration': metadata['duration'],
+                    'file_size': file_size,
+                    'download_time': download_time
+                }
+            
+            print("❌ Échec extraction: fichier mp3 introuvable")
+            return {'success': False, 'reason': 'ytdlp_failed', 'error': 'output file not found'}
+            
+        except DownloadError as e:
+            print(f"❌ Échec extraction: {e}")
+            return {'success': False, 'reason': 'ytdlp_failed', 'error': str(e)}
         except Exception as e:
             print(f"❌ Erreur extraction: {e}")
             return {'success': False, 'error': str(e)}
     
     def sanitize_filename(self, filename):
         """Nettoyer un nom de fichier"""
-        filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-        filename = re.sub(r'\s+', '_', filename)
+        filename = _FN_BAD.sub('', filename)
+        filename = _FN_WS.sub('_', filename)
         filename = filename[:50]
         return filename or 'audio_an'
     
@@ -517,6 +681,14 @@ def test_enhanced_extractor():
         print("❌ Selenium non disponible - test limité")
         print("💡 Installation: pip install selenium")
         print("💡 ChromeDriver requis")
+        
+        # Test limité : extraction basique de toutes les pages en parallèle
+        if AIOHTTP_AVAILABLE:
+            print("\n🧪 Extraction basique par lot (HTML brut, sans JavaScript)")
+            for result in asyncio.run(extractor.batch_extract(test_urls)):
+                print(f"📄 {result['title']}: {len(result['m3u8_urls'])} URL(s) m3u8")
+                for j, m3u8_url in enumerate(result['m3u8_urls'][:3], 1):  # Montrer max 3
+                    print(f"  {j}. {m3u8_url}")
         return
     
     try:
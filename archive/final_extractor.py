@@ -5,13 +5,22 @@ Basé sur la découverte des URLs m3u8 qui fonctionnent parfaitement
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError
 import re
-import subprocess
-import json
 from pathlib import Path
 from datetime import datetime
 import time
 
+# Patterns compilés une seule fois
+_M3U8_PATTERN = re.compile(r'https://videos-an\.vodalys\.com/[^"\']*\.m3u8')  # Pattern découvert par Selenium
+_TITLE_TAG = re.compile(r'<title>([^<]+)</title>', re.IGNORECASE)
+_TITLE_SUFFIX = re.compile(r'\s*-\s*Vidéos de l\'Assemblée nationale.*$')
+_FN_BAD = re.compile(r'[<>:"/\\|?*]')
+_FN_WS = re.compile(r'\s+')
+
 class FinalAudioExtractor:
     def __init__(self, download_dir="downloads"):
         self.download_dir = Path(download_dir)
@@ -24,6 +33,25 @@ class FinalAudioExtractor:
             'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8'
         })
         
+        # Pool de connexions keep-alive réutilisées entre les pages d'un même hôte
+        # (pas de nouvelle poignée de main TLS à chaque appel), reprises sur erreurs 5xx
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # yt-dlp en API Python : une instance réutilisée pour les métadonnées
+        # (pas de processus ni de réimport de yt-dlp à chaque appel)
+        self._ydl_probe = YoutubeDL({
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'socket_timeout': 30
+        })
+        
         # Limites de sécurité
         self.max_duration = 14400  # 4h en secondes
         self.max_file_size = 500 * 1024 * 1024  # 500MB
@@ -36,14 +64,11 @@ class FinalAudioExtractor:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            # Pattern découvert par Selenium
-            m3u8_pattern = r'https://videos-an\.vodalys\.com/[^"\']*\.m3u8'
-            
-            m3u8_urls = re.findall(m3u8_pattern, response.text)
+            m3u8_urls = _M3U8_PATTERN.findall(response.text)
             
             if m3u8_urls:
-                # Supprimer les doublons et prendre la meilleure qualité
-                unique_urls = list(set(m3u8_urls))
+                # Supprimer les doublons (ordre de la page conservé) et prendre la meilleure qualité
+                unique_urls = list(dict.fromkeys(m3u8_urls))
                 # Prioriser master.m3u8 (meilleure qualité)
                 master_urls = [url for url in unique_urls if 'master.m3u8' in url]
                 
@@ -64,11 +89,9 @@ class FinalAudioExtractor:
     def get_video_metadata(self, m3u8_url):
         """Extraire les métadonnées d'une URL m3u8"""
         try:
-            cmd = ["yt-dlp", "--dump-json", "--no-download", m3u8_url]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            info = self._ydl_probe.extract_info(m3u8_url, download=False)
             
-            if result.returncode == 0:
-                info = json.loads(result.stdout)
+            if info:
                 return {
                     'title': info.get('title', 'Audio_AN'),
                     'duration': info.get('duration', 0),
@@ -104,56 +127,59 @@ class FinalAudioExtractor:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = self.download_dir / f"{safe_title}_{timestamp}.mp3"
         
-        # Commande d'extraction
-        cmd = [
-            "yt-dlp",
-            "--extract-audio",
-            "--audio-format", "mp3",
-            "--audio-quality", "128K",
-            "--output", str(output_file.with_suffix('.%(ext)s')),
-            "--no-warnings",
-            m3u8_url
-        ]
+        # Options d'extraction (équivalent de yt-dlp --extract-audio --audio-format mp3 --audio-quality 128K)
+        ydl_opts = {
+            'format': 'bestaudio/best',
+            'outtmpl': str(output_file.with_suffix('.%(ext)s')),
+            'postprocessors': [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': '128'
+            }],
+            'quiet': True,
+            'no_warnings': True,
+            'socket_timeout': 30
+        }
         
         if original_url:
-            cmd.extend(["--add-header", f"Referer:{original_url}"])
+            ydl_opts['http_headers'] = {'Referer': original_url}
         
         try:
             print("⬇️ Démarrage téléchargement...")
             start_time = time.time()
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)  # 10 min max
+            with YoutubeDL(ydl_opts) as ydl:
+                ydl.download([m3u8_url])
             
             download_time = time.time() - start_time
             
-            if result.returncode == 0:
-                # Trouver le fichier créé
-                created_files = list(self.download_dir.glob(f"{safe_title}_{timestamp}*.mp3"))
-                if created_files:
-                    audio_file = created_files[0]
-                    file_size = audio_file.stat().st_size
-                    
-                    print(f"✅ Extraction réussie!")
-                    print(f"📁 Fichier: {audio_file}")
-                    print(f"📊 Taille: {file_size / 1024 / 1024:.1f} MB")
-                    print(f"⏱️ Temps: {download_time:.1f}s")
-                    
-                    return {
-                        'success': True,
-                        'method': 'm3u8_direct',
-                        'file_path': str(audio_file),
-                        'title': metadata['title'],
-                        'duration': metadata['duration'],
-                        'file_size': file_size,
-                        'download_time': download_time
-                    }
+            # Trouver le fichier créé
+            created_files = list(self.download_dir.glob(f"{safe_title}_{timestamp}*.mp3"))
+            if created_files:
+                audio_file = created_files[0]
+                file_size = audio_file.stat().st_size
+                
+                print(f"✅ Extraction réussie!")
+                print(f"📁 Fichier: {audio_file}")
+                print(f"📊 Taille: {file_size / 1024 / 1024:.1f} MB")
+                print(f"⏱️ Temps: {download_time:.1f}s")
+                
+                return {
+                    'success': True,
+                    'method': 'm3u8_direct',
+                    'file_path': str(audio_file),
+                    'title': metadata['title'],
+                    'duration': metadata['duration'],
+                    'file_size': file_size,
+                    'download_time': download_time
+                }
             
-            print(f"❌ Échec extraction: {result.stderr}")
-            return {'success': False, 'reason': 'ytdlp_failed', 'error': result.stderr}
+            print("❌ Échec extraction: fichier mp3 introuvable")
+            return {'success': False, 'reason': 'ytdlp_failed', 'error': 'output file not found'}
             
-        except subprocess.TimeoutExpired:
-            print("⏰ Timeout lors du téléchargement")
-            return {'success': False, 'reason': 'timeout'}
+        except DownloadError as e:
+            print(f"❌ Échec extraction: {e}")
+            return {'success': False, 'reason': 'ytdlp_failed', 'error': str(e)}
         except Exception as e:
             print(f"❌ Erreur extraction: {e}")
             return {'success': False, 'error': str(e)}
@@ -161,9 +187,9 @@ class FinalAudioExtractor:
     def sanitize_filename(self, filename):
         """Nettoyer un nom de fichier"""
         # Supprimer les caractères interdits
-        filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+        filename = _FN_BAD.sub('', filename)
         # Remplacer les espaces par des underscores
-        filename = re.sub(r'\s+', '_', filename)
+        filename = _FN_WS.sub('_', filename)
         # Limiter la longueur
         filename = filename[:50]
         return filename or 'audio_an'
@@ -175,11 +201,11 @@ class FinalAudioExtractor:
             response.raise_for_status()
             
             # Chercher le titre dans la balise title
-            title_match = re.search(r'<title>([^<]+)</title>', response.text, re.IGNORECASE)
+            title_match = _TITLE_TAG.search(response.text)
             if title_match:
                 title = title_match.group(1).strip()
                 # Nettoyer le titre
-                title = re.sub(r'\s*-\s*Vidéos de l\'Assemblée nationale.*$', '', title)
+                title = _TITLE_SUFFIX.sub('', title)
                 return title
             
         except Exception as e:
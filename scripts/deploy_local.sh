@@ -171,7 +171,7 @@ if [[ ! -f "api/main.py" ]]; then
 fi
 
 # Commande de lancement
-API_CMD="uvicorn api.main:app --host $API_HOST --port $API_PORT --log-level $(echo $LOG_LEVEL | tr '[:upper:]' '[:lower:]')"
+API_CMD="uvicorn api.main:app --host $API_HOST --port $API_PORT --loop auto --log-level $(echo $LOG_LEVEL | tr '[:upper:]' '[:lower:]')"
 
 echo "Commande API: $API_CMD"
 
@@ -8,6 +8,12 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_trgm";  -- Pour la recherche textuelle
 CREATE EXTENSION IF NOT EXISTS "unaccent"; -- Pour ignorer les accents
 
+-- array_to_string est STABLE : wrapper IMMUTABLE requis par la colonne
+-- générée debates.search_vector (recherche plein texte)
+CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text)
+RETURNS text AS $$ SELECT array_to_string($1, $2) $$
+LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
 -- Configuration de performance
 ALTER SYSTEM SET shared_preload_libraries = 'pg_stat_statements';
 ALTER SYSTEM SET track_activity_query_size = 2048;